@@ -14,7 +14,7 @@ from .pdf_assembler import PDFAssembler
 
 # Schema, calibration, rendering, preview
 from .schema_loader import load_schema, get_field_defs, apply_postprocess, validate_value
-from .calibration import compute_page_transform
+from .calibration import compute_page_transform, page_transform
 from .render import draw_text_in_box
 from .preview import render_cover_preview_png
 
@@ -26,7 +26,7 @@ __all__ = [
 	'PDFParser', 'FieldExtractor',
 	'BradleyAbstractCoverPage', 'PDFAssembler',
 	'load_schema', 'get_field_defs', 'apply_postprocess', 'validate_value',
-	'compute_page_transform', 'draw_text_in_box', 'render_cover_preview_png',
+	'compute_page_transform', 'page_transform', 'draw_text_in_box', 'render_cover_preview_png',
 	'extract_fields_from_schema', 'FieldValue',
 	'collect_words_from_sources', 'ocr_available', 'ocr_environment_status',
 ]
@@ -0,0 +1,236 @@
+from __future__ import annotations
+import heapq
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+
+import numpy as np
+
+from label_match import similarity_matrix
+
+ANCHOR_TOP_K = 5  # anchor hits whose zones are read for a field
+# Weights of an anchor hit's rank: how closely the hit's words spell the
+# anchor, how high on its page it sits, and whether its page is of a type the
+# field is scoped to
+ANCHOR_TEXT_WEIGHT = 0.5
+ANCHOR_POSITION_WEIGHT = 0.3
+ANCHOR_PAGE_TYPE_WEIGHT = 0.2
+ANCHOR_MIN_FUZZY = 0.85  # similarity at which OCR words stand in for an anchor they misspell
+ANCHOR_MIN_FUZZY_LENGTH = 5  # shorter anchors are too easily misread into other words
+_FUZZY_CHUNK = 4096  # word spans compared per batch
+
+
+def normalize_phrase(text: str) -> str:
+    """Lowercase and collapse whitespace; the form anchors and the word stream are matched in."""
+    return " ".join(str(text or "").lower().split())
+
+
+class AhoCorasick:
+    """Multi-phrase substring automaton: one left-to-right pass reports every occurrence."""
+
+    def __init__(self, phrases: Iterable[str]):
+        self.phrases: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for phrase in phrases:
+            if phrase and phrase not in self.phrases:
+                self._insert(phrase, len(self.phrases))
+                self.phrases.append(phrase)
+        self._build_failure_links()
+
+    def _insert(self, phrase: str, pid: int) -> None:
+        state = 0
+        for ch in phrase:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state].append(pid)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                # Inherit matches that end here through the failure chain
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, phrase_index) for every occurrence, ordered by end offset."""
+        goto, fail, out, phrases = self._goto, self._fail, self._out, self.phrases
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for pid in out[state]:
+                    yield i + 1 - len(phrases[pid]), i + 1, pid
+
+
+@dataclass
+class AnchorHit:
+    phrase: str
+    page: int
+    bbox: Tuple[float, float, float, float]
+    first_word: int  # index into the scanned word list
+    last_word: int
+
+
+class AnchorIndex:
+    """One automaton over every anchor/synonym phrase; scans a word list once.
+
+    Words are joined per page with single spaces (pages separated by a newline,
+    which no normalized phrase contains), so a phrase matches inside a single
+    word, as the old `anchor in word` test did, or across consecutive words.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self._automaton = AhoCorasick(p for p in (normalize_phrase(x) for x in phrases) if p)
+
+    @property
+    def phrases(self) -> List[str]:
+        return list(self._automaton.phrases)
+
+    def scan(self, words: List[Dict[str, Any]]) -> Dict[str, List[AnchorHit]]:
+        """Return {normalized phrase: [hits in word order]} for every phrase found."""
+        parts: List[str] = []
+        starts: List[int] = []  # stream offset where each word starts
+        pos = 0
+        prev_key = None
+        for w in words:
+            key = (w.get("doc"), w.get("page", 0))
+            if parts:
+                sep = " " if key == prev_key else "\n"
+                parts.append(sep)
+                pos += 1
+            prev_key = key
+            starts.append(pos)
+            t = str(w.get("text", "")).lower()
+            parts.append(t)
+            pos += len(t)
+        stream = "".join(parts)
+
+        hits: Dict[str, List[AnchorHit]] = {}
+        for start, end, pid in self._automaton.iter_matches(stream):
+            first = bisect_right(starts, start) - 1
+            last = bisect_right(starts, end - 1) - 1
+            span = words[first:last + 1]
+            boxes = [w.get("bbox", (0, 0, 0, 0)) for w in span]
+            bbox = (
+                min(b[0] for b in boxes), min(b[1] for b in boxes),
+                max(b[2] for b in boxes), max(b[3] for b in boxes),
+            )
+            phrase = self._automaton.phrases[pid]
+            hits.setdefault(phrase, []).append(AnchorHit(phrase, span[0].get("page", 0), bbox, first, last))
+        for found in hits.values():
+            found.sort(key=lambda h: h.first_word)
+        return hits
+
+
+def schema_anchor_phrases(schema: Dict[str, Any]) -> List[str]:
+    """Every zone anchor and label synonym declared by a schema's fields."""
+    phrases: List[str] = []
+    for key, fdef in (schema.get("fields") or {}).items():
+        phrases.extend(fdef.get("label_synonyms", []) or [])
+        ex = fdef.get("extract", {})
+        if isinstance(ex, dict) and isinstance(ex.get("zone"), dict):
+            anchor = ex["zone"].get("anchor")
+            phrases.append(anchor if anchor else key)
+    return phrases
+
+
+def _span_text(words: List[Dict[str, Any]], first: int, last: int) -> str:
+    """Normalized text of words[first..last] without the punctuation around a label."""
+    text = " ".join(str(w.get("text", "")) for w in words[first:last + 1])
+    return normalize_phrase(text).strip(" :;,.-#*()")
+
+
+def fuzzy_anchor_hits(phrases: Iterable[str], words: List[Dict[str, Any]], min_score: float = ANCHOR_MIN_FUZZY) -> Dict[str, List[AnchorHit]]:
+    """Hits for phrases that OCR misspelled ("B0rrower"), which an exact scan misses.
+
+    Every phrase is compared with every run of as many consecutive OCR words
+    (words with source "ocr") on one page, one similarity matrix per run
+    length. Text-layer words are spelled as printed, so they're left out.
+    """
+    wanted: Dict[int, List[str]] = {}
+    for p in phrases:
+        p = normalize_phrase(p)
+        if len(p) >= ANCHOR_MIN_FUZZY_LENGTH:
+            wanted.setdefault(len(p.split()), []).append(p)
+    ocr = [i for i, w in enumerate(words) if w.get("source") == "ocr"]
+    hits: Dict[str, List[AnchorHit]] = {}
+    if not wanted or not ocr:
+        return hits
+    key = lambda i: (words[i].get("doc"), words[i].get("page", 0))
+    for n, group in wanted.items():
+        spans = [
+            (ocr[j], ocr[j + n - 1]) for j in range(len(ocr) - n + 1)
+            if ocr[j + n - 1] - ocr[j] == n - 1 and key(ocr[j]) == key(ocr[j + n - 1])
+        ]
+        for start in range(0, len(spans), _FUZZY_CHUNK):
+            chunk = spans[start:start + _FUZZY_CHUNK]
+            scores = similarity_matrix(group, [_span_text(words, a, b) for a, b in chunk])
+            for pi, si in zip(*np.nonzero(scores >= min_score)):
+                a, b = chunk[si]
+                boxes = [w.get("bbox", (0, 0, 0, 0)) for w in words[a:b + 1]]
+                bbox = (
+                    min(x[0] for x in boxes), min(x[1] for x in boxes),
+                    max(x[2] for x in boxes), max(x[3] for x in boxes),
+                )
+                hits.setdefault(group[pi], []).append(AnchorHit(group[pi], words[a].get("page", 0), bbox, a, b))
+    for found in hits.values():
+        found.sort(key=lambda h: h.first_word)
+    return hits
+
+
+def _height_on_page(w: Dict[str, Any], bbox: Tuple[float, float, float, float]) -> float:
+    """1.0 at the top of the page down to 0.0 at the bottom; 0.5 when the page size is unknown."""
+    size = w.get("page_size")
+    if not size or not size[1]:
+        return 0.5
+    top = size[1] - bbox[3] if w.get("origin") == "bottom" else bbox[1]
+    return min(1.0, max(0.0, 1.0 - top / size[1]))
+
+
+def rank_anchor_hits(
+    phrase: str,
+    hits: List[AnchorHit],
+    words: List[Dict[str, Any]],
+    k: int = ANCHOR_TOP_K,
+    page_types: Iterable[str] = (),
+) -> List[Tuple[AnchorHit, float]]:
+    """The `k` best of a phrase's hits with their scores, best first.
+
+    A hit scores on how closely its words spell the phrase ("Borrower:" over
+    "Co-Borrowers"), how high on the page it sits (a label over a footer
+    repeating it) and, for a field scoped to `page_types`, whether its page is
+    one of them. Ties keep word order.
+    """
+    phrase = normalize_phrase(phrase)
+    wanted = tuple(page_types)
+    # One batch for every hit's spelling
+    spelling = similarity_matrix([phrase], [_span_text(words, h.first_word, h.last_word) for h in hits])[0] if hits else []
+
+    def score(n: int, hit: AnchorHit) -> float:
+        first = words[hit.first_word]
+        s = ANCHOR_TEXT_WEIGHT * float(spelling[n])
+        s += ANCHOR_POSITION_WEIGHT * _height_on_page(first, hit.bbox)
+        if wanted:
+            types = first.get("page_types") or ()
+            s += ANCHOR_PAGE_TYPE_WEIGHT * (1.0 if any(t in types for t in wanted) else 0.0 if types else 0.5)
+        return s
+
+    scored = [(score(n, h), -n, h) for n, h in enumerate(hits)]
+    return [(h, s) for s, _, h in heapq.nlargest(k, scored, key=lambda t: (t[0], t[1]))]
@@ -1,7 +1,19 @@
 from __future__ import annotations
-from typing import Dict, Any
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
 import fitz
 
+logger = logging.getLogger(__name__)
+
+SIDECAR_SUFFIX = ".calibration.json"  # transforms persisted next to the template, by cache key
+# Statuses worth persisting: "error" may be transient (e.g. the file was being replaced)
+_STABLE_STATUSES = ("ok", "no_anchor", "anchor_not_found")
+
 
 def compute_page_transform(doc: fitz.Document, schema: Dict[str, Any]) -> Dict[str, Any]:
     """Compute translation and uniform scale using anchor text on the actual template.
@@ -28,3 +40,93 @@ def compute_page_transform(doc: fitz.Document, schema: Dict[str, Any]) -> Dict[s
         return {"dx": dx, "dy": dy, "scale": scale, "status": "ok"}
     except Exception:
         return {"dx": 0.0, "dy": 0.0, "scale": 1.0, "status": "error"}
+
+
+_HASHES: Dict[Tuple[str, int, int], str] = {}
+_TRANSFORMS: Dict[str, Dict[str, Any]] = {}
+_SIDECARS: Dict[str, Dict[str, Dict[str, Any]]] = {}  # sidecar path -> its contents
+_lock = threading.Lock()
+
+
+def template_hash(template_path: Union[str, Path]) -> str:
+    """SHA-256 of a template file, cached by path, size and modification time."""
+    st = os.stat(template_path)
+    key = (str(template_path), st.st_mtime_ns, st.st_size)
+    h = _HASHES.get(key)
+    if h is None:
+        h = hashlib.sha256(Path(template_path).read_bytes()).hexdigest()
+        _HASHES[key] = h
+    return h
+
+
+def transform_key(template_digest: str, schema: Dict[str, Any]) -> str:
+    """Cache key of a transform: the template's hash plus what the schema says about calibrating it."""
+    block = {
+        "template": template_digest,
+        "page": (schema.get("template") or {}).get("page", 1),
+        "calibration": schema.get("calibration") or {},
+    }
+    return hashlib.sha1(json.dumps(block, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _sidecar_path(template_path: Union[str, Path]) -> Path:
+    return Path(str(template_path) + SIDECAR_SUFFIX)
+
+
+def _read_sidecar(path: Path) -> Dict[str, Dict[str, Any]]:
+    found = _SIDECARS.get(str(path))
+    if found is None:
+        try:
+            found = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            found = {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable calibration sidecar %s: %s", path, e)
+            found = {}
+        _SIDECARS[str(path)] = found
+    return found
+
+
+def _write_sidecar(path: Path, entries: Dict[str, Dict[str, Any]]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_text(json.dumps(entries, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        # A read-only templates/ directory only costs a recomputation per process
+        logger.info("Could not persist calibration to %s: %s", path, e)
+
+
+def page_transform(template_path: Union[str, Path], schema: Dict[str, Any], doc: Optional[fitz.Document] = None) -> Dict[str, Any]:
+    """compute_page_transform, computed once per (template file hash, calibration block).
+
+    Results are kept in memory and in a sidecar next to the template
+    (`<template>.calibration.json`), so the anchor search runs once per
+    template version rather than on every render. `doc` is the template
+    already open, if the caller has it; it is only used on a miss. A
+    `template.hash` in the schema that differs from the file's is logged:
+    the template was changed after the schema was calibrated against it.
+    """
+    digest = template_hash(template_path)
+    expected = (schema.get("template") or {}).get("hash")
+    if expected and expected != digest:
+        logger.warning("Template %s does not match the schema's template.hash; check its calibration", template_path)
+    key = transform_key(digest, schema)
+    with _lock:
+        found = _TRANSFORMS.get(key)
+        if found is None:
+            sidecar = _sidecar_path(template_path)
+            entries = _read_sidecar(sidecar)
+            found = entries.get(key)
+            if found is None:
+                if doc is not None:
+                    found = compute_page_transform(doc, schema)
+                else:
+                    with fitz.open(str(template_path)) as opened:
+                        found = compute_page_transform(opened, schema)
+                if found["status"] not in _STABLE_STATUSES:
+                    return dict(found)
+                entries[key] = found
+                _write_sidecar(sidecar, entries)
+            _TRANSFORMS[key] = found
+    return dict(found)
@@ -86,11 +86,12 @@ class CoverPageGenerator:
 
             # Schema-driven rendering
             from schema_loader import load_schema, apply_postprocess, validate_value
-            from calibration import compute_page_transform
-            from render import draw_text_in_box
+            from calibration import page_transform
+            from render import render_plan
 
             schema = load_schema("bradley_cover_v1.yml")
-            transform = compute_page_transform(doc, schema)
+            transform = page_transform(self.template_path, schema, doc)
+            plan = render_plan(schema, transform, page.rect.height)
 
             # Map input args to schema field keys
             data_map = {
@@ -106,27 +107,24 @@ class CoverPageGenerator:
 
             fields = schema.get("fields", {})
             validation_failures = []
+            values = {}
             for key, fdef in fields.items():
-                render_def = fdef.get("render", {})
                 text_val = apply_postprocess(data_map.get(key, ""), fdef.get("postprocess"))
                 ok, errs = validate_value(text_val, fdef.get("validate"))
                 if not ok:
                     validation_failures.append({"field": key, "errors": errs})
-                if render_def:
-                    draw_text_in_box(
-                        page,
-                        text_val,
-                        render_def.get("box", {}),
-                        render_def.get("font", {}),
-                        render_def.get("overflow", {}),
-                        transform,
-                    )
+                values[key] = text_val
+            # All fields in one text object rather than one per field
+            plan.draw_all(page, values)
 
             # Save the filled form
             path_obj = Path(output_path)
             path_obj.parent.mkdir(parents=True, exist_ok=True)
             
-            doc.save(str(path_obj))
+            # The TextWriter embeds the whole font; keep only the glyphs used and
+            # drop the replaced font objects
+            doc.subset_fonts()
+            doc.save(str(path_obj), garbage=3, deflate=True)
             doc.close()
             
             if verbose:
@@ -1,16 +1,28 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Dict, Any, Tuple
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Any, Callable, Iterator, Tuple, Optional, Iterable
 import re
+import time
 
-try:
-    from rapidfuzz import fuzz
-except Exception:
-    class _F:
-        @staticmethod
-        def token_set_ratio(a, b):
-            return 100 if a.lower() == b.lower() else 0
-    fuzz = _F()
+import numpy as np
+
+from anchor_index import ANCHOR_TOP_K, AnchorHit, AnchorIndex, fuzzy_anchor_hits, normalize_phrase, rank_anchor_hits
+from kv_index import KeyValueIndex
+from label_match import best_label_matches
+from layout import analyze_layout, reading_order
+from page_index import FieldScope, PageIndex
+from pattern_scan import RegexBudget, RegexTimeout, bounded_search
+from progress import ProgressHook, emit
+from text_buffer import DocumentText
+
+# Re-reads one rectangle of a page: (pdf path, page, (x0, y0, x1, y1) in PDF
+# points, top-left origin) -> words in page coordinates; see word_index.words_from_zone_ocr
+ZoneOCR = Callable[[str, int, Tuple[float, float, float, float]], List[Dict[str, Any]]]
+
+ZONE_OCR_MIN_CONF = 0.6  # zone text read below this average confidence is re-OCRed from a crop
+
+
+Box = Tuple[float, float, float, float]
 
 
 @dataclass
@@ -19,43 +31,141 @@ class FieldValue:
     confidence: float
     source: str  # "zone_text", "regex_text", "ocr_zone", "manual"
     notes: List[str]
+    # Where the value was read: the words' "doc" (or the document's id when
+    # extracting per document), 0-based page, and box in PDF points with a
+    # top-left origin. Unset when the value couldn't be traced to words.
+    doc_id: str = ""
+    page: Optional[int] = None
+    bbox: Optional[Box] = None
+
+
+def _source_box(words: List[Dict[str, Any]], ids: Iterable[int]) -> Optional[Tuple[str, int, Box]]:
+    """(doc, page, top-left box) around the given words on the first one's page."""
+    ids = list(ids)
+    if not ids:
+        return None
+    first = words[ids[0]]
+    key = (first.get("doc"), first.get("page", 0))
+    boxes = []
+    for i in ids:
+        w = words[i]
+        if (w.get("doc"), w.get("page", 0)) != key:
+            continue
+        x0, y0, x1, y1 = w.get("bbox", (0, 0, 0, 0))
+        if w.get("origin") == "bottom":
+            height = (w.get("page_size") or (0.0, 0.0))[1]
+            y0, y1 = height - y1, height - y0
+        boxes.append((x0, y0, x1, y1))
+    bbox = (min(b[0] for b in boxes), min(b[1] for b in boxes), max(b[2] for b in boxes), max(b[3] for b in boxes))
+    return str(key[0] or ""), key[1], bbox
 
 
 def fuzzy_label_match(label: str, candidates: List[str]) -> Tuple[str, float]:
-    if not candidates:
-        return label, 0.0
-    best = max(candidates, key=lambda c: fuzz.token_set_ratio(label, c))
-    score = float(fuzz.token_set_ratio(label, best)) / 100.0
-    return best, score
+    """Closest of `candidates` to `label` and its score; see label_match.best_label_matches."""
+    return best_label_matches({label: list(candidates)})[label]
 
 
-def extract_zone_text(words: List[Dict[str, Any]], anchor: str, offset: Dict[str, float]) -> Tuple[str, float, List[str]]:
-    """Extract text from a box offset relative to the first matching anchor word."""
-    anchors = [w for w in words if anchor.lower() in (w.get("text", "").lower())]
-    if not anchors:
-        return "", 0.0, ["anchor_not_found"]
-    ax0, ay0, ax1, ay1 = anchors[0].get("bbox", (0, 0, 0, 0))
+def _zone_rect(anchor_bbox: Tuple[float, float, float, float], offset: Dict[str, float]) -> Tuple[float, float, float, float]:
+    ax0, ay0, ax1, ay1 = anchor_bbox
     # Offset box to the right by default (coordinates assumed bottom-origin for words; keep simple bounding)
     zx0 = ax1 + float(offset.get("x", 0))
     zy0 = ay0 + float(offset.get("y", 0))
-    zx1 = zx0 + float(offset.get("w", 0))
-    zy1 = zy0 + float(offset.get("h", 0))
-    in_box = [w for w in words if zx0 <= w.get("bbox", (0, 0, 0, 0))[0] <= zx1 and zy0 <= w.get("bbox", (0, 0, 0, 0))[1] <= zy1]
-    text = " ".join(w.get("text", "") for w in in_box).strip()
-    confs = [w.get("conf", 0.9) for w in in_box] or [0.0]
-    return text, sum(confs) / len(confs), []
+    return zx0, zy0, zx0 + float(offset.get("w", 0)), zy0 + float(offset.get("h", 0))
+
+
+@dataclass
+class _WordArrays:
+    """Word boxes as arrays, so a zone test covers every word at once."""
+    corners: np.ndarray  # (n, 2) x0, y0 of each word box
+    pages: np.ndarray  # (n,) one id per (doc, page)
+    confs: np.ndarray  # (n,)
+
+    @classmethod
+    def of(cls, words: List[Dict[str, Any]]) -> "_WordArrays":
+        page_ids: Dict[Tuple[Any, int], int] = {}
+        pages = [page_ids.setdefault((w.get("doc"), w.get("page", 0)), len(page_ids)) for w in words]
+        corners = np.array([w.get("bbox", (0, 0, 0, 0))[:2] for w in words], dtype=float).reshape(-1, 2)
+        return cls(corners, np.array(pages, dtype=int), np.array([w.get("conf", 0.9) for w in words], dtype=float))
+
+
+def _best_zone(
+    words: List[Dict[str, Any]],
+    anchor: str,
+    offset: Dict[str, float],
+    hits: List[AnchorHit],
+    page_types: Iterable[str] = (),
+    k: int = ANCHOR_TOP_K,
+    arrays: Optional[_WordArrays] = None,
+) -> Tuple[AnchorHit, str, float, List[int]]:
+    """(anchor hit, zone text, average confidence, zone word ids) for the best of the top `k` hits.
+
+    The zones of the k best-ranked hits (see rank_anchor_hits) are tested
+    against every word in one array operation; the best-ranked hit whose zone
+    holds any words wins, else the best-ranked hit with an empty zone.
+    """
+    ranked = [h for h, _ in rank_anchor_hits(anchor, hits, words, k, page_types)]
+    arrays = arrays or _WordArrays.of(words)
+    rects = np.array([_zone_rect(h.bbox, offset) for h in ranked], dtype=float)
+    hit_pages = arrays.pages[[h.first_word for h in ranked]]
+    x, y = arrays.corners[:, 0], arrays.corners[:, 1]
+    inside = (
+        (x >= rects[:, 0:1]) & (x <= rects[:, 2:3]) & (y >= rects[:, 1:2]) & (y <= rects[:, 3:4])
+        & (arrays.pages == hit_pages[:, None])
+    )
+    filled = np.flatnonzero(inside.any(axis=1))
+    best = int(filled[0]) if len(filled) else 0
+    ids = np.flatnonzero(inside[best])
+    in_box = [words[i] for i in ids]
+    # A zone may hold several lines or columns; read them in order rather than list order
+    text = " ".join(in_box[i].get("text", "") for i in reading_order(in_box)).strip()
+    conf = float(arrays.confs[ids].mean()) if len(ids) else 0.0
+    return ranked[best], text, conf, [int(i) for i in ids]
+
+
+def extract_zone_text(
+    words: List[Dict[str, Any]],
+    anchor: str,
+    offset: Dict[str, float],
+    hits: Optional[List[AnchorHit]] = None,
+    page_types: Iterable[str] = (),
+    k: int = ANCHOR_TOP_K,
+) -> Tuple[str, float, List[str]]:
+    """Extract text from a box offset relative to the best-placed anchor occurrence.
+
+    `hits` are the anchor's occurrences from an AnchorIndex scan of `words`; when
+    omitted the words are searched for the anchor directly. At most `k` of
+    them are tried (see _best_zone); `page_types` favours hits on those pages.
+    """
+    if hits is None:
+        hits = [
+            AnchorHit(anchor, w.get("page", 0), w.get("bbox", (0, 0, 0, 0)), i, i)
+            for i, w in enumerate(words) if anchor.lower() in (w.get("text", "").lower())
+        ]
+    if not hits:
+        return "", 0.0, ["anchor_not_found"]
+    _, text, conf, _ = _best_zone(words, anchor, offset, hits, page_types, k)
+    return text, conf, []
+
 
+_REGEX_FLAGS = re.IGNORECASE | re.MULTILINE  # flags schema regexes run with
 
-def extract_with_regex(text: str, pattern: str) -> str:
-    m = re.search(pattern, text or "", re.IGNORECASE | re.MULTILINE)
+
+def extract_with_regex(text: str, pattern: str, budget: Optional[RegexBudget] = None) -> str:
+    """First match of a schema regex. Raises RegexTimeout if it exceeds the budget."""
+    return _match_value(bounded_search(pattern, text or "", _REGEX_FLAGS, budget))
+
+
+def _value_group(m):
+    """The group holding a schema regex's value: "value", else the first capture group, else the match."""
+    if "value" in m.groupdict():
+        return "value"
+    return 1 if m.groups() else 0
+
+
+def _match_value(m) -> str:
     if not m:
         return ""
-    if "value" in m.groupdict():
-        return (m.group("value") or "").strip()
-    # else first capture group
-    if m.groups():
-        return (m.group(1) or "").strip()
-    return (m.group(0) or "").strip()
+    return (m.group(_value_group(m)) or "").strip()
 
 
 def score_confidence(source: str, base: float, label_score: float) -> float:
@@ -75,46 +185,351 @@ def score_confidence(source: str, base: float, label_score: float) -> float:
     return max(0.0, min(1.0, c))
 
 
-def extract_fields_from_schema(words: List[Dict[str, Any]], full_text: str, schema: Dict[str, Any]) -> Dict[str, FieldValue]:
-    """Use schema's extract rules (zone then regex) to produce FieldValue per field."""
-    results: Dict[str, FieldValue] = {}
-    field_defs = schema.get("fields", {})
-    for key, fdef in field_defs.items():
-        label_syns = fdef.get("label_synonyms", [])
-        best_label, label_score = fuzzy_label_match(key, label_syns)
-        value = ""
-        source = ""
-        base_conf = 0.9
-        # Try zone first if provided
-        ex = fdef.get("extract", {})
-        if isinstance(ex, dict) and "zone" in ex:
-            z = ex.get("zone", {})
-            a = z.get("anchor") or best_label or key
-            text, ocr_avg, _ = extract_zone_text(words, a, z.get("offset", {}))
-            if text:
-                value = text
-                source = "zone_text"
-                base_conf = ocr_avg if ocr_avg else 0.8
-        # Fallback regex
-        if not value and isinstance(ex, dict) and ex.get("regex"):
-            rx = ex.get("regex")
-            if isinstance(rx, str) and rx:
-                text = extract_with_regex(full_text or "", rx)
+def _finalize(key: str, fdef: Dict[str, Any], value: str, source: str, base_conf: float, label_score: float, where: Optional[Tuple[str, int, Box]] = None) -> FieldValue:
+    """Postprocess, validate and score one raw extracted value; `where` is its (doc, page, bbox)."""
+    from schema_loader import apply_postprocess, validate_value
+    value_pp = apply_postprocess(value, fdef.get("postprocess"))
+    ok, errs = validate_value(value_pp, fdef.get("validate"))
+    conf = score_confidence(source, base_conf, label_score)
+    if not ok:
+        conf = min(conf, 0.55)  # force red
+    doc_id, page, bbox = where or ("", None, None)
+    return FieldValue(value_pp, conf, source, errs, doc_id, page, bbox)
+
+
+def _field_labels(fdef: Dict[str, Any]) -> List[str]:
+    """Labels a field's value may follow as "Label: value": its synonyms and zone anchor."""
+    labels = list(fdef.get("label_synonyms", []) or [])
+    ex = fdef.get("extract", {})
+    if isinstance(ex, dict) and isinstance(ex.get("zone"), dict) and ex["zone"].get("anchor"):
+        labels.append(ex["zone"]["anchor"])
+    return labels
+
+
+def _regex_texts(words: List[Dict[str, Any]], full_text: str) -> Tuple[str, DocumentText]:
+    """(text layer, words rebuilt in reading order) for the field regexes.
+
+    Text-layer extraction interleaves the lines of multi-column pages, which
+    the reading-order text doesn't. A scanned document has no text layer, so
+    the rebuilt text stands in for it.
+    """
+    reading = DocumentText(words, analyze_layout(words))
+    return (full_text if (full_text or "").strip() else reading.text), reading
+
+
+@dataclass
+class _SearchInputs:
+    """What a field's rules search: words, their anchor hits, and the regex texts."""
+    words: List[Dict[str, Any]]
+    anchor_hits: Dict[str, List[AnchorHit]]
+    full_text: str
+    reading: DocumentText
+    kv: KeyValueIndex
+    _arrays: Optional[_WordArrays] = field(default=None, repr=False)
+
+    @property
+    def reading_text(self) -> str:
+        return self.reading.text
+
+    def locate(self, pattern: str, value: str, budget: Optional[RegexBudget] = None) -> Optional[Tuple[str, int, Box]]:
+        """(doc, page, bbox) of the words where `pattern` reads `value`.
+
+        The text layer has no offsets into the words, so the regex is run on
+        the reading-order text and the first match giving the same value is
+        mapped back to its words.
+        """
+        pos = 0
+        while pos <= len(self.reading):
+            try:
+                m = self.reading.search(pattern, _REGEX_FLAGS, budget, pos)
+            except RegexTimeout:
+                return None
+            if m is None:
+                return None
+            if _value_key(_match_value(m)) == _value_key(value):
+                return _source_box(self.words, m.words(_value_group(m)))
+            start, end = m.span()
+            pos = max(end, start + 1)
+        return None
+
+    def word_arrays(self) -> _WordArrays:
+        if self._arrays is None:
+            self._arrays = _WordArrays.of(self.words)
+        return self._arrays
+
+
+class _FieldScopes:
+    """Search inputs for each field scope of one document, each built on first use.
+
+    A field's extract block may limit it to page types, page numbers, a page
+    region or document kinds (see page_index.FieldScope); the words in scope
+    are picked through a PageIndex. The text layer can't be split by page, so
+    a scoped field's regexes read the scoped words' text.
+    """
+
+    def __init__(self, words: List[Dict[str, Any]], full_text: str, anchors: AnchorIndex):
+        self.words = words
+        self.full_text = full_text
+        self.anchors = anchors
+        self._index: Optional[PageIndex] = None
+        self._inputs: Dict[FieldScope, _SearchInputs] = {}
+
+    def _build(self, words: List[Dict[str, Any]], full_text: str) -> _SearchInputs:
+        # One automaton pass finds every anchor and synonym of every field
+        anchor_hits = self.anchors.scan(words)
+        # OCR may have misspelled the ones it didn't find
+        missing = [p for p in self.anchors.phrases if p not in anchor_hits]
+        if missing:
+            anchor_hits.update(fuzzy_anchor_hits(missing, words))
+        full_text, reading = _regex_texts(words, full_text)
+        return _SearchInputs(words, anchor_hits, full_text, reading, KeyValueIndex([full_text]))
+
+    def for_field(self, fdef: Dict[str, Any]) -> _SearchInputs:
+        scope = FieldScope.from_extract(fdef.get("extract", {}))
+        if scope not in self._inputs:
+            if not scope:
+                self._inputs[scope] = self._build(self.words, self.full_text)
             else:
-                text = ""
-            if text:
-                value = text
+                if self._index is None:
+                    self._index = PageIndex(self.words)
+                selected = self._index.select(scope)
+                if len(selected) == len(self.words):
+                    self._inputs[scope] = self.for_field({})
+                else:
+                    self._inputs[scope] = self._build([self.words[i] for i in selected], "")
+        return self._inputs[scope]
+
+
+def ocr_zone_crop(zone_ocr: ZoneOCR, anchor_word: Dict[str, Any], anchor_bbox: Tuple[float, float, float, float], offset: Dict[str, float]) -> Optional[Tuple[str, float, Box]]:
+    """(text, average confidence, top-left zone rect) of a zone re-read by `zone_ocr`, or None if it can't be.
+
+    The zone is the one extract_zone_text reads, taken on the anchor word's
+    page of the PDF the word came from.
+    """
+    doc = anchor_word.get("doc")
+    if not doc:
+        return None
+    x0, y0, x1, y1 = _zone_rect(anchor_bbox, offset)
+    if anchor_word.get("origin") == "bottom":
+        size = anchor_word.get("page_size")
+        if not size:
+            return None
+        y0, y1 = size[1] - y1, size[1] - y0
+    words = zone_ocr(str(doc), anchor_word.get("page", 0), (x0, y0, x1, y1))
+    if not words:
+        return None
+    text = " ".join(words[i].get("text", "") for i in reading_order(words)).strip()
+    confs = [w.get("conf", 0.0) for w in words]
+    return text, sum(confs) / len(confs), (x0, y0, x1, y1)
+
+
+def _field_candidates(
+    key: str,
+    fdef: Dict[str, Any],
+    inputs: _SearchInputs,
+    budget: Optional[RegexBudget],
+    exhaustive: bool,
+    zone_ocr: Optional[ZoneOCR] = None,
+    label: Optional[Tuple[str, float]] = None,
+) -> Tuple[List[FieldValue], FieldValue]:
+    """Values for one field in rule order (zone, then regex), plus the not-found result.
+
+    With `zone_ocr`, a zone read empty or below ZONE_OCR_MIN_CONF is re-OCRed
+    from a high-DPI crop of just that zone, and the crop's text is used when
+    it is more confident.
+
+    The regex is tried on the field's labeled lines, then the full text, then
+    the words' reading-order text.
+    Stops after the first rule that produces a value unless `exhaustive`.
+    `label` is the field's (closest synonym, score) when already computed
+    for the whole schema (CompiledSchema.labels).
+    """
+    best_label, label_score = label or fuzzy_label_match(key, fdef.get("label_synonyms", []))
+    candidates: List[FieldValue] = []
+    source = ""
+    notes: List[str] = []
+    ex = fdef.get("extract", {})
+    # Try zone first if provided
+    if isinstance(ex, dict) and "zone" in ex:
+        z = ex.get("zone", {})
+        a = z.get("anchor") or best_label or key
+        hits = inputs.anchor_hits.get(normalize_phrase(a), [])
+        text, ocr_avg, hit = "", 0.0, None
+        if hits:
+            page_types = FieldScope.from_extract(ex).page_types
+            hit, text, ocr_avg, zone_ids = _best_zone(inputs.words, a, z.get("offset", {}), hits, page_types, arrays=inputs.word_arrays())
+        crop = None
+        if zone_ocr is not None and hit is not None and (not text or ocr_avg < ZONE_OCR_MIN_CONF):
+            crop = ocr_zone_crop(zone_ocr, inputs.words[hit.first_word], hit.bbox, z.get("offset", {}))
+        if crop and crop[0] and (not text or crop[1] > ocr_avg):
+            where = _source_box(inputs.words, range(hit.first_word, hit.last_word + 1))
+            if where is not None:
+                # The anchor plus the zone that was re-read
+                zx0, zy0, zx1, zy1 = crop[2]
+                x0, y0, x1, y1 = where[2]
+                where = (where[0], where[1], (min(x0, zx0), min(y0, zy0), max(x1, zx1), max(y1, zy1)))
+            candidates.append(_finalize(key, fdef, crop[0], "ocr_zone", crop[1], label_score, where))
+        elif text:
+            where = _source_box(inputs.words, [*range(hit.first_word, hit.last_word + 1), *zone_ids])
+            candidates.append(_finalize(key, fdef, text, "zone_text", ocr_avg if ocr_avg else 0.8, label_score, where))
+    # Fallback regex
+    if (exhaustive or not candidates) and isinstance(ex, dict) and ex.get("regex"):
+        rx = ex.get("regex")
+        text = ""
+        if isinstance(rx, str) and rx:
+            try:
+                text = _match_value(inputs.kv.search_lines(_field_labels(fdef), rx, _REGEX_FLAGS))
+                if not text:
+                    text = extract_with_regex(inputs.full_text, rx, budget)
+                if not text and inputs.reading_text != inputs.full_text:
+                    text = extract_with_regex(inputs.reading_text, rx, budget)
+            except RegexTimeout:
                 source = "regex_text"
-                base_conf = 0.6
-        if not value:
-            results[key] = FieldValue("", 0.0, source or "", ["not_found"])
+                notes.append("regex_timeout")
+        if text:
+            candidates.append(_finalize(key, fdef, text, "regex_text", 0.6, label_score, inputs.locate(rx, text, budget)))
+    return candidates, FieldValue("", 0.0, source, notes or ["not_found"])
+
+
+def _iter_schema_fields(
+    scopes: _FieldScopes,
+    schema: Dict[str, Any],
+    budget: Optional[RegexBudget],
+    only: Optional[Iterable[str]],
+    zone_ocr: Optional[ZoneOCR],
+    progress: Optional[ProgressHook] = None,
+) -> Iterator[Tuple[str, FieldValue]]:
+    from schema_loader import compile_schema
+    labels = compile_schema(schema).labels
+    field_defs = schema.get("fields", {})
+    wanted = set(only) if only is not None else None
+    for key, fdef in field_defs.items():
+        if wanted is not None and key not in wanted:
             continue
-        # Postprocess & compute confidence
-        from schema_loader import apply_postprocess, validate_value
-        value_pp = apply_postprocess(value, fdef.get("postprocess"))
-        ok, errs = validate_value(value_pp, fdef.get("validate"))
-        conf = score_confidence(source, base_conf, label_score)
-        if not ok:
-            conf = min(conf, 0.55)  # force red
-        results[key] = FieldValue(value_pp, conf, source, errs)
+        started = time.perf_counter()
+        candidates, missing = _field_candidates(key, fdef, scopes.for_field(fdef), budget, exhaustive=False, zone_ocr=zone_ocr, label=labels.get(key))
+        fv = candidates[0] if candidates else missing
+        emit(progress, "field", field=key, value=fv, seconds=time.perf_counter() - started)
+        yield key, fv
+
+
+def extract_fields_from_schema(words: List[Dict[str, Any]], full_text: str, schema: Dict[str, Any], budget: Optional[RegexBudget] = None, only: Optional[Iterable[str]] = None, zone_ocr: Optional[ZoneOCR] = None, progress: Optional[ProgressHook] = None) -> Dict[str, FieldValue]:
+    """Use schema's extract rules (zone then regex) to produce FieldValue per field.
+
+    Each field regex runs under `budget`; one that exceeds it leaves the field
+    empty with a "regex_timeout" note rather than stalling the whole request.
+    `only` restricts extraction to the named fields. `zone_ocr` re-reads
+    low-confidence zones (see _field_candidates). `progress` gets a "field"
+    event as each field resolves.
+    """
+    from schema_loader import compile_schema
+    scopes = _FieldScopes(words, full_text, compile_schema(schema).anchors)
+    return dict(_iter_schema_fields(scopes, schema, budget, only, zone_ocr, progress))
+
+
+def extract_fields_multi(
+    words: List[Dict[str, Any]],
+    full_text: str,
+    schemas: Dict[str, Dict[str, Any]],
+    budget: Optional[RegexBudget] = None,
+    zone_ocr: Optional[ZoneOCR] = None,
+) -> Dict[str, Dict[str, FieldValue]]:
+    """extract_fields_from_schema for several schemas over one document, keyed by schema name.
+
+    The anchors of all the schemas go into one automaton, so the words are
+    scanned once; the page index, text buffers and label index are built once
+    per field scope and shared by every schema's fields.
+    """
+    from schema_loader import compile_schemas
+    scopes = _FieldScopes(words, full_text, compile_schemas(list(schemas.values())).anchors)
+    return {name: dict(_iter_schema_fields(scopes, schema, budget, None, zone_ocr)) for name, schema in schemas.items()}
+
+
+@dataclass
+class FieldCandidate:
+    """One document's value for a field, with where it came from."""
+    field: FieldValue
+    doc_id: str
+    rank: int  # position among this document's candidates (0 = the rule tried first)
+
+
+def extract_document_candidates(
+    words: List[Dict[str, Any]],
+    full_text: str,
+    schema: Dict[str, Any],
+    doc_id: str,
+    budget: Optional[RegexBudget] = None,
+    only: Optional[Iterable[str]] = None,
+    zone_ocr: Optional[ZoneOCR] = None,
+    progress: Optional[ProgressHook] = None,
+) -> Dict[str, List[FieldCandidate]]:
+    """Run every extraction rule of every field over a single document.
+
+    Unlike extract_fields_from_schema, the regex runs even when the zone found a
+    value, so the merge can weigh both. Fields with no value get an empty list,
+    or a single empty candidate carrying the miss notes (e.g. regex_timeout).
+    `progress` gets a "field" event per field with this document's first candidate.
+    """
+    from schema_loader import compile_schema
+    compiled = compile_schema(schema)
+    scopes = _FieldScopes(words, full_text, compiled.anchors)
+    wanted = set(only) if only is not None else None
+    out: Dict[str, List[FieldCandidate]] = {}
+    for key, fdef in schema.get("fields", {}).items():
+        if wanted is not None and key not in wanted:
+            continue
+        started = time.perf_counter()
+        candidates, missing = _field_candidates(key, fdef, scopes.for_field(fdef), budget, exhaustive=True, zone_ocr=zone_ocr, label=compiled.labels.get(key))
+        emit(progress, "field", doc=doc_id, field=key, value=candidates[0] if candidates else missing, seconds=time.perf_counter() - started)
+        if candidates:
+            out[key] = [FieldCandidate(replace(fv, doc_id=doc_id), doc_id, rank) for rank, fv in enumerate(candidates)]
+        else:
+            out[key] = [FieldCandidate(missing, doc_id, 0)] if missing.notes != ["not_found"] else []
+    return out
+
+
+def _value_key(value: str) -> str:
+    return " ".join(value.lower().split())
+
+
+def _agreement_scores(found: List[FieldCandidate]) -> List[float]:
+    """Confidence plus 0.05 for every other document that found the same value."""
+    docs: Dict[str, set] = {}
+    for c in found:
+        docs.setdefault(_value_key(c.field.value), set()).add(c.doc_id)
+    return [min(1.0, c.field.confidence + 0.05 * (len(docs[_value_key(c.field.value)]) - 1)) for c in found]
+
+
+def rank_candidates(candidates: List[FieldCandidate], doc_order: List[str]) -> List[Tuple[float, FieldCandidate]]:
+    """(score, candidate) best first: score, then rule order, then upload order.
+
+    The score is the candidate's confidence raised when other documents agree,
+    since independent documents giving the same value make it more likely correct.
+    """
+    found = [c for c in candidates if c.field.value]
+    pos = {d: i for i, d in enumerate(doc_order)}
+    scored = zip(_agreement_scores(found), found)
+    return sorted(scored, key=lambda sc: (-sc[0], sc[1].rank, pos.get(sc[1].doc_id, len(pos))))
+
+
+def merge_candidates(
+    per_doc: Dict[str, Dict[str, List[FieldCandidate]]],
+    schema: Dict[str, Any],
+    doc_order: Optional[List[str]] = None,
+) -> Dict[str, FieldValue]:
+    """Pick each field's best value across documents (see rank_candidates)."""
+    order = list(doc_order) if doc_order is not None else list(per_doc)
+    results: Dict[str, FieldValue] = {}
+    for key in schema.get("fields", {}):
+        pool = [c for d in order for c in per_doc.get(d, {}).get(key, [])]
+        ranked = rank_candidates(pool, order)
+        if ranked:
+            score, best = ranked[0]
+            results[key] = FieldValue(
+                best.field.value, score, best.field.source, list(best.field.notes),
+                best.doc_id, best.field.page, best.field.bbox,
+            )
+        else:
+            notes = sorted({n for c in pool for n in c.field.notes}) or ["not_found"]
+            results[key] = FieldValue("", 0.0, "", notes)
     return results
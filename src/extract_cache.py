@@ -0,0 +1,183 @@
+from __future__ import annotations
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from extract import (
+    FieldCandidate,
+    FieldValue,
+    ZoneOCR,
+    extract_document_candidates,
+    merge_candidates,
+)
+from instrument_scan import RecordedInstrument, scan_instruments
+from progress import ProgressHook, emit
+from schema_loader import compile_schema, schema_hash
+
+# Produces (words, full_text) for the documents; only called on a cache miss
+InputLoader = Callable[[], Tuple[List[Dict[str, Any]], str]]
+
+
+def document_hash(data: bytes) -> str:
+    """Content hash identifying an uploaded document."""
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass
+class DocumentInput:
+    """One uploaded document: a display id, its content hash and how to parse it."""
+    doc_id: str
+    doc_hash: str
+    load: InputLoader
+
+
+def _copy(fv: FieldValue) -> FieldValue:
+    return replace(fv, notes=list(fv.notes))
+
+
+def _instruments_key(doc: DocumentInput, settings_key: str) -> Tuple[str, ...]:
+    return ("doc", doc.doc_hash, settings_key, "instruments")
+
+
+class ExtractionMemo:
+    """LRU memo of extraction results.
+
+    `document_candidates` caches one document's candidates keyed by its
+    content hash and OCR settings, each field under its definition's hash, so
+    after a YAML edit only the fields whose definitions changed are recomputed. `document_instruments` caches the
+    recorded instruments a document references; with `instruments` set, every
+    document `document_candidates` loads is also scanned for them (one more
+    regex pass over its text) so they never need a second parse.
+    """
+
+    def __init__(self, max_entries: int = 2048, instruments: bool = False):
+        self.max_entries = max_entries
+        self.instruments = instruments
+        self._entries: "OrderedDict[Tuple[str, ...], Any]" = OrderedDict()
+        self._lock = threading.Lock()  # documents are extracted from worker threads
+
+    def _get(self, key: Tuple[str, ...]) -> Any:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def _put(self, key: Tuple[str, ...], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def forget(self, doc_hash: str) -> None:
+        """Drop every per-document entry for one document."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == "doc" and k[1] == doc_hash]:
+                del self._entries[key]
+
+    def document_candidates(
+        self,
+        doc: DocumentInput,
+        schema: Dict[str, Any],
+        ocr_settings: Optional[Dict[str, Any]] = None,
+        zone_ocr: Optional[ZoneOCR] = None,
+        progress: Optional[ProgressHook] = None,
+    ) -> Dict[str, List[FieldCandidate]]:
+        """extract_document_candidates for one document, cached per field definition.
+
+        Whether zones may be re-OCRed should be part of `ocr_settings`, since
+        it changes the results. `progress` gets a "field" event for cached
+        fields straight away, then "document" once the document is loaded and
+        "field" events as the rest resolve.
+        """
+        settings_key = schema_hash(ocr_settings or {})
+        field_keys = {
+            k: ("doc", doc.doc_hash, settings_key, k, schema_hash(fdef))
+            for k, fdef in schema.get("fields", {}).items()
+        }
+        results: Dict[str, List[FieldCandidate]] = {}
+        missing: List[str] = []
+        for k, key in field_keys.items():
+            cands = self._get(key)
+            if cands is None:
+                missing.append(k)
+            else:
+                results[k] = cands
+                if cands:
+                    emit(progress, "field", doc=doc.doc_id, field=k, value=_copy(cands[0].field), source="cache")
+        if missing:
+            started = time.perf_counter()
+            words, full_text = doc.load()
+            emit(progress, "document", doc=doc.doc_id, seconds=time.perf_counter() - started)
+            fresh = extract_document_candidates(words, full_text, schema, doc.doc_id, only=missing, zone_ocr=zone_ocr, progress=progress)
+            if self.instruments:
+                # The text is at hand; scanning it now spares document_instruments a second parse
+                self._put(_instruments_key(doc, settings_key), scan_instruments(full_text))
+            for k in missing:
+                results[k] = fresh.get(k, [])
+                self._put(field_keys[k], results[k])
+        # The same bytes may come back under another name
+        return {
+            k: [replace(c, field=replace(_copy(c.field), doc_id=doc.doc_id), doc_id=doc.doc_id) for c in results[k]]
+            for k in field_keys
+        }
+
+    def document_instruments(
+        self,
+        doc: DocumentInput,
+        ocr_settings: Optional[Dict[str, Any]] = None,
+    ) -> List[RecordedInstrument]:
+        """Recorded instruments referenced in one document (instrument_scan.scan_instruments).
+
+        Free after document_candidates has loaded the document with the same
+        `ocr_settings`; otherwise the document is loaded here.
+        """
+        key = _instruments_key(doc, schema_hash(ocr_settings or {}))
+        found = self._get(key)
+        if found is None:
+            _, full_text = doc.load()
+            found = scan_instruments(full_text)
+            self._put(key, found)
+        return [replace(i) for i in found]
+
+
+_DEFAULT_MEMO = ExtractionMemo()
+
+
+def extract_documents(
+    docs: List[DocumentInput],
+    schema: Dict[str, Any],
+    ocr_settings: Optional[Dict[str, Any]] = None,
+    memo: Optional[ExtractionMemo] = None,
+    max_workers: Optional[int] = None,
+    zone_ocr: Optional[ZoneOCR] = None,
+    progress: Optional[ProgressHook] = None,
+) -> Tuple[Dict[str, FieldValue], Dict[str, Dict[str, List[FieldCandidate]]]]:
+    """Extract each document separately, in parallel, then merge across documents.
+
+    Returns (merged FieldValue per field, {doc_id: {field: ranked candidates}}).
+    Per-document results are memoized by content hash, so only new or changed
+    documents are parsed and scanned. `progress` is called from the worker
+    threads (see ExtractionMemo.document_candidates).
+    """
+    ids = [d.doc_id for d in docs]
+    if len(set(ids)) != len(ids):
+        raise ValueError("doc_id values must be unique")
+    memo = memo or _DEFAULT_MEMO
+    compile_schema(schema)  # compile once up front rather than racing in the workers
+    if len(docs) <= 1 or max_workers == 1:
+        found = [memo.document_candidates(d, schema, ocr_settings, zone_ocr, progress) for d in docs]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers or min(8, len(docs))) as pool:
+            found = list(pool.map(lambda d: memo.document_candidates(d, schema, ocr_settings, zone_ocr, progress), docs))
+    per_doc = dict(zip(ids, found))
+    return merge_candidates(per_doc, schema, ids), per_doc
@@ -2,20 +2,250 @@
 Field Extractor - Pattern matching and field identification
 """
 import re
-from typing import Dict, Any, Optional, List
+from dataclasses import asdict
+from typing import Dict, Any, Iterable, Optional, List, Tuple
 from datetime import datetime
 
+from instrument_scan import scan_instruments
+from kv_index import KeyValueIndex
+from pattern_scan import PatternSet, RegexBudget, RegexTimeout, ScanMatch, bounded_search
+
+# Flags used by _extract_with_patterns
+_SINGLE_FLAGS = re.IGNORECASE | re.DOTALL
+_MULTILINE_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# "Label: value" lines reported by extract_additional_fields
+_ADDITIONAL_LINE = re.compile(r"^([A-Z][A-Za-z\s]+?):\s*(.+?)$", re.MULTILINE)
+_NAME_VALUE = r"([A-Z][a-z]+(?:\s[A-Z][a-z]+)+)"
+_AMOUNT_VALUE = r"\$?([\d,]+\.?\d*)"
+
 
 class FieldExtractor:
     """Extract structured fields from PDF text using pattern matching"""
+
+    OWNER_NAME_PATTERNS = [
+        r"(?:Owner|Grantee|Grantor)[\s:]+([A-Z][a-z]+(?:\s[A-Z][a-z]+)+)",
+        r"(?:Name|Owner Name)[\s:]+([A-Z][a-z]+(?:\s[A-Z][a-z]+)+)",
+        r"^([A-Z][a-z]+\s+[A-Z][a-z]+)$"  # Simple name pattern
+    ]
+    PROPERTY_ADDRESS_PATTERNS = [
+        r"(?:Property Address|Address|Property Location)[\s:]+(.+?)(?:\n|$)",
+        r"(?:Located at|Premises at)[\s:]+(.+?)(?:\n|$)",
+        r"\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd)[,\s]+[A-Z][a-z]+[,\s]+[A-Z]{2}\s+\d{5}"
+    ]
+    PARCEL_NUMBER_PATTERNS = [
+        r"(?:Parcel|PIN|APN|Parcel Number|Parcel ID)[\s:#]+([A-Z0-9\-]+)",
+        r"(?:Tax ID|Tax Parcel)[\s:#]+([A-Z0-9\-]+)",
+        r"\b\d{2,3}-\d{2,3}-\d{2,4}-\d{2,4}\b"  # Common parcel format
+    ]
+    LEGAL_DESCRIPTION_PATTERNS = [
+        r"(?:Legal Description|Legal)[\s:]+(.+?)(?=\n\n|\n[A-Z][a-z]+:)",
+        r"(?:Description|Described as follows)[\s:]+(.+?)(?=\n\n|\n[A-Z][a-z]+:)",
+        r"Lot\s+\d+.*?Block\s+\d+.*?(?:Subdivision|Addition).*?(?=\n\n|\n[A-Z])"
+    ]
+    DEED_BOOK_PATTERN = r"(?:Book|Deed Book)[\s:#]+(\d+)"
+    DEED_PAGE_PATTERN = r"(?:Page|Pg)[\s:#]+(\d+)"
+    DEED_VOLUME_PATTERN = r"(?:Volume|Vol)[\s:#]+(\d+)"
+    DEED_DOCUMENT_PATTERN = r"(?:Document|Doc|Instrument)[\s#:]+(\d+)"
+    RECORDED_DATE_PATTERNS = [
+        r"(?:Recorded|Filed|Date Recorded)[\s:]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})",
+        r"(?:Recorded|Filed|Date Recorded)[\s:]+([A-Za-z]+\s+\d{1,2},\s+\d{4})"
+    ]
+    TAX_YEAR_PATTERN = r"(?:Tax Year|Year)[\s:]+(\d{4})"
+    TAX_AMOUNT_PATTERNS = [
+        r"(?:Tax Amount|Taxes|Annual Tax)[\s:]+\$?([\d,]+\.?\d*)",
+        r"(?:Total Tax|Tax Due)[\s:]+\$?([\d,]+\.?\d*)"
+    ]
+    ASSESSED_VALUE_PATTERN = r"(?:Assessed Value|Assessment)[\s:]+\$?([\d,]+\.?\d*)"
+    LOT_PATTERNS = [
+        r"(?:Lot|Lot Number|Lot No)[\s.:#]+(\d+[A-Z]?)",
+        r"\bLot\s+(\d+[A-Z]?)\b"
+    ]
+    SUBDIVISION_PATTERNS = [
+        r"(?:Subdivision|Addition|Plat)[\s:]+([A-Za-z0-9\s]+?)(?:\n|,|$)",
+        r"([A-Za-z\s]+(?:Subdivision|Addition|Estates|Heights))"
+    ]
+    COUNTY_PATTERNS = [
+        r"(?:County|County of)[\s:]+([A-Za-z\s]+?)(?:\n|,|$)",
+        r"([A-Za-z]+)\s+County"
+    ]
+    STATE_PATTERNS = [
+        r"(?:State|State of)[\s:]+([A-Za-z\s]+?)(?:\n|$)",
+        r"\b([A-Z]{2})\s+\d{5}\b",  # State code from ZIP
+        r",\s+([A-Z]{2})(?:\s|$)"
+    ]
+
+    # (group, patterns, flags) for every first-match search made by extract_all_fields,
+    # in the order the extractors try them. Patterns within a group are alternatives.
+    SCAN_TABLE = [
+        ("owner_name", OWNER_NAME_PATTERNS, _SINGLE_FLAGS),
+        ("property_address", PROPERTY_ADDRESS_PATTERNS, _SINGLE_FLAGS),
+        ("parcel_number", PARCEL_NUMBER_PATTERNS, _SINGLE_FLAGS),
+        ("legal_description", LEGAL_DESCRIPTION_PATTERNS, _MULTILINE_FLAGS),
+        ("deed_book", [DEED_BOOK_PATTERN], re.IGNORECASE),
+        ("deed_page", [DEED_PAGE_PATTERN], re.IGNORECASE),
+        ("deed_volume", [DEED_VOLUME_PATTERN], re.IGNORECASE),
+        ("deed_document", [DEED_DOCUMENT_PATTERN], re.IGNORECASE),
+        ("recorded_date", RECORDED_DATE_PATTERNS, re.IGNORECASE),
+        ("tax_year", [TAX_YEAR_PATTERN], re.IGNORECASE),
+        ("tax_amount", TAX_AMOUNT_PATTERNS, re.IGNORECASE),
+        ("assessed_value", [ASSESSED_VALUE_PATTERN], re.IGNORECASE),
+        ("lot_info", LOT_PATTERNS, _SINGLE_FLAGS),
+        ("subdivision", SUBDIVISION_PATTERNS, _SINGLE_FLAGS),
+        ("county", COUNTY_PATTERNS, _SINGLE_FLAGS),
+        ("state", STATE_PATTERNS, _SINGLE_FLAGS),
+    ]
+
+    # Patterns a "Label: value" line answers without scanning the text:
+    # pattern -> (labels, regex matched at the start of the value)
+    LABEL_LOOKUPS = {
+        OWNER_NAME_PATTERNS[0]: (("owner", "grantee", "grantor"), _NAME_VALUE),
+        OWNER_NAME_PATTERNS[1]: (("name", "owner name"), _NAME_VALUE),
+        PROPERTY_ADDRESS_PATTERNS[0]: (("property address", "address", "property location"), r"(.+)"),
+        PARCEL_NUMBER_PATTERNS[0]: (("parcel", "pin", "apn", "parcel number", "parcel id", "parcel #"), r"([A-Z0-9\-]+)"),
+        PARCEL_NUMBER_PATTERNS[1]: (("tax id", "tax parcel"), r"([A-Z0-9\-]+)"),
+        DEED_BOOK_PATTERN: (("book", "deed book"), r"(\d+)"),
+        DEED_PAGE_PATTERN: (("page", "pg"), r"(\d+)"),
+        DEED_VOLUME_PATTERN: (("volume", "vol"), r"(\d+)"),
+        DEED_DOCUMENT_PATTERN: (("document", "doc", "instrument"), r"(\d+)"),
+        RECORDED_DATE_PATTERNS[0]: (("recorded", "filed", "date recorded"), r"(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})"),
+        RECORDED_DATE_PATTERNS[1]: (("recorded", "filed", "date recorded"), r"([A-Za-z]+\s+\d{1,2},\s+\d{4})"),
+        TAX_YEAR_PATTERN: (("tax year", "year"), r"(\d{4})"),
+        TAX_AMOUNT_PATTERNS[0]: (("tax amount", "taxes", "annual tax"), _AMOUNT_VALUE),
+        TAX_AMOUNT_PATTERNS[1]: (("total tax", "tax due"), _AMOUNT_VALUE),
+        ASSESSED_VALUE_PATTERN: (("assessed value", "assessment"), _AMOUNT_VALUE),
+        LOT_PATTERNS[0]: (("lot", "lot number", "lot no", "lot #"), r"(\d+[A-Z]?)"),
+        SUBDIVISION_PATTERNS[0]: (("subdivision", "addition", "plat"), r"([A-Za-z0-9\s]+?)(?:,|$)"),
+        COUNTY_PATTERNS[0]: (("county", "county of"), r"([A-Za-z\s]+?)(?:,|$)"),
+        STATE_PATTERNS[0]: (("state", "state of"), r"([A-Za-z\s]+?)$"),
+    }
+
+    _pattern_set: Optional[PatternSet] = None
+    _pattern_keys: Dict[int, Tuple[str, int]] = {}
     
-    def __init__(self, text: str):
+    def __init__(self, text: str, budget: Optional[RegexBudget] = None):
         self.text = text
         self.fields = {}
+        self.budget = budget or RegexBudget()
+        # Patterns that exceeded the budget; their fields are reported as not found
+        self.timed_out_patterns: List[str] = []
+        self._matches: Optional[Dict[Tuple[str, int], Any]] = None
+        self._matches_text: Optional[str] = None
+        # "Label: value" lines of the text
+        self.kv: Optional[KeyValueIndex] = None
+        self._kv_text: Optional[str] = None
+
+    @classmethod
+    def _get_pattern_set(cls) -> PatternSet:
+        """Build (once per class) the combined scanner over SCAN_TABLE"""
+        if cls._pattern_set is None:
+            pattern_set = PatternSet()
+            keys: Dict[int, Tuple[str, int]] = {}
+            for group, patterns, flags in cls.SCAN_TABLE:
+                for pattern in patterns:
+                    keys[pattern_set.add(pattern, flags, group=group)] = (pattern, flags)
+            cls._pattern_keys = keys
+            cls._pattern_set = pattern_set
+        return cls._pattern_set
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[str], overlap: int = 4000, window: int = 64_000,
+                   budget: Optional[RegexBudget] = None) -> "FieldExtractor":
+        """
+        Extract all fields from page texts without joining them into one string.
+        Pages are read as if joined with blank lines (as PDFParser does) and
+        scanned in a sliding window (see PatternSet.scan_stream), so memory stays
+        bounded on very long documents while matches across a page break are
+        still found. Labeled lines and additional_fields are read page by page,
+        keeping only the first labeled line that answers each LABEL_LOOKUPS
+        pattern. Results are in .fields; .text stays empty.
+        """
+        extractor = cls("", budget)
+        additional: Dict[str, str] = {}
+        answers: Dict[int, Tuple[int, ScanMatch]] = {}
+
+        def chunks():
+            start = 0
+            for i, page in enumerate(pages):
+                if i:
+                    start += 2  # the "\n\n" before this page
+                extractor._answer_from_labels(KeyValueIndex([page], start=start), answers)
+                additional.update(extractor.extract_additional_fields(page))
+                start += len(page)
+                yield page if i == 0 else "\n\n" + page
+
+        found, timed_out = cls._get_pattern_set().scan_stream(chunks(), overlap, window, extractor.budget)
+        for idx, (offset, m) in answers.items():
+            # As in PatternSet.scan: a labeled line wins when it is at or before the scan's match
+            if idx in found and (found[idx] is None or offset <= found[idx].start()):
+                found[idx] = m
+        extractor._store_matches(found, timed_out)
+        extractor.fields = extractor._collect_fields(additional)
+        return extractor
+
+    def _kv_index(self) -> KeyValueIndex:
+        """The "Label: value" index of the current text, built on first use"""
+        if self.kv is None or self._kv_text is not self.text:
+            self.kv = KeyValueIndex([self.text])
+            self._kv_text = self.text
+        return self.kv
+
+    def _answer_from_labels(self, kv: Optional[KeyValueIndex] = None,
+                            answers: Optional[Dict[int, Tuple[int, ScanMatch]]] = None) -> Dict[int, Tuple[int, ScanMatch]]:
+        """
+        Answers to LABEL_LOOKUPS patterns from labeled lines: {scan index: (line offset, match)}.
+        `kv` defaults to the whole text's index; patterns already in `answers` are kept.
+        """
+        kv = self._kv_index() if kv is None else kv
+        self._get_pattern_set()
+        answers = {} if answers is None else answers
+        for idx, (pattern, flags) in self._pattern_keys.items():
+            if pattern not in self.LABEL_LOOKUPS or idx in answers:
+                continue
+            labels, value_pattern = self.LABEL_LOOKUPS[pattern]
+            hit = kv.lookup_line(labels, value_pattern, flags)
+            if hit:
+                answers[idx] = (hit[0].start, hit[1])
+        return answers
+
+    def _scan(self) -> None:
+        """Find every SCAN_TABLE pattern's first match in one pass over the text"""
+        # A labeled line stands in for the scan's first match when nothing matches before it,
+        # so those patterns are not searched past their line
+        self._store_matches(*self._get_pattern_set().scan(self.text, self.budget, answers=self._answer_from_labels()))
+
+    def _store_matches(self, found: Dict[int, Any], timed_out: List[int]) -> None:
+        self._matches = {self._pattern_keys[idx]: m for idx, m in found.items()}
+        for idx in timed_out:
+            # Cached as "no match" so _search doesn't retry the slow pattern
+            self._matches[self._pattern_keys[idx]] = None
+            self.timed_out_patterns.append(self._pattern_keys[idx][0])
+        self._matches_text = self.text
+
+    def _search(self, pattern: str, flags: int):
+        """
+        re.search under the budget, answered from the single-pass scan
+        (or the labeled line standing in for it) when one is available
+        """
+        if self._matches is not None and self._matches_text is self.text:
+            key = (pattern, flags)
+            if key in self._matches:
+                return self._matches[key]
+        try:
+            return bounded_search(pattern, self.text, flags, self.budget)
+        except RegexTimeout:
+            self.timed_out_patterns.append(pattern)
+            return None
         
     def extract_all_fields(self) -> Dict[str, Any]:
         """Extract all recognized fields from the document"""
-        self.fields = {
+        self.timed_out_patterns = []
+        self._scan()
+        self.fields = self._collect_fields(self.extract_additional_fields())
+        return self.fields
+
+    def _collect_fields(self, additional: Dict[str, str]) -> Dict[str, Any]:
+        return {
             "owner_name": self.extract_owner_name(),
             "property_address": self.extract_property_address(),
             "parcel_number": self.extract_parcel_number(),
@@ -26,45 +256,24 @@ class FieldExtractor:
             "subdivision": self.extract_subdivision(),
             "county": self.extract_county(),
             "state": self.extract_state(),
-            "additional_fields": self.extract_additional_fields()
+            "additional_fields": additional
         }
-        return self.fields
     
     def extract_owner_name(self) -> Optional[str]:
         """Extract owner/grantor/grantee name"""
-        patterns = [
-            r"(?:Owner|Grantee|Grantor)[\s:]+([A-Z][a-z]+(?:\s[A-Z][a-z]+)+)",
-            r"(?:Name|Owner Name)[\s:]+([A-Z][a-z]+(?:\s[A-Z][a-z]+)+)",
-            r"^([A-Z][a-z]+\s+[A-Z][a-z]+)$"  # Simple name pattern
-        ]
-        return self._extract_with_patterns(patterns)
+        return self._extract_with_patterns(self.OWNER_NAME_PATTERNS)
     
     def extract_property_address(self) -> Optional[str]:
         """Extract property address"""
-        patterns = [
-            r"(?:Property Address|Address|Property Location)[\s:]+(.+?)(?:\n|$)",
-            r"(?:Located at|Premises at)[\s:]+(.+?)(?:\n|$)",
-            r"\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Lane|Ln|Boulevard|Blvd)[,\s]+[A-Z][a-z]+[,\s]+[A-Z]{2}\s+\d{5}"
-        ]
-        return self._extract_with_patterns(patterns)
+        return self._extract_with_patterns(self.PROPERTY_ADDRESS_PATTERNS)
     
     def extract_parcel_number(self) -> Optional[str]:
         """Extract parcel/PIN/APN number"""
-        patterns = [
-            r"(?:Parcel|PIN|APN|Parcel Number|Parcel ID)[\s:#]+([A-Z0-9\-]+)",
-            r"(?:Tax ID|Tax Parcel)[\s:#]+([A-Z0-9\-]+)",
-            r"\b\d{2,3}-\d{2,3}-\d{2,4}-\d{2,4}\b"  # Common parcel format
-        ]
-        return self._extract_with_patterns(patterns)
+        return self._extract_with_patterns(self.PARCEL_NUMBER_PATTERNS)
     
     def extract_legal_description(self) -> Optional[str]:
         """Extract legal description of property"""
-        patterns = [
-            r"(?:Legal Description|Legal)[\s:]+(.+?)(?=\n\n|\n[A-Z][a-z]+:)",
-            r"(?:Description|Described as follows)[\s:]+(.+?)(?=\n\n|\n[A-Z][a-z]+:)",
-            r"Lot\s+\d+.*?Block\s+\d+.*?(?:Subdivision|Addition).*?(?=\n\n|\n[A-Z])"
-        ]
-        result = self._extract_with_patterns(patterns, multiline=True)
+        result = self._extract_with_patterns(self.LEGAL_DESCRIPTION_PATTERNS, multiline=True)
         if result:
             # Clean up the legal description
             result = re.sub(r'\s+', ' ', result).strip()
@@ -81,37 +290,37 @@ class FieldExtractor:
         }
         
         # Book and Page
-        book_match = re.search(r"(?:Book|Deed Book)[\s:#]+(\d+)", self.text, re.IGNORECASE)
+        book_match = self._search(self.DEED_BOOK_PATTERN, re.IGNORECASE)
         if book_match:
             deed_info["book"] = book_match.group(1)
         
-        page_match = re.search(r"(?:Page|Pg)[\s:#]+(\d+)", self.text, re.IGNORECASE)
+        page_match = self._search(self.DEED_PAGE_PATTERN, re.IGNORECASE)
         if page_match:
             deed_info["page"] = page_match.group(1)
         
         # Volume
-        volume_match = re.search(r"(?:Volume|Vol)[\s:#]+(\d+)", self.text, re.IGNORECASE)
+        volume_match = self._search(self.DEED_VOLUME_PATTERN, re.IGNORECASE)
         if volume_match:
             deed_info["volume"] = volume_match.group(1)
         
         # Document Number
-        doc_match = re.search(r"(?:Document|Doc|Instrument)[\s#:]+(\d+)", self.text, re.IGNORECASE)
+        doc_match = self._search(self.DEED_DOCUMENT_PATTERN, re.IGNORECASE)
         if doc_match:
             deed_info["document_number"] = doc_match.group(1)
         
         # Recorded Date
-        date_patterns = [
-            r"(?:Recorded|Filed|Date Recorded)[\s:]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})",
-            r"(?:Recorded|Filed|Date Recorded)[\s:]+([A-Za-z]+\s+\d{1,2},\s+\d{4})"
-        ]
-        for pattern in date_patterns:
-            date_match = re.search(pattern, self.text, re.IGNORECASE)
+        for pattern in self.RECORDED_DATE_PATTERNS:
+            date_match = self._search(pattern, re.IGNORECASE)
             if date_match:
                 deed_info["recorded_date"] = date_match.group(1)
                 break
         
         return deed_info
     
+    def extract_recorded_instruments(self) -> List[Dict[str, Any]]:
+        """Every recorded instrument referenced in the text, deduplicated and sorted by recording date"""
+        return [asdict(inst) for inst in scan_instruments(self.text, self.budget)]
+    
     def extract_tax_info(self) -> Dict[str, Optional[str]]:
         """Extract tax-related information"""
         tax_info = {
@@ -122,23 +331,19 @@ class FieldExtractor:
         }
         
         # Tax year
-        year_match = re.search(r"(?:Tax Year|Year)[\s:]+(\d{4})", self.text, re.IGNORECASE)
+        year_match = self._search(self.TAX_YEAR_PATTERN, re.IGNORECASE)
         if year_match:
             tax_info["tax_year"] = year_match.group(1)
         
         # Tax amount
-        amount_patterns = [
-            r"(?:Tax Amount|Taxes|Annual Tax)[\s:]+\$?([\d,]+\.?\d*)",
-            r"(?:Total Tax|Tax Due)[\s:]+\$?([\d,]+\.?\d*)"
-        ]
-        for pattern in amount_patterns:
-            amount_match = re.search(pattern, self.text, re.IGNORECASE)
+        for pattern in self.TAX_AMOUNT_PATTERNS:
+            amount_match = self._search(pattern, re.IGNORECASE)
             if amount_match:
                 tax_info["tax_amount"] = amount_match.group(1)
                 break
         
         # Assessed value
-        value_match = re.search(r"(?:Assessed Value|Assessment)[\s:]+\$?([\d,]+\.?\d*)", self.text, re.IGNORECASE)
+        value_match = self._search(self.ASSESSED_VALUE_PATTERN, re.IGNORECASE)
         if value_match:
             tax_info["assessed_value"] = value_match.group(1)
         
@@ -146,44 +351,26 @@ class FieldExtractor:
     
     def extract_lot_info(self) -> Optional[str]:
         """Extract lot number"""
-        patterns = [
-            r"(?:Lot|Lot Number|Lot No)[\s.:#]+(\d+[A-Z]?)",
-            r"\bLot\s+(\d+[A-Z]?)\b"
-        ]
-        return self._extract_with_patterns(patterns)
+        return self._extract_with_patterns(self.LOT_PATTERNS)
     
     def extract_subdivision(self) -> Optional[str]:
         """Extract subdivision name"""
-        patterns = [
-            r"(?:Subdivision|Addition|Plat)[\s:]+([A-Za-z0-9\s]+?)(?:\n|,|$)",
-            r"([A-Za-z\s]+(?:Subdivision|Addition|Estates|Heights))"
-        ]
-        return self._extract_with_patterns(patterns)
+        return self._extract_with_patterns(self.SUBDIVISION_PATTERNS)
     
     def extract_county(self) -> Optional[str]:
         """Extract county name"""
-        patterns = [
-            r"(?:County|County of)[\s:]+([A-Za-z\s]+?)(?:\n|,|$)",
-            r"([A-Za-z]+)\s+County"
-        ]
-        return self._extract_with_patterns(patterns)
+        return self._extract_with_patterns(self.COUNTY_PATTERNS)
     
     def extract_state(self) -> Optional[str]:
         """Extract state"""
-        patterns = [
-            r"(?:State|State of)[\s:]+([A-Za-z\s]+?)(?:\n|$)",
-            r"\b([A-Z]{2})\s+\d{5}\b",  # State code from ZIP
-            r",\s+([A-Z]{2})(?:\s|$)"
-        ]
-        return self._extract_with_patterns(patterns)
+        return self._extract_with_patterns(self.STATE_PATTERNS)
     
-    def extract_additional_fields(self) -> Dict[str, str]:
+    def extract_additional_fields(self, text: Optional[str] = None) -> Dict[str, str]:
         """Extract any additional labeled fields not covered above"""
         additional = {}
         
         # Generic key-value pattern
-        pattern = r"^([A-Z][A-Za-z\s]+?):\s*(.+?)$"
-        matches = re.finditer(pattern, self.text, re.MULTILINE)
+        matches = _ADDITIONAL_LINE.finditer(self.text if text is None else text)
         
         for match in matches:
             key = match.group(1).strip()
@@ -199,10 +386,10 @@ class FieldExtractor:
     
     def _extract_with_patterns(self, patterns: List[str], multiline: bool = False) -> Optional[str]:
         """Helper method to try multiple regex patterns"""
-        flags = re.IGNORECASE | re.MULTILINE if multiline else re.IGNORECASE | re.DOTALL
+        flags = _MULTILINE_FLAGS if multiline else _SINGLE_FLAGS
         
         for pattern in patterns:
-            match = re.search(pattern, self.text, flags)
+            match = self._search(pattern, flags)
             if match:
                 # Return the first capturing group or the whole match
                 return match.group(1).strip() if match.groups() else match.group(0).strip()
@@ -0,0 +1,184 @@
+from __future__ import annotations
+import re
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pattern_scan import PatternSet, RegexBudget
+
+# Where a reference is filed: the conveyance records or an encumbrance (mortgage) book
+CONVEYANCE = "conveyance"
+ENCUMBRANCE = "encumbrance"
+
+# Clerk stamp offices (COB: conveyance book, MOB: mortgage book)
+_OFFICES = {"COB": CONVEYANCE, "MOB": ENCUMBRANCE}
+# Document types recorded in the encumbrance records
+_ENCUMBRANCE_TYPES = ("MORTGAGE", "LIEN", "JUDGMENT", "JUDGEMENT", "UCC", "FINANCING STATEMENT", "PRIVILEGE")
+# Document types recorded as conveyances
+_CONVEYANCE_TYPES = ("SALE", "DEED", "DONATION", "EXCHANGE", "QUITCLAIM", "SUCCESSION", "PARTITION", "LAND & IMP", "IMMOBILIZATION")
+
+_DATE = r"\d{1,2}/\d{1,2}/\d{2,4}"
+_DOC_TYPE = r"[A-Za-z][A-Za-z .&'/-]{2,60}?"
+
+# (name, pattern, flags) scanned together in one pass, most specific first
+_PATTERNS: Tuple[Tuple[str, str, int], ...] = (
+    # Clerk stamp on every recorded page: "COB: 1224481; Page: 1; Filed: 12/23/2021 12:33:34PM"
+    ("stamp", rf"\b(?P<office>COB|MOB)\s*:\s*(?P<instrument>\d+)\s*;\s*Page\s*:\s*(?P<sheet>\d+)\s*;\s*Filed\s*:\s*(?P<date>{_DATE})", 0),
+    # Assessor sales row: type, register number, date, book/page ("Cash Sale / 893879 / 3/19/2018 / N70/835")
+    ("sale_row", rf"^(?P<type>{_DOC_TYPE})[ \t]*\n(?P<instrument>\d{{4,}})\n(?P<date>{_DATE})\n(?P<book>[A-Z]{{0,2}}\d+)/(?P<page>\d+)$", re.MULTILINE),
+    # Assessor deeds row: number, type, date ("1224481 / CASH SALE / 12/23/2021")
+    ("deed_row", rf"^(?P<instrument>\d{{5,}})\n(?P<type>{_DOC_TYPE})[ \t]*\n(?P<date>{_DATE})$", re.MULTILINE),
+    # Assessor transfers row: date, type, price, grantee, number ("5/1/2020 / Land & Imp / $157,000 / ... / 2020003004")
+    ("transfer_row", rf"^(?P<date>{_DATE})\n(?P<type>{_DOC_TYPE})[ \t]*\n\$[\d,]+(?:\.\d\d)?\n[^\n]+\n(?P<instrument>\d{{5,}})$", re.MULTILINE),
+    # Legal description acquisition: "98 #647061 T55-450" (instrument, book-page)
+    ("acquisition", r"#(?P<instrument>\d{3,})\s+(?P<book>[A-Z]{1,2}\d+)-(?P<page>\d+)\b", 0),
+    # Labeled book and page, optionally with the recording date
+    ("book_page", rf"\b(?:(?P<record>Conveyance|Mortgage|Deed)\s+)?Book[\s:#]+(?P<book>[A-Z]{{0,2}}\d+)[,;\s]+(?:Page|Pg)[\s:#]+(?P<page>\d+)(?:[,;\s]+(?:Recorded|Filed)(?:\s+on)?[\s:]+(?P<date>{_DATE}))?", re.IGNORECASE),
+    # Labeled instrument number, optionally with the recording date. "Entry" needs a
+    # number marker, else "Entry 2020" would read a year as an instrument number
+    ("instrument", rf"\b(?:(?:Instrument|Instr\.)\s*(?:No\.?|Number|#)?|Entry\s*(?:No\.?|Number|#))[\s:#]*(?P<instrument>\d{{4,}})(?:[,;\s]+(?:Recorded|Filed)(?:\s+on)?[\s:]+(?P<date>{_DATE}))?", re.IGNORECASE),
+    # Certified copy footer: "Page 2 of 3" over the instrument number
+    ("copy_footer", r"^Page\s+(?P<sheet>\d+)\s+of\s+\d+\n(?P<instrument>\d{4,})$", re.MULTILINE),
+)
+
+
+@dataclass
+class RecordedInstrument:
+    """One recorded instrument referenced in a document package.
+
+    `kind` is CONVEYANCE, ENCUMBRANCE or "" when nothing says which records
+    it belongs to. `pages` counts the instrument's pages seen in the package
+    (from clerk stamps and copy footers).
+    """
+    kind: str = ""
+    instrument: str = ""  # instrument, entry or register number
+    book: str = ""
+    page: str = ""
+    recorded: str = ""  # as written, M/D/YYYY
+    doc_type: str = ""
+    pages: int = 0
+
+    @property
+    def key(self) -> Tuple[str, ...]:
+        """What identifies the instrument: its number, else its book and page."""
+        if self.instrument:
+            return ("#", self.instrument.lstrip("0"))
+        return ("book", self.book.upper(), self.page.lstrip("0"))
+
+    def describe(self) -> str:
+        """One line for the cover page, e.g. "Cash Sale, Instr. #893879, Book N70 Page 835, recorded 3/19/2018"."""
+        parts = [self.doc_type]
+        if self.instrument:
+            parts.append(f"Instr. #{self.instrument}")
+        if self.book or self.page:
+            parts.append(" ".join(filter(None, [self.book and f"Book {self.book}", self.page and f"Page {self.page}"])))
+        if self.recorded:
+            parts.append(f"recorded {self.recorded}")
+        return ", ".join(p for p in parts if p)
+
+
+def _kind_of(doc_type: str) -> str:
+    upper = doc_type.upper()
+    if any(t in upper for t in _ENCUMBRANCE_TYPES):
+        return ENCUMBRANCE
+    if any(t in upper for t in _CONVEYANCE_TYPES):
+        return CONVEYANCE
+    return ""
+
+
+def _from_match(name: str, groups: Dict[str, Optional[str]]) -> RecordedInstrument:
+    g = {k: (v or "").strip() for k, v in groups.items()}
+    doc_type = " ".join(g.get("type", "").split())
+    if name == "stamp":
+        kind = _OFFICES[g["office"].upper()]
+    elif g.get("record"):
+        kind = ENCUMBRANCE if g["record"].lower() == "mortgage" else CONVEYANCE
+    else:
+        kind = _kind_of(doc_type)
+    return RecordedInstrument(
+        kind=kind,
+        instrument=g.get("instrument", ""),
+        book=g.get("book", ""),
+        page=g.get("page", ""),
+        recorded=g.get("date", ""),
+        doc_type=doc_type,
+        pages=int(g["sheet"]) if g.get("sheet") else 0,
+    )
+
+
+def _merge(a: RecordedInstrument, b: RecordedInstrument) -> RecordedInstrument:
+    """a, with what it is missing taken from b (another reference to the same instrument)."""
+    return replace(
+        a,
+        kind=a.kind or b.kind,
+        instrument=a.instrument or b.instrument,
+        book=a.book or b.book,
+        page=a.page or b.page,
+        recorded=a.recorded or b.recorded,
+        doc_type=a.doc_type or b.doc_type,
+        pages=max(a.pages, b.pages),
+    )
+
+
+def _date_key(value: str) -> Optional[datetime]:
+    for fmt in ("%m/%d/%Y", "%m/%d/%y"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _sort_key(inst: RecordedInstrument):
+    when = _date_key(inst.recorded)
+    number = int(inst.instrument) if inst.instrument.isdigit() else 0
+    return (when is None, when or datetime.min, number, inst.book, inst.page)
+
+
+def merge_instruments(groups: Iterable[Iterable[RecordedInstrument]]) -> List[RecordedInstrument]:
+    """Deduplicate references (by RecordedInstrument.key) and sort them by recording date, then number.
+
+    Undated instruments come last.
+    """
+    merged: Dict[Tuple[str, ...], RecordedInstrument] = {}
+    for group in groups:
+        for inst in group:
+            seen = merged.get(inst.key)
+            merged[inst.key] = inst if seen is None else _merge(seen, inst)
+    return sorted(merged.values(), key=_sort_key)
+
+
+_PATTERN_SET: Optional[PatternSet] = None
+
+
+def _pattern_set() -> PatternSet:
+    global _PATTERN_SET
+    if _PATTERN_SET is None:
+        ps = PatternSet()
+        for _, pattern, flags in _PATTERNS:
+            ps.add(pattern, flags)
+        _PATTERN_SET = ps
+    return _PATTERN_SET
+
+
+def scan_instruments(text: str, budget: Optional[RegexBudget] = None) -> List[RecordedInstrument]:
+    """Every recorded-instrument reference in `text`, deduplicated and sorted.
+
+    All reference formats are matched in a single pass over the text (see
+    _PATTERNS); references to the same instrument are merged, the earlier
+    pattern's details winning (a clerk stamp's filing date over a sale date).
+    """
+    found = sorted(_pattern_set().finditer(text or "", budget), key=lambda hit: hit[0])
+    return merge_instruments([[_from_match(_PATTERNS[idx][0], m.groupdict()) for idx, m in found]])
+
+
+def instrument_fields(instruments: Iterable[RecordedInstrument]) -> Dict[str, str]:
+    """Text for the conveyance_documents and encumbrances fields, one instrument per line.
+
+    Instruments of unknown kind are listed with the conveyances.
+    """
+    lines: Dict[str, List[str]] = {"conveyance_documents": [], "encumbrances": []}
+    for inst in instruments:
+        field = "encumbrances" if inst.kind == ENCUMBRANCE else "conveyance_documents"
+        lines[field].append(inst.describe())
+    return {k: "\n".join(v) for k, v in lines.items()}
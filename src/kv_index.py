@@ -0,0 +1,98 @@
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from anchor_index import normalize_phrase
+from pattern_scan import ScanMatch, compile_pattern
+
+# "Label: value" on one line. Labels hold no digits, so times like 10:30 aren't split.
+_LABELED_LINE = re.compile(r"^[ \t]*([A-Za-z][A-Za-z #&'()./-]{0,60}?)[ \t]*:[ \t]*(.*?)[ \t\r]*$", re.MULTILINE)
+
+
+def normalize_label(label: str) -> str:
+    """Key a label is indexed and looked up under (see normalize_phrase)."""
+    return normalize_phrase(label)
+
+
+@dataclass
+class LabeledLine:
+    label: str  # as written
+    key: str  # normalize_label(label)
+    value: str  # may be empty when the value is on the next line
+    start: int  # offset of the label in the document text
+    value_start: int
+    end: int
+    page: int
+    text: str  # the line from the label to the end of the value, as written
+
+
+class KeyValueIndex:
+    """Every "Label: value" line of a document, found in one pass and keyed by normalized label.
+
+    Offsets are into the pages joined with `sep`, i.e. the text PDFParser builds,
+    where the first page starts at `start`. Pages can be added one at a time, so
+    the index can be filled while streaming.
+    """
+
+    def __init__(self, pages: Iterable[str] = (), sep: str = "\n\n", start: int = 0):
+        self.sep = sep
+        self.entries: List[LabeledLine] = []
+        self._by_key: Dict[str, List[LabeledLine]] = {}
+        self._length = start
+        self._pages = 0
+        for page in pages:
+            self.add_page(page)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[LabeledLine]:
+        return iter(self.entries)
+
+    def add_page(self, text: str) -> None:
+        offset = self._length + (len(self.sep) if self._pages else 0)
+        for m in _LABELED_LINE.finditer(text):
+            line = LabeledLine(
+                m.group(1), normalize_label(m.group(1)), m.group(2),
+                offset + m.start(1), offset + m.start(2), offset + m.end(2), self._pages,
+                text[m.start(1):m.end(2)],
+            )
+            self.entries.append(line)
+            self._by_key.setdefault(line.key, []).append(line)
+        self._length = offset + len(text)
+        self._pages += 1
+
+    def get(self, label: str) -> List[LabeledLine]:
+        """Lines labeled `label` (compared normalized), in document order."""
+        return self._by_key.get(normalize_label(label), [])
+
+    def find(self, labels: Iterable[str]) -> List[LabeledLine]:
+        """Lines labeled with any of `labels`, in document order."""
+        lines = [line for label in labels for line in self.get(label)]
+        return sorted(lines, key=lambda line: line.start)
+
+    def lookup(self, labels: Iterable[str], value_pattern: str, flags: int = 0) -> Optional[ScanMatch]:
+        """First value under one of `labels` that `value_pattern` matches at its start.
+
+        The match's offsets are into the document text.
+        """
+        hit = self.lookup_line(labels, value_pattern, flags)
+        return hit and hit[1]
+
+    def lookup_line(self, labels: Iterable[str], value_pattern: str,
+                    flags: int = 0) -> Optional[Tuple[LabeledLine, ScanMatch]]:
+        """Like lookup, also returning the line the value is on."""
+        for line in self.find(labels):
+            m = compile_pattern(value_pattern, flags).match(line.value)
+            if m:
+                return line, ScanMatch(m, 0, m.re.groups, dict(m.re.groupindex), line.value_start)
+        return None
+
+    def search_lines(self, labels: Iterable[str], pattern: str, flags: int = 0) -> Optional[ScanMatch]:
+        """First match of `pattern` within a whole line under one of `labels`."""
+        for line in self.find(labels):
+            m = compile_pattern(pattern, flags).search(line.text)
+            if m:
+                return ScanMatch(m, 0, m.re.groups, dict(m.re.groupindex), line.start)
+        return None
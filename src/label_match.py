@@ -0,0 +1,102 @@
+from __future__ import annotations
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from rapidfuzz import fuzz, process
+except Exception:
+    fuzz = process = None
+
+# Scorers by name: rapidfuzz's, or the NumPy versions below when it isn't installed
+SCORERS = ("ratio", "token_set_ratio")
+
+
+def _lcs_lengths(query: str, choices: Sequence[str]) -> np.ndarray:
+    """Longest common subsequence of `query` with each choice, all choices at once.
+
+    The usual dynamic program, with each row computed for every choice in one
+    array step per column.
+    """
+    width = max((len(c) for c in choices), default=0)
+    codes = np.full((len(choices), width), -1, dtype=np.int64)
+    for i, c in enumerate(choices):
+        codes[i, :len(c)] = [ord(ch) for ch in c]
+    prev = np.zeros((len(choices), width + 1), dtype=np.int32)
+    for ch in query:
+        row = np.zeros_like(prev)
+        same = codes == ord(ch)
+        for j in range(1, width + 1):
+            row[:, j] = np.where(same[:, j - 1], prev[:, j - 1] + 1, np.maximum(prev[:, j], row[:, j - 1]))
+        prev = row
+    return prev[:, -1] if width else np.zeros(len(choices), dtype=np.int32)
+
+
+def _ratio_matrix(queries: Sequence[str], choices: Sequence[str]) -> np.ndarray:
+    """Indel similarity 2 * LCS / (len(a) + len(b)), the measure fuzz.ratio uses.
+
+    Two empty strings are identical, so they score 1 (as in fuzz.ratio).
+    """
+    lengths = np.array([len(c) for c in choices], dtype=np.float32)
+    out = np.zeros((len(queries), len(choices)), dtype=np.float32)
+    for i, q in enumerate(queries):
+        total = lengths + len(q)
+        out[i] = np.divide(2 * _lcs_lengths(q, choices), total, out=np.ones_like(total), where=total > 0)
+    return out
+
+
+def _token_set_ratio(a: str, b: str) -> float:
+    """fuzz.token_set_ratio without rapidfuzz: compare the shared words with each side's rest."""
+    ta, tb = set(a.split()), set(b.split())
+    if not ta or not tb:
+        return 0.0
+    shared = " ".join(sorted(ta & tb))
+    if shared and (ta <= tb or tb <= ta):
+        return 1.0
+    rest_a = " ".join(filter(None, [shared, " ".join(sorted(ta - tb))]))
+    rest_b = " ".join(filter(None, [shared, " ".join(sorted(tb - ta))]))
+    texts = [rest_a, rest_b] + ([shared] if shared else [])
+    m = _ratio_matrix(texts, texts)
+    return float(max(m[0, 1], m[-1, 0], m[-1, 1])) if shared else float(m[0, 1])
+
+
+def similarity_matrix(queries: Sequence[str], choices: Sequence[str], scorer: str = "ratio") -> np.ndarray:
+    """(len(queries), len(choices)) similarities in 0..1, computed in one batch.
+
+    Uses rapidfuzz.process.cdist when rapidfuzz is installed, else the same
+    measures in NumPy (as rapidfuzz, strings are compared as given).
+    """
+    if scorer not in SCORERS:
+        raise ValueError(f"Unknown scorer {scorer!r}; use one of {SCORERS}")
+    if not len(queries) or not len(choices):
+        return np.zeros((len(queries), len(choices)), dtype=np.float32)
+    if process is not None:
+        m = process.cdist(list(queries), list(choices), scorer=getattr(fuzz, scorer), dtype=np.float32)
+        return m / 100.0
+    if scorer == "ratio":
+        return _ratio_matrix(queries, choices)
+    return np.array([[_token_set_ratio(q, c) for c in choices] for q in queries], dtype=np.float32)
+
+
+def best_label_matches(labels: Dict[str, List[str]]) -> Dict[str, Tuple[str, float]]:
+    """For each key, its closest synonym and score (token_set_ratio, 0..1).
+
+    One matrix covers every key against every synonym of every key; each key
+    then reads its own synonyms' columns. A key without synonyms maps to
+    itself with score 0.
+    """
+    keys = list(labels)
+    synonyms = [s for k in keys for s in labels[k]]
+    scores = similarity_matrix(keys, synonyms, "token_set_ratio")
+    out: Dict[str, Tuple[str, float]] = {}
+    col = 0
+    for i, k in enumerate(keys):
+        own = labels[k]
+        if not own:
+            out[k] = (k, 0.0)
+            continue
+        row = scores[i, col:col + len(own)]
+        j = int(np.argmax(row))
+        out[k] = (own[j], float(row[j]))
+        col += len(own)
+    return out
@@ -0,0 +1,158 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from statistics import median
+from typing import Any, Dict, List, Optional, Tuple
+
+Box = Tuple[float, float, float, float]
+
+# Thresholds in multiples of the page's median word height
+COLUMN_GAP = 1.5  # vertical whitespace this wide, running the region's full height, separates columns
+BLOCK_GAP = 0.8  # horizontal whitespace this tall separates blocks
+MIN_COLUMN_WIDTH = 0.3  # fraction of the region each column must span; narrower splits are form label/value gaps
+
+
+def _top_down(w: Dict[str, Any]) -> Box:
+    """Word box with y growing down the page (OCR words are bottom-origin)."""
+    x0, y0, x1, y1 = w.get("bbox", (0, 0, 0, 0))
+    if w.get("origin") == "bottom":
+        return x0, -y1, x1, -y0
+    return x0, y0, x1, y1
+
+
+def _union(boxes: List[Box]) -> Box:
+    return (
+        min(b[0] for b in boxes), min(b[1] for b in boxes),
+        max(b[2] for b in boxes), max(b[3] for b in boxes),
+    )
+
+
+@dataclass
+class TextLine:
+    words: List[int]  # indexes into the word list, left to right
+    bbox: Box  # in the words' own coordinates
+    text: str
+
+
+@dataclass
+class TextBlock:
+    lines: List[TextLine]
+    bbox: Box
+
+    @property
+    def text(self) -> str:
+        return "\n".join(line.text for line in self.lines)
+
+
+@dataclass
+class PageLayout:
+    doc: Any
+    page: int
+    blocks: List[TextBlock] = field(default_factory=list)
+
+    @property
+    def lines(self) -> List[TextLine]:
+        return [line for block in self.blocks for line in block.lines]
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(block.text for block in self.blocks)
+
+
+# An item is (x0, y0, x1, y1, word index) in top-down coordinates
+Item = Tuple[float, float, float, float, int]
+
+
+def _split(items: List[Item], lo: int, hi: int, min_gap: float) -> List[List[Item]]:
+    """Split items at every gap of at least min_gap in their projection on axis (lo, hi)."""
+    ordered = sorted(items, key=lambda it: it[lo])
+    parts: List[List[Item]] = [[ordered[0]]]
+    reach = ordered[0][hi]
+    for it in ordered[1:]:
+        if it[lo] - reach >= min_gap:
+            parts.append([])
+        parts[-1].append(it)
+        reach = max(reach, it[hi])
+    return parts
+
+
+def _columns(items: List[Item], height: float) -> List[List[Item]]:
+    parts = _split(items, 0, 2, COLUMN_GAP * height)
+    if len(parts) < 2:
+        return parts
+    width = max(it[2] for it in items) - min(it[0] for it in items)
+    if all(max(it[2] for it in p) - min(it[0] for it in p) >= MIN_COLUMN_WIDTH * width for p in parts):
+        return parts
+    return [items]
+
+
+def _lines(items: List[Item]) -> List[List[Item]]:
+    """Group a block's items into lines: by vertical centre, then left to right."""
+    lines: List[List[Item]] = []
+    centre = line_h = 0.0
+    for it in sorted(items, key=lambda it: (it[1] + it[3]) / 2):
+        c, h = (it[1] + it[3]) / 2, it[3] - it[1]
+        if lines and abs(c - centre) <= max(h, line_h) / 2:
+            lines[-1].append(it)
+        else:
+            lines.append([it])
+            centre, line_h = c, h
+    return [sorted(line, key=lambda it: it[0]) for line in lines]
+
+
+def _xy_cut(items: List[Item], height: float, out: List[List[List[Item]]]) -> None:
+    """Recursive XY-cut: full-width blocks top to bottom, then columns left to right, then lines.
+
+    Horizontal cuts go first so a heading or recorder's stamp above or below
+    the columns isn't read as part of the first column; columns are then only
+    interleaved where both have a blank band at the same height.
+    """
+    bands = _split(items, 1, 3, BLOCK_GAP * height)
+    if len(bands) > 1:
+        for band in bands:
+            _xy_cut(band, height, out)
+        return
+    columns = _columns(items, height)
+    if len(columns) > 1:
+        for column in columns:
+            _xy_cut(column, height, out)
+        return
+    out.append(_lines(items))
+
+
+def analyze_layout(words: List[Dict[str, Any]]) -> List[PageLayout]:
+    """Lines and blocks of every page, in reading order.
+
+    Each (doc, page) is cut along whitespace with XY-cut: every cut sorts its
+    region once, and all gaps are cut at once, so the cost stays near
+    O(n log n). Columns of a multi-column page are read one after the other
+    rather than interleaved line by line. Pages come in the order they first
+    appear in `words`.
+    """
+    pages: Dict[Tuple[Any, int], List[Item]] = {}
+    for i, w in enumerate(words):
+        if not str(w.get("text", "")).strip():
+            continue
+        pages.setdefault((w.get("doc"), w.get("page", 0)), []).append((*_top_down(w), i))
+    layouts: List[PageLayout] = []
+    for (doc, page), items in pages.items():
+        height = median(max(it[3] - it[1], 0.0) for it in items) or 1.0
+        groups: List[List[List[Item]]] = []
+        _xy_cut(items, height, groups)
+        layout = PageLayout(doc, page)
+        for group in groups:
+            lines = []
+            for line in group:
+                ids = [it[4] for it in line]
+                lines.append(TextLine(
+                    ids,
+                    _union([words[i].get("bbox", (0, 0, 0, 0)) for i in ids]),
+                    " ".join(str(words[i].get("text", "")) for i in ids),
+                ))
+            layout.blocks.append(TextBlock(lines, _union([line.bbox for line in lines])))
+        layouts.append(layout)
+    return layouts
+
+
+def reading_order(words: List[Dict[str, Any]], layouts: Optional[List[PageLayout]] = None) -> List[int]:
+    """Indexes of `words` in reading order (words with no text are dropped)."""
+    return [i for page in (layouts or analyze_layout(words)) for line in page.lines for i in line.words]
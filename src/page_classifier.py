@@ -0,0 +1,116 @@
+from __future__ import annotations
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+
+from anchor_index import AhoCorasick
+
+# Page type -> (title phrases, one of which is enough; terms, two of which are needed)
+PAGE_TYPE_KEYWORDS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "deed": (
+        ("warranty deed", "quitclaim deed", "act of sale", "cash sale", "act of donation"),
+        ("grantor", "grantee", "vendor", "vendee", "convey", "conveys", "sell", "transfer", "deliver"),
+    ),
+    "mortgage": (
+        ("mortgage", "deed of trust", "promissory note"),
+        ("mortgagor", "mortgagee", "lender", "borrower", "principal", "interest", "maturity"),
+    ),
+    "tax": (
+        ("tax certificate", "tax sale", "tax notice", "tax research"),
+        ("tax year", "assessed value", "assessment", "millage", "parcel", "tax collector", "ward"),
+    ),
+    "plat": (
+        ("plat of survey", "survey plat", "plat"),
+        ("surveyor", "scale", "bearing", "feet", "subdivision", "lot", "block"),
+    ),
+    "judgment": (
+        ("judgment", "lis pendens", "notice of lien", "lien"),
+        ("plaintiff", "defendant", "district court", "docket", "suit", "versus"),
+    ),
+    "cover": (
+        ("abstract of title", "bradley abstract"),
+        ("period of search", "names searched", "present owner", "conveyance documents", "encumbrances"),
+    ),
+}
+
+_TOKEN_BREAK = re.compile(r"[^a-z0-9]+")
+
+
+def _tokens(text: str) -> str:
+    """Lowercase words padded with spaces, so " term " only matches whole words."""
+    return " " + " ".join(_TOKEN_BREAK.sub(" ", str(text).lower()).split()) + " "
+
+
+class PageClassifier:
+    """Tags pages with document types from keyword hits.
+
+    Every keyword of every type is one bit: a single automaton pass over a
+    page sets the bits of the keywords it contains, and each type is then a
+    pair of mask tests (any title bit, or at least two term bits).
+    """
+
+    def __init__(self, keywords: Dict[str, Tuple[Iterable[str], Iterable[str]]] = PAGE_TYPE_KEYWORDS):
+        phrases: List[str] = []
+        self._types: List[Tuple[str, int, int]] = []  # (type, title mask, term mask)
+
+        def mask(words: Iterable[str]) -> int:
+            m = 0
+            for w in words:
+                phrase = _tokens(w)
+                if phrase not in phrases:
+                    phrases.append(phrase)
+                m |= 1 << phrases.index(phrase)
+            return m
+
+        for page_type, (titles, terms) in keywords.items():
+            self._types.append((page_type, mask(titles), mask(terms)))
+        self._automaton = AhoCorasick(phrases)
+
+    def keyword_bits(self, text: str) -> int:
+        bits = 0
+        for _, _, pid in self._automaton.iter_matches(_tokens(text)):
+            bits |= 1 << pid
+        return bits
+
+    def classify(self, text: str) -> Tuple[str, ...]:
+        """Types the page text looks like, strongest first; () when nothing matches."""
+        bits = self.keyword_bits(text)
+        scored = []
+        for page_type, titles, terms in self._types:
+            title_hits = bin(bits & titles).count("1")
+            term_hits = bin(bits & terms).count("1")
+            if title_hits or term_hits >= 2:
+                scored.append((-(2 * title_hits + term_hits), len(scored), page_type))
+        return tuple(t for _, _, t in sorted(scored))
+
+
+_DEFAULT_CLASSIFIER = None
+
+
+def default_classifier() -> PageClassifier:
+    global _DEFAULT_CLASSIFIER
+    if _DEFAULT_CLASSIFIER is None:
+        _DEFAULT_CLASSIFIER = PageClassifier()
+    return _DEFAULT_CLASSIFIER
+
+
+def tag_page_types(words: List[Dict[str, Any]], classifier: PageClassifier | None = None) -> Dict[Tuple[Any, int], Tuple[str, ...]]:
+    """Classify each (doc, page) of `words` and set every word's "page_types"."""
+    classifier = classifier or default_classifier()
+    pages: Dict[Tuple[Any, int], List[Dict[str, Any]]] = {}
+    for w in words:
+        pages.setdefault((w.get("doc"), w.get("page", 0)), []).append(w)
+    types: Dict[Tuple[Any, int], Tuple[str, ...]] = {}
+    for key, page_words in pages.items():
+        types[key] = classifier.classify(" ".join(str(w.get("text", "")) for w in page_words))
+        for w in page_words:
+            w["page_types"] = types[key]
+    return types
+
+
+def page_in_types(page_types: Tuple[str, ...] | None, wanted: Iterable[str]) -> bool:
+    """Whether a page tagged `page_types` should be searched for `wanted` types.
+
+    Pages the classifier couldn't place are searched for every type, so an
+    unusual page is never silently skipped.
+    """
+    return not page_types or any(t in page_types for t in wanted)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from page_classifier import page_in_types
+
+Box = Tuple[float, float, float, float]
+PageSpec = Union[int, str]
+
+
+def _page_numbers(spec: List[PageSpec], count: int) -> set:
+    """1-based page numbers named by `spec`: 3, -1 (last), "2-4", "2-" (to the end)."""
+    numbers = set()
+    for item in spec:
+        if isinstance(item, int) and not isinstance(item, bool):
+            n = item if item > 0 else count + 1 + item
+            numbers.add(n)
+            continue
+        first, sep, last = str(item).partition("-")
+        try:
+            lo = int(first)
+            hi = (int(last) if last.strip() else count) if sep else lo
+        except ValueError:
+            raise ValueError(f"Bad page spec {item!r}; use 3, -1, '2-4' or '2-'") from None
+        numbers.update(range(lo, hi + 1))
+    return numbers
+
+
+@dataclass(frozen=True)
+class FieldScope:
+    """Where a field may be found, from optional keys of its extract block.
+
+    - page_types: page classes (see page_classifier), e.g. [deed, mortgage]
+    - pages: 1-based page numbers within each document: 1, -1 (last), "1-2", "3-"
+    - region: {x0, y0, x1, y1} as fractions of the page, top-left origin
+    - doc_kinds: classes of a document's first page, e.g. [tax]
+    """
+    page_types: Tuple[str, ...] = ()
+    pages: Tuple[PageSpec, ...] = ()
+    region: Optional[Box] = None
+    doc_kinds: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_extract(cls, ex: Any) -> "FieldScope":
+        if not isinstance(ex, dict):
+            return cls()
+        pages = ex.get("pages") or ()
+        pages = tuple(pages) if isinstance(pages, (list, tuple)) else (pages,)
+        _page_numbers(list(pages), 1)  # validate
+        region = ex.get("region")
+        if region is not None:
+            try:
+                region = tuple(float(region[k]) for k in ("x0", "y0", "x1", "y1"))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"Bad region {region!r}; use {{x0, y0, x1, y1}} as page fractions") from None
+        return cls(
+            tuple(sorted(ex.get("page_types") or ())),
+            pages,
+            region,
+            tuple(sorted(ex.get("doc_kinds") or ())),
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.page_types or self.pages or self.region or self.doc_kinds)
+
+
+@dataclass
+class PageBucket:
+    doc: Any
+    page: int
+    number: int  # 1-based position among its document's pages
+    size: Tuple[float, float]
+    types: Tuple[str, ...]
+    words: List[int] = field(default_factory=list)  # indexes into the word list
+
+
+class PageIndex:
+    """Word indexes bucketed by (doc, page), so a scope is resolved page by page.
+
+    Page ranges, page types and document kinds are decided per bucket without
+    looking at its words; only a region test visits the words of pages in
+    scope. Page sizes come from the words' "page_size" (set at collection
+    from the PDF), else the extent of the page's words.
+    """
+
+    def __init__(self, words: List[Dict[str, Any]]):
+        self.words = words
+        self.buckets: List[PageBucket] = []
+        self._docs: Dict[Any, List[PageBucket]] = {}
+        by_key: Dict[Tuple[Any, int], PageBucket] = {}
+        for i, w in enumerate(words):
+            key = (w.get("doc"), w.get("page", 0))
+            bucket = by_key.get(key)
+            if bucket is None:
+                bucket = PageBucket(key[0], key[1], 0, w.get("page_size") or (0.0, 0.0), w.get("page_types") or ())
+                by_key[key] = bucket
+                self.buckets.append(bucket)
+                self._docs.setdefault(key[0], []).append(bucket)
+            bucket.words.append(i)
+        for pages in self._docs.values():
+            pages.sort(key=lambda b: b.page)
+            for n, bucket in enumerate(pages, 1):
+                bucket.number = n
+                if not all(bucket.size):
+                    boxes = [words[i].get("bbox", (0, 0, 0, 0)) for i in bucket.words]
+                    bucket.size = (max(b[2] for b in boxes) or 1.0, max(b[3] for b in boxes) or 1.0)
+
+    def doc_kind(self, doc: Any) -> Tuple[str, ...]:
+        """A document's kind: the classes of its first page."""
+        pages = self._docs.get(doc)
+        return pages[0].types if pages else ()
+
+    def _in_region(self, w: Dict[str, Any], bucket: PageBucket, region: Box) -> bool:
+        x0, y0, x1, y1 = w.get("bbox", (0, 0, 0, 0))
+        width, height = bucket.size
+        cx, cy = (x0 + x1) / 2 / width, (y0 + y1) / 2 / height
+        if w.get("origin") == "bottom":
+            cy = 1.0 - cy
+        return region[0] <= cx <= region[2] and region[1] <= cy <= region[3]
+
+    def select(self, scope: FieldScope) -> List[int]:
+        """Indexes of the words inside `scope`, in word-list order."""
+        if not scope:
+            return list(range(len(self.words)))
+        selected: List[int] = []
+        wanted_pages = {doc: _page_numbers(list(scope.pages), len(pages)) for doc, pages in self._docs.items()} if scope.pages else None
+        for bucket in self.buckets:
+            if scope.doc_kinds and not page_in_types(self.doc_kind(bucket.doc), scope.doc_kinds):
+                continue
+            if wanted_pages is not None and bucket.number not in wanted_pages[bucket.doc]:
+                continue
+            if scope.page_types and not page_in_types(bucket.types, scope.page_types):
+                continue
+            if scope.region is None:
+                selected.extend(bucket.words)
+            else:
+                selected.extend(i for i in bucket.words if self._in_region(self.words[i], bucket, scope.region))
+        selected.sort()
+        return selected
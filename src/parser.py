@@ -4,8 +4,14 @@ PDF Parser - Extract text, images, and structure from PDF documents
 from PyPDF2 import PdfReader
 from pathlib import Path
 from typing import List, Optional, Dict, Tuple
+import logging
 import os
 import io
+import time
+
+from progress import ProgressHook, emit
+
+logger = logging.getLogger(__name__)
 
 # Image extraction with PyMuPDF (fitz)
 try:
@@ -27,6 +33,13 @@ except ImportError:
 
 
 class PDFParser:
+    """Handles PDF text extraction and basic preprocessing
+
+    `progress` receives a "page" event as each page's text is read and "ocr" /
+    "warning" events while OCR runs (see progress.ProgressEvent); without it
+    those notes go to the log.
+    """
+
     def _preprocess_image_for_ocr(self, image):
         """Apply basic pre-processing: grayscale, sharpen, autocontrast."""
         from PIL import ImageFilter, ImageOps
@@ -60,14 +73,21 @@ class PDFParser:
             return "\n".join(ocr_text)
         except Exception as e:
             return f"OCR extraction failed: {str(e)}"
-    """Handles PDF text extraction and basic preprocessing"""
     
-    def __init__(self, pdf_path: str, use_ocr: bool = True):
+    def __init__(self, pdf_path: str, use_ocr: bool = True, progress: Optional[ProgressHook] = None):
         self.pdf_path = Path(pdf_path)
         self.text = ""
         self.pages = []
         self.use_ocr = use_ocr and OCR_AVAILABLE
         self.ocr_used = False
+        self.progress = progress
+
+    def _report(self, kind: str, message: str = "", **details) -> None:
+        if self.progress is None:
+            if message:
+                (logger.warning if kind == "warning" else logger.info)(message)
+            return
+        emit(self.progress, kind, doc=str(self.pdf_path), message=message, **details)
         
     def extract_text(self) -> str:
         """Extract all text from the PDF, using OCR if needed"""
@@ -76,16 +96,19 @@ class PDFParser:
             self.pages = []
             
             # Try normal text extraction first
-            for page in reader.pages:
+            total = len(reader.pages)
+            for i, page in enumerate(reader.pages):
+                started = time.perf_counter()
                 page_text = page.extract_text()
                 if page_text:
                     self.pages.append(page_text)
+                self._report("page", page=i, total=total, source="text", seconds=time.perf_counter() - started)
             
             self.text = "\n\n".join(self.pages)
             
             # Check if we got meaningful text
             if self._is_text_quality_low(self.text) and self.use_ocr:
-                print(f"Low quality text detected. Attempting OCR...")
+                self._report("ocr", "Low quality text detected. Attempting OCR...")
                 return self._extract_with_ocr()
             
             return self.text
@@ -145,39 +168,40 @@ class PDFParser:
     def _extract_with_ocr(self) -> str:
         """Extract text using OCR (for scanned PDFs)"""
         if not OCR_AVAILABLE:
-            print("⚠️  OCR libraries not available.")
-            print("Install with: pip install pytesseract pdf2image Pillow")
+            self._report("warning", "OCR libraries not available. Install with: pip install pytesseract pdf2image Pillow")
             return self.text
         try:
-            print("Converting PDF to images...")
+            self._report("ocr", "Converting PDF to images...")
             images = convert_from_path(
                 self.pdf_path,
                 dpi=300,
                 fmt='jpeg'
             )
-            print(f"Running OCR on {len(images)} page(s)...")
+            self._report("ocr", f"Running OCR on {len(images)} page(s)...", total=len(images))
             self.pages = []
             for i, image in enumerate(images):
-                print(f"  Processing page {i+1}/{len(images)}...")
+                started = time.perf_counter()
                 pre_image = self._preprocess_image_for_ocr(image)
                 page_text = pytesseract.image_to_string(
                     pre_image,
                     config='--psm 1'
                 )
                 self.pages.append(page_text)
+                self._report("page", page=i, total=len(images), source="ocr", seconds=time.perf_counter() - started)
             self.text = "\n\n".join(self.pages)
             self.ocr_used = True
-            print(f"✓ OCR complete! Extracted {len(self.text)} characters")
+            self._report("ocr", f"OCR complete: extracted {len(self.text)} characters")
             return self.text
         except FileNotFoundError as e:
             if 'tesseract' in str(e).lower():
-                print("\n⚠️  Tesseract OCR is not installed!")
-                print("\nTo enable OCR for scanned PDFs:")
-                print("  1. Run: install_tesseract.ps1 (as Administrator)")
-                print("  2. Or download from: https://github.com/UB-Mannheim/tesseract/wiki")
-                print("  3. See OCR_SETUP.md for detailed instructions\n")
+                self._report(
+                    "warning",
+                    "Tesseract OCR is not installed. Run install_tesseract.ps1 (as Administrator) "
+                    "or download it from https://github.com/UB-Mannheim/tesseract/wiki; "
+                    "see OCR_SETUP.md for detailed instructions.",
+                )
             else:
-                print(f"⚠️  OCR failed: {str(e)}")
+                self._report("warning", f"OCR failed: {str(e)}")
             return self.text
     
     def extract_images(self, output_dir: Optional[Path] = None) -> List[Dict[str, any]]:
@@ -0,0 +1,403 @@
+"""
+Pattern Scan - Find the first match of many regexes in a single pass over the text
+"""
+import logging
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import regex as _regex  # drop-in `re` replacement that can abort a match on timeout
+except Exception:
+    _regex = None
+
+logger = logging.getLogger(__name__)
+
+_FLAG_LETTERS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+_NAMED_GROUP = re.compile(r"\(\?P([<=])([A-Za-z_]\w*)")
+
+
+def _scoped(pattern: str, flags: int) -> str:
+    """Wrap a pattern in a scoped inline-flag group so it keeps its own flags when merged."""
+    on = "".join(c for f, c in _FLAG_LETTERS if flags & f)
+    off = "".join(c for f, c in _FLAG_LETTERS if not flags & f)
+    return f"(?{on}-{off}:{pattern})" if off else f"(?{on}:{pattern})"
+
+
+def _namespaced(pattern: str, idx: int) -> str:
+    """Prefix named groups (and their backreferences) so merged patterns don't collide."""
+    return _NAMED_GROUP.sub(lambda m: f"(?P{m.group(1)}_p{idx}_{m.group(2)}", pattern)
+
+
+@dataclass
+class RegexBudget:
+    """Limits for a single pattern's search.
+
+    timeout: wall-clock seconds per pattern. Enforced inside the match when the
+        `regex` package is installed; with stdlib `re` it is checked between windows.
+    max_chars: step budget for stdlib `re`: text is searched in windows of at most
+        this many characters, so one runaway match can only backtrack over a window.
+    overlap: characters shared by consecutive windows, so matches up to this long
+        are not lost at window boundaries.
+    """
+    timeout: float = 0.5
+    max_chars: int = 200_000
+    overlap: int = 4_000
+
+
+DEFAULT_BUDGET = RegexBudget()
+
+
+class RegexTimeout(Exception):
+    """A pattern exceeded its RegexBudget."""
+
+    def __init__(self, pattern: str, input_size: int, elapsed: float):
+        super().__init__(f"regex exceeded budget after {elapsed:.2f}s on {input_size} chars: {pattern}")
+        self.pattern = pattern
+        self.input_size = input_size
+        self.elapsed = elapsed
+
+
+@lru_cache(maxsize=512)
+def compile_pattern(pattern: str, flags: int = 0):
+    """Compile with the engine that can honour timeouts, when available."""
+    return (_regex or re).compile(pattern, flags)
+
+
+def _search_within(compiled, text: str, pos: int, budget: RegexBudget, pattern: str):
+    """compiled.search(text, pos), raising RegexTimeout once the budget is spent."""
+    started = time.monotonic()
+    deadline = started + budget.timeout
+    if _regex is not None:
+        try:
+            return compiled.search(text, pos, timeout=budget.timeout)
+        except TimeoutError:
+            raise RegexTimeout(pattern, len(text), time.monotonic() - started) from None
+    window = max(budget.max_chars, budget.overlap * 2)
+    while True:
+        end = min(len(text), pos + window)
+        m = compiled.search(text, pos, end)
+        if end >= len(text):
+            return m
+        # A hit inside the overlap is searched again with more context by the next window
+        if m is not None and m.start() < end - budget.overlap:
+            return m
+        if time.monotonic() > deadline:
+            raise RegexTimeout(pattern, len(text), time.monotonic() - started)
+        pos = end - budget.overlap
+
+
+def bounded_search(pattern: str, text: str, flags: int = 0, budget: Optional[RegexBudget] = None, pos: int = 0):
+    """re.search (from `pos`) under a RegexBudget. Logs and raises RegexTimeout when it is exceeded."""
+    try:
+        return _search_within(compile_pattern(pattern, flags), text or "", pos, budget or DEFAULT_BUDGET, pattern)
+    except RegexTimeout as e:
+        logger.warning("Regex timed out after %.2fs on %d chars: %r", e.elapsed, e.input_size, pattern)
+        raise
+
+
+@lru_cache(maxsize=256)
+def _compile_combined(parts: Tuple[Tuple[int, str, int], ...]) -> Tuple["re.Pattern[str]", Dict[int, int]]:
+    """Compile `(?=(?P<_pN>...))|...` for the given (idx, pattern, flags) parts.
+
+    Each alternative is a zero-width lookahead, so one search finds the leftmost
+    position where any remaining pattern matches without consuming text that
+    another pattern might need.
+    """
+    alternatives = [f"(?=(?P<_p{idx}>{_scoped(_namespaced(p, idx), f)}))" for idx, p, f in parts]
+    combined = (_regex or re).compile("|".join(alternatives))
+    bases = {idx: combined.groupindex[f"_p{idx}"] for idx, _, _ in parts}
+    return combined, bases
+
+
+class ScanMatch:
+    """Match-like view of one pattern's groups inside the combined match."""
+
+    __slots__ = ("_match", "_base", "_ngroups", "_names", "_offset")
+
+    def __init__(self, match: "re.Match[str]", base: int, ngroups: int, names: Dict[str, int], offset: int = 0):
+        self._match = match
+        self._base = base
+        self._ngroups = ngroups
+        self._names = names
+        self._offset = offset
+
+    def _index(self, group) -> int:
+        if isinstance(group, str):
+            return self._base + self._names[group]
+        if not 0 <= group <= self._ngroups:
+            raise IndexError("no such group")
+        return self._base + group
+
+    def group(self, group=0) -> Optional[str]:
+        return self._match.group(self._index(group))
+
+    def groups(self) -> Tuple[Optional[str], ...]:
+        return tuple(self._match.group(self._base + n) for n in range(1, self._ngroups + 1))
+
+    def groupdict(self) -> Dict[str, Optional[str]]:
+        return {name: self.group(name) for name in self._names}
+
+    def start(self, group=0) -> int:
+        s = self._match.start(self._index(group))
+        return s + self._offset if s >= 0 else s
+
+    def end(self, group=0) -> int:
+        e = self._match.end(self._index(group))
+        return e + self._offset if e >= 0 else e
+
+    def span(self, group=0) -> Tuple[int, int]:
+        return self.start(group), self.end(group)
+
+
+class FrozenMatch:
+    """Detached copy of a ScanMatch, so a kept match doesn't pin the window it came from."""
+
+    __slots__ = ("_groups", "_spans", "_names")
+
+    def __init__(self, m: ScanMatch):
+        n = len(m.groups())
+        self._groups = tuple(m.group(i) for i in range(n + 1))
+        self._spans = tuple(m.span(i) for i in range(n + 1))
+        self._names = m._names
+
+    def _index(self, group) -> int:
+        return self._names[group] if isinstance(group, str) else group
+
+    def group(self, group=0) -> Optional[str]:
+        return self._groups[self._index(group)]
+
+    def groups(self) -> Tuple[Optional[str], ...]:
+        return self._groups[1:]
+
+    def groupdict(self) -> Dict[str, Optional[str]]:
+        return {name: self._groups[i] for name, i in self._names.items()}
+
+    def start(self, group=0) -> int:
+        return self._spans[self._index(group)][0]
+
+    def end(self, group=0) -> int:
+        return self._spans[self._index(group)][1]
+
+    def span(self, group=0) -> Tuple[int, int]:
+        return self._spans[self._index(group)]
+
+
+class PatternSet:
+    """An ordered collection of regexes scanned together.
+
+    `first_matches` returns, for every pattern, the same leftmost match that
+    `re.search(pattern, text, flags)` would return, while walking the text once.
+    Patterns added under the same `group` are alternatives in priority order:
+    once one of them matches, the lower-priority ones are no longer searched.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[str, int, Optional[str]]] = []
+        self._ngroups: List[int] = []
+        self._names: List[Dict[str, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, pattern: str, flags: int = 0, group: Optional[str] = None) -> int:
+        """Register a pattern and return its index in the scan results."""
+        compiled = re.compile(pattern, flags)  # validate early, and learn the group layout
+        self._entries.append((pattern, flags, group))
+        self._ngroups.append(compiled.groups)
+        self._names.append(dict(compiled.groupindex))
+        return len(self._entries) - 1
+
+    def entry(self, idx: int) -> Tuple[str, int, Optional[str]]:
+        return self._entries[idx]
+
+    def _drop_lower(self, active: List[int], idx: int) -> List[int]:
+        """Remove idx and the lower-priority alternatives of its group from active."""
+        group = self._entries[idx][2]
+        return [
+            i for i in active
+            if i != idx and not (group is not None and i > idx and self._entries[i][2] == group)
+        ]
+
+    def first_matches(self, text: str, budget: Optional[RegexBudget] = None) -> Dict[int, Optional[ScanMatch]]:
+        """Scan `text` once and return {index: first match or None}.
+
+        Indexes dropped because a higher-priority pattern in their group matched,
+        or that ran out of budget, are left out of the result.
+        """
+        return self.scan(text, budget)[0]
+
+    def scan(self, text: str, budget: Optional[RegexBudget] = None,
+             answers: Optional[Dict[int, Tuple[int, ScanMatch]]] = None) -> Tuple[Dict[int, Optional[ScanMatch]], List[int]]:
+        """Like first_matches, also returning the indexes that exceeded the budget.
+
+        `answers` ({index: (offset, match)}) are matches found elsewhere, e.g. on
+        a labeled line starting at `offset`. An answer is the pattern's result
+        unless the scan finds the pattern starting before `offset`, so the
+        pattern is not searched past it.
+
+        Each step of the combined scan gets one pattern's budget. If a step runs
+        out, the remaining patterns are searched one by one from that point so the
+        pattern that is actually too slow can be singled out and logged.
+        """
+        budget = budget or DEFAULT_BUDGET
+        answers = dict(answers or {})
+        active = list(range(len(self._entries)))
+        found: Dict[int, Optional[ScanMatch]] = {}
+        timed_out: List[int] = []
+        pos = 0
+        while active:
+            parts = tuple((i, self._entries[i][0], self._entries[i][1]) for i in active)
+            combined, bases = _compile_combined(parts)
+            try:
+                m = _search_within(combined, text, pos, budget, "<combined>")
+            except RegexTimeout:
+                self._scan_each(text, pos, active, budget, found, timed_out, answers)
+                return found, timed_out
+            # Answers at or before the next scan hit are their patterns' first matches
+            limit = len(text) if m is None else m.start()
+            due = sorted(i for i in active if i in answers and answers[i][0] <= limit)
+            if due:
+                for idx in due:
+                    if idx in active:
+                        found[idx] = answers[idx][1]
+                        active = self._drop_lower(active, idx)
+                continue
+            if m is None:
+                break
+            idx = int(m.lastgroup[2:])  # "_pN" closes last, after its own inner groups
+            found[idx] = ScanMatch(m, bases[idx], self._ngroups[idx], self._names[idx])
+            active = self._drop_lower(active, idx)
+            # Other patterns may still match at this same position
+            pos = m.start()
+        for i in active:
+            found[i] = None
+        return found, timed_out
+
+    def finditer(self, text: str, budget: Optional[RegexBudget] = None) -> Iterator[Tuple[int, ScanMatch]]:
+        """Every non-overlapping match of any pattern, left to right, in one pass.
+
+        Yields (index, match). Where several patterns match at the same
+        position the earliest added wins and the scan resumes after its match;
+        `group` priorities don't apply. A step that exceeds the budget is
+        logged and ends the scan.
+        """
+        if not self._entries:
+            return
+        budget = budget or DEFAULT_BUDGET
+        parts = tuple((i, p, f) for i, (p, f, _) in enumerate(self._entries))
+        combined, bases = _compile_combined(parts)
+        pos = 0
+        while pos <= len(text):
+            try:
+                m = _search_within(combined, text, pos, budget, "<combined>")
+            except RegexTimeout as e:
+                logger.warning("Regex scan timed out after %.2fs on %d chars at offset %d", e.elapsed, e.input_size, pos)
+                return
+            if m is None:
+                return
+            idx = int(m.lastgroup[2:])
+            yield idx, ScanMatch(m, bases[idx], self._ngroups[idx], self._names[idx])
+            pos = max(m.end(bases[idx]), m.start() + 1)
+
+    def _scan_each(self, text: str, pos: int, active: List[int], budget: RegexBudget,
+                   found: Dict[int, Optional[ScanMatch]], timed_out: List[int],
+                   answers: Dict[int, Tuple[int, ScanMatch]]) -> None:
+        """Per-pattern fallback once the combined scan has exceeded its budget at pos."""
+        while active:
+            idx = active[0]
+            pattern, flags, _ = self._entries[idx]
+            try:
+                m = _search_within(compile_pattern(pattern, flags), text, pos, budget, pattern)
+            except RegexTimeout as e:
+                logger.warning("Regex timed out after %.2fs on %d chars: %r", e.elapsed, e.input_size, pattern)
+                timed_out.append(idx)
+                active = active[1:]
+                continue
+            if idx in answers and (m is None or answers[idx][0] <= m.start()):
+                found[idx] = answers[idx][1]
+                active = self._drop_lower(active, idx)
+                continue
+            if m is None:
+                found[idx] = None
+                active = active[1:]
+                continue
+            found[idx] = ScanMatch(m, 0, self._ngroups[idx], self._names[idx])
+            active = self._drop_lower(active, idx)
+
+    def scan_stream(self, chunks: Iterable[str], overlap: int = 4000, window: int = 64_000,
+                    budget: Optional[RegexBudget] = None) -> Tuple[Dict[int, Optional[FrozenMatch]], List[int]]:
+        """Like scan, over text delivered in consecutive chunks (e.g. pages).
+
+        Only a sliding window is held: chunks are buffered until `window` new
+        characters are pending, then searched; the last `overlap` characters
+        are kept and searched again with the next window, so a match
+        up to `overlap` characters long can straddle a chunk boundary. A match
+        that starts in the last `overlap` characters is only accepted once the
+        next window is searched, since an earlier start could match then. A match
+        that reaches the end of the window could still grow (or was cut short by
+        `$`), so it is deferred until more text arrives, keeping at most
+        4 * overlap characters for it. Offsets in the results are absolute.
+        """
+        budget = budget or DEFAULT_BUDGET
+        max_keep = overlap * 4
+        active = list(range(len(self._entries)))
+        found: Dict[int, Optional[FrozenMatch]] = {}
+        timed_out: List[int] = []
+        buf, base, pos = "", 0, 0
+        it = iter(chunks)
+        nxt = next(it, None)
+        while nxt is not None and active:
+            chunk, nxt = nxt, next(it, None)
+            last = nxt is None
+            buf += chunk
+            if not last and len(buf) - pos < window:
+                continue
+            deferred: Dict[int, ScanMatch] = {}
+            pending = list(active)
+            while pending:
+                parts = tuple((i, self._entries[i][0], self._entries[i][1]) for i in pending)
+                combined, bases = _compile_combined(parts)
+                try:
+                    m = _search_within(combined, buf, pos, budget, "<combined>")
+                except RegexTimeout as e:
+                    for i in active:
+                        logger.warning("Regex timed out after %.2fs on %d-char window: %r",
+                                       e.elapsed, len(buf), self._entries[i][0])
+                    timed_out.extend(active)
+                    active = []
+                    break
+                if m is None:
+                    break
+                idx = int(m.lastgroup[2:])
+                sm = ScanMatch(m, bases[idx], self._ngroups[idx], self._names[idx], base)
+                pending.remove(idx)
+                # In the overlap tail an earlier start may still match once more text
+                # arrives (as in _search_within); at the end, the match itself may grow
+                if not last and (m.start() >= len(buf) - overlap or m.end(bases[idx]) >= len(buf) - 1):
+                    deferred[idx] = sm
+                else:
+                    found[idx] = FrozenMatch(sm)
+                    active = self._drop_lower(active, idx)
+                    pending = [i for i in pending if i in active]
+                pos = m.start()
+            if last or not active:
+                break
+            # Search again from the overlap, or from a deferred match's start if that is earlier
+            keep = max(len(buf) - overlap, 0)
+            for idx, sm in sorted(deferred.items()):
+                start = sm.start() - base
+                if start < len(buf) - max_keep:
+                    if idx in active:
+                        found[idx] = FrozenMatch(sm)
+                        active = self._drop_lower(active, idx)
+                else:
+                    keep = min(keep, start)
+            # Keep one character before the rescan point so \b and lookbehinds see it
+            ctx = max(keep - 1, 0)
+            buf, base, pos = buf[ctx:], base + ctx, keep - ctx
+        for i in active:
+            found[i] = None
+        return found, timed_out
@@ -1,19 +1,14 @@
 from __future__ import annotations
+import os
+from functools import lru_cache
 from typing import Dict, Any, Tuple, Optional
 import fitz
 from schema_loader import get_field_defs, apply_postprocess, validate_value
-from calibration import compute_page_transform
-from render import draw_text_in_box
+from calibration import page_transform
+from render import render_plan
 
-
-def _box_to_rect(page: fitz.Page, box: dict, transform: dict) -> fitz.Rect:
-    x = (box["x"] + transform.get("dx", 0.0)) * transform.get("scale", 1.0)
-    y_top = (box["y"] + transform.get("dy", 0.0)) * transform.get("scale", 1.0)
-    w = box["w"] * transform.get("scale", 1.0)
-    h = box.get("h", 14) * transform.get("scale", 1.0)
-    page_h = page.rect.height
-    y = page_h - y_top
-    return fitz.Rect(x, y - h, x + w, y)
+SOURCE_DPI = 72  # low resolution: a source crop only has to be legible next to the form
+SOURCE_MARGIN = (72.0, 24.0)  # points of context kept around a value's box (x, y)
 
 
 def render_cover_preview_png(template_path: str, schema: Dict[str, Any], data: Dict[str, str], confidences: Optional[Dict[str, float]] = None) -> Tuple[bytes, Dict[str, Dict[str, Any]], Dict[str, float]]:
@@ -24,13 +19,15 @@ def render_cover_preview_png(template_path: str, schema: Dict[str, Any], data: D
     # Open template and make a working copy in memory
     doc = fitz.open(template_path)
     page = doc[0]
-    transform = compute_page_transform(doc, schema)
+    transform = page_transform(template_path, schema, doc)
+    plan = render_plan(schema, transform, page.rect.height)
     fields = get_field_defs(schema)
 
     statuses: Dict[str, Dict[str, Any]] = {}
+    values: Dict[str, str] = {}
+    outlines: Dict[str, Tuple[float, float, float]] = {}
 
     for key, fdef in fields.items():
-        render_def = fdef.get("render", {})
         value = apply_postprocess(data.get(key, ""), fdef.get("postprocess"))
         ok, errs = validate_value(value, fdef.get("validate"))
         # Confidence: combine extraction confidence (if any) with validation heuristic
@@ -41,28 +38,43 @@ def render_cover_preview_png(template_path: str, schema: Dict[str, Any], data: D
             conf = base
         color = "green" if conf >= 0.85 else ("yellow" if conf >= 0.6 else "red")
         statuses[key] = {"ok": ok, "errors": errs, "confidence": conf, "color": color}
-        # Draw overlay first
-        if render_def:
-            rect = _box_to_rect(page, render_def.get("box", {}), transform)
-            if color == "green":
-                stroke = (0, 0.6, 0)
-            elif color == "yellow":
-                stroke = (0.9, 0.7, 0)
-            else:
-                stroke = (0.9, 0, 0)
-            page.draw_rect(rect, color=stroke, width=0.8)
-            # Render value
-            draw_text_in_box(
-                page,
-                value,
-                render_def.get("box", {}),
-                render_def.get("font", {}),
-                render_def.get("overflow", {}),
-                transform,
-            )
+        if color == "green":
+            outlines[key] = (0, 0.6, 0)
+        elif color == "yellow":
+            outlines[key] = (0.9, 0.7, 0)
+        else:
+            outlines[key] = (0.9, 0, 0)
+        values[key] = value
+    # Overlay boxes, then every value, each in one batch
+    plan.draw_all(page, values, outlines)
 
     # Rasterize to PNG
     pix = page.get_pixmap(dpi=144)
     img_bytes = pix.tobytes("png")
     doc.close()
     return img_bytes, statuses, transform
+
+
+@lru_cache(maxsize=256)
+def _source_highlight_png(path: str, mtime_ns: int, size: int, page: int, bbox: Tuple[float, float, float, float], dpi: int, margin: Tuple[float, float]) -> bytes:
+    doc = fitz.open(path)
+    try:
+        pg = doc[page]
+        rect = fitz.Rect(bbox)
+        # Drawn on the in-memory copy only; the file is never saved
+        pg.draw_rect(rect, color=(0.9, 0.5, 0), fill=(1, 0.85, 0), fill_opacity=0.35, width=1)
+        clip = fitz.Rect(rect.x0 - margin[0], rect.y0 - margin[1], rect.x1 + margin[0], rect.y1 + margin[1]) & pg.rect
+        return pg.get_pixmap(dpi=dpi, clip=clip, alpha=False).tobytes("png")
+    finally:
+        doc.close()
+
+
+def render_source_highlight_png(pdf_path: str, page: int, bbox: Tuple[float, float, float, float], dpi: int = SOURCE_DPI, margin: Tuple[float, float] = SOURCE_MARGIN) -> bytes:
+    """PNG of the region around `bbox` (PDF points, top-left origin) on a page, with the box highlighted.
+
+    Only the crop is rasterized, at low DPI, and results are cached by file
+    (path, size and modification time), page and box, so showing where each
+    extracted value came from is cheap to repeat on every rerun.
+    """
+    st = os.stat(pdf_path)
+    return _source_highlight_png(str(pdf_path), st.st_mtime_ns, st.st_size, int(page), tuple(float(v) for v in bbox), dpi, tuple(margin))
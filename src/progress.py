@@ -0,0 +1,68 @@
+from __future__ import annotations
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+
+@dataclass
+class ProgressEvent:
+    """One step of parsing or extraction, as reported to a ProgressHook.
+
+    kind is one of:
+    - "page": a page's text or words are ready (page, total; source "text", "words" or "ocr")
+    - "ocr": OCR of a document started (total pages) or a note about it (message)
+    - "document": a document's words and text are ready
+    - "field": a field was resolved; value is its FieldValue (the document's
+      first candidate when extracting per document)
+    - "warning": something degraded, e.g. OCR not installed (message)
+    - "done": the whole run finished; value is its result
+    """
+    kind: str
+    doc: str = ""
+    page: Optional[int] = None  # 0-based
+    total: Optional[int] = None
+    field: str = ""
+    value: Any = None
+    seconds: float = 0.0  # time the step took
+    source: str = ""
+    message: str = ""
+
+
+ProgressHook = Callable[[ProgressEvent], None]
+
+
+def emit(hook: Optional[ProgressHook], kind: str, **details: Any) -> None:
+    """Send an event to `hook`, if there is one."""
+    if hook is not None:
+        hook(ProgressEvent(kind, **details))
+
+
+def iter_progress(run: Callable[[ProgressHook], Any]) -> Iterator[ProgressEvent]:
+    """Call `run(hook)` in a background thread and yield its events as they happen.
+
+    The last event is "done" with run's return value. An exception in `run`
+    is raised from the generator once the events before it have been yielded.
+    """
+    events: "queue.Queue[Optional[ProgressEvent]]" = queue.Queue()
+    outcome: dict = {}
+
+    def _target() -> None:
+        try:
+            outcome["value"] = run(events.put)
+        except BaseException as e:  # handed to the consumer below
+            outcome["error"] = e
+        finally:
+            events.put(None)
+
+    worker = threading.Thread(target=_target, daemon=True)
+    worker.start()
+    while True:
+        event = events.get()
+        if event is None:
+            break
+        yield event
+    worker.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    yield ProgressEvent("done", value=outcome.get("value"))
@@ -0,0 +1,347 @@
+from __future__ import annotations
+import logging
+import math
+import re
+import string
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+try:  # Python 3.11+
+    import re._parser as _sre_parse
+    import re._constants as _sre
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse as _sre_parse  # type: ignore[no-redef]
+    import sre_constants as _sre  # type: ignore[no-redef]
+
+from pattern_scan import RegexBudget, RegexTimeout, bounded_search
+
+logger = logging.getLogger(__name__)
+
+# Characters considered when comparing what parts of a pattern can match
+_ALPHABET: FrozenSet[str] = frozenset(string.printable)
+_DIGITS = frozenset(string.digits)
+_SPACE = frozenset(string.whitespace)
+_WORD = frozenset(string.ascii_letters + string.digits + "_")
+_CATEGORIES = {
+    _sre.CATEGORY_DIGIT: _DIGITS, _sre.CATEGORY_NOT_DIGIT: _ALPHABET - _DIGITS,
+    _sre.CATEGORY_SPACE: _SPACE, _sre.CATEGORY_NOT_SPACE: _ALPHABET - _SPACE,
+    _sre.CATEGORY_WORD: _WORD, _sre.CATEGORY_NOT_WORD: _ALPHABET - _WORD,
+}
+_REPEATS = {_sre.MAX_REPEAT, _sre.MIN_REPEAT, getattr(_sre, "POSSESSIVE_REPEAT", _sre.MAX_REPEAT)}
+_ASSERTS = {_sre.ASSERT, _sre.ASSERT_NOT}
+
+# Dynamic probe: input sizes and the growth exponent treated as super-linear
+_PROBE_SIZES = (16, 24, 32, 256, 512, 1024, 2048)
+_PROBE_BUDGET = RegexBudget(timeout=0.25)
+_SUPER_LINEAR_EXPONENT = 1.6
+_EXPONENTIAL = 4.0
+_MIN_TIMED = 0.0005  # seconds; below this timings are noise
+_RETIMES = 3  # runs of a suspect step; the fastest is kept
+
+
+@dataclass
+class RegexLintIssue:
+    field: str
+    where: str  # "extract.regex" or "validate"
+    pattern: str
+    code: str  # nested_quantifier, ambiguous_alternation, unanchored_wildcard, ...
+    severity: str  # "error" or "warning"
+    message: str
+
+
+def _fold(chars: FrozenSet[str], flags: int) -> FrozenSet[str]:
+    if flags & re.IGNORECASE:
+        return chars | frozenset(c.swapcase() for c in chars)
+    return chars
+
+
+def _class_chars(items, flags: int) -> FrozenSet[str]:
+    chars: set = set()
+    negate = False
+    for op, av in items:
+        if op == _sre.NEGATE:
+            negate = True
+        elif op == _sre.LITERAL:
+            chars.add(chr(av))
+        elif op == _sre.RANGE:
+            chars.update(c for c in _ALPHABET if av[0] <= ord(c) <= av[1])
+        elif op == _sre.CATEGORY:
+            chars |= _CATEGORIES.get(av, _ALPHABET)
+    folded = _fold(frozenset(chars), flags)
+    return _ALPHABET - folded if negate else folded
+
+
+def _sub_flags(av, flags: int) -> int:
+    add, remove = (av[1], av[2]) if len(av) == 4 else (0, 0)
+    return (flags | add) & ~remove
+
+
+def _nullable(seq, flags: int) -> bool:
+    return all(_item_nullable(op, av, flags) for op, av in seq)
+
+
+def _item_nullable(op, av, flags: int) -> bool:
+    if op in _REPEATS:
+        return av[0] == 0 or _nullable(av[2], flags)
+    if op == _sre.SUBPATTERN:
+        return _nullable(av[-1], _sub_flags(av, flags))
+    if op == _sre.BRANCH:
+        return any(_nullable(b, flags) for b in av[1])
+    if op == getattr(_sre, "ATOMIC_GROUP", None):
+        return _nullable(av, flags)
+    return op in _ASSERTS or op == _sre.AT
+
+
+def _chars(seq, flags: int, first_only: bool) -> FrozenSet[str]:
+    """Characters the sequence can start with (first_only) or contain anywhere."""
+    out: FrozenSet[str] = frozenset()
+    for op, av in seq:
+        if op == _sre.LITERAL:
+            out |= _fold(frozenset(chr(av)), flags)
+        elif op == _sre.NOT_LITERAL:
+            out |= _ALPHABET - _fold(frozenset(chr(av)), flags)
+        elif op == _sre.ANY:
+            out |= _ALPHABET if flags & re.DOTALL else _ALPHABET - {"\n"}
+        elif op == _sre.IN:
+            out |= _class_chars(av, flags)
+        elif op in _REPEATS:
+            out |= _chars(av[2], flags, first_only)
+        elif op == _sre.SUBPATTERN:
+            out |= _chars(av[-1], _sub_flags(av, flags), first_only)
+        elif op == _sre.BRANCH:
+            for b in av[1]:
+                out |= _chars(b, flags, first_only)
+        elif op == getattr(_sre, "ATOMIC_GROUP", None):
+            out |= _chars(av, flags, first_only)
+        elif op == _sre.GROUPREF:
+            out |= _ALPHABET
+        if first_only and not _item_nullable(op, av, flags):
+            break
+    return out
+
+
+def _variable_tails(seq, flags: int) -> List[Tuple[Any, int, str]]:
+    """Parts of variable length that can end the sequence (only nullable items after them).
+
+    Returns (part, flags, issue code): the body of a repeat whose count can
+    vary, or the alternatives of a branch one of which is empty. The parser
+    factors "a|aa" into "a(?:|a)", so overlapping alternatives show up as the
+    latter.
+    """
+    found: List[Tuple[Any, int, str]] = []
+    for op, av in reversed(list(seq)):
+        if op in _REPEATS and av[0] != av[1]:
+            found.append((av[2], flags, "nested_quantifier"))
+        elif op == _sre.SUBPATTERN:
+            found.extend(_variable_tails(av[-1], _sub_flags(av, flags)))
+        elif op == _sre.BRANCH:
+            if any(_nullable(b, flags) for b in av[1]):
+                found.extend((b, flags, "ambiguous_alternation") for b in av[1] if b)
+            else:
+                for b in av[1]:
+                    found.extend(_variable_tails(b, flags))
+        if not _item_nullable(op, av, flags):
+            break
+    return found
+
+
+def _is_wildcard_repeat(op, av, flags: int) -> bool:
+    if op not in _REPEATS or av[1] != _sre.MAXREPEAT:
+        return False
+    return len(_chars(av[2], flags, False)) >= len(_ALPHABET) - 2
+
+
+_TAIL_MESSAGES = {
+    "nested_quantifier": "a repeated group ends in a repeat that can also start the next iteration",
+    "ambiguous_alternation": "a repeated group ends in an optional alternative that can also start the next iteration",
+}
+
+
+def _walk(seq, flags: int, issues: List[Tuple[str, str, str]]) -> None:
+    for op, av in seq:
+        if op in _REPEATS:
+            body = av[2]
+            if av[1] == _sre.MAXREPEAT:
+                head = _chars(body, flags, True)
+                for inner, inner_flags, code in _variable_tails(body, flags):
+                    if _chars(inner, inner_flags, False) & head:
+                        issues.append((code, "error", _TAIL_MESSAGES[code]))
+                        break
+                branches = [b for o, a in body if o == _sre.BRANCH for b in a[1]]
+                for o, a in body:
+                    if o == _sre.SUBPATTERN:
+                        branches.extend(b for o2, a2 in a[-1] if o2 == _sre.BRANCH for b in a2[1])
+                firsts = [_chars(b, flags, True) for b in branches]
+                if any(firsts[i] & firsts[j] for i in range(len(firsts)) for j in range(i + 1, len(firsts))):
+                    issues.append(("ambiguous_alternation", "error",
+                                   "alternatives inside a repeat can start with the same character"))
+            _walk(body, flags, issues)
+        elif op == _sre.SUBPATTERN:
+            _walk(av[-1], _sub_flags(av, flags), issues)
+        elif op == _sre.BRANCH:
+            for b in av[1]:
+                _walk(b, flags, issues)
+        elif op in _ASSERTS:
+            _walk(av[1], flags, issues)
+        elif op == getattr(_sre, "ATOMIC_GROUP", None):
+            _walk(av, flags, issues)
+
+
+def _flatten(seq, flags: int) -> List[Tuple[Any, Any, int]]:
+    """Top-level items with plain groups inlined, for positional checks."""
+    out: List[Tuple[Any, Any, int]] = []
+    for op, av in seq:
+        if op == _sre.SUBPATTERN:
+            out.extend(_flatten(av[-1], _sub_flags(av, flags)))
+        else:
+            out.append((op, av, flags))
+    return out
+
+
+def _static_issues(parsed, flags: int) -> List[Tuple[str, str, str]]:
+    issues: List[Tuple[str, str, str]] = []
+    _walk(parsed, flags, issues)
+    items = _flatten(parsed, flags)
+    consuming = [(op, av, f) for op, av, f in items if op not in _ASSERTS]
+    if consuming and consuming[0][0] != _sre.AT and _is_wildcard_repeat(*consuming[0]):
+        issues.append(("unanchored_wildcard", "warning",
+                       "starts with an unbounded wildcard and no anchor; failed searches are quadratic"))
+    wild = [i for i, (op, av, f) in enumerate(items) if _is_wildcard_repeat(op, av, f)]
+    if len(wild) >= 2:
+        issues.append(("chained_wildcards", "warning",
+                       "several unbounded wildcards in sequence backtrack against each other"))
+    if wild and wild[-1] == len(items) - 1 and items[-1][2] & re.DOTALL:
+        issues.append(("wildcard_to_end", "warning",
+                       "ends in an unbounded wildcard under DOTALL and runs to the end of the document"))
+    return issues
+
+
+def _literals(seq) -> List[str]:
+    """Literal runs in the pattern, used to build inputs the pattern partially matches."""
+    runs: List[str] = []
+    cur: List[str] = []
+    for op, av in seq:
+        if op == _sre.LITERAL:
+            cur.append(chr(av))
+            continue
+        if cur:
+            runs.append("".join(cur))
+            cur = []
+        if op in _REPEATS:
+            runs.extend(_literals(av[2]))
+        elif op == _sre.SUBPATTERN:
+            runs.extend(_literals(av[-1]))
+        elif op == _sre.BRANCH:
+            for b in av[1]:
+                runs.extend(_literals(b))
+    if cur:
+        runs.append("".join(cur))
+    return [r for r in runs if r.strip()]
+
+
+def _probe_inputs(parsed, size: int) -> List[str]:
+    seeds = ["a", "a ", "1", " ", "aA1 -:"]
+    lits = _literals(parsed)
+    seeds += [lit + " " for lit in lits[:4]]
+    if lits:
+        seeds.append(" 1 ".join(lits) + " ")
+    return [(seed * (size // len(seed) + 1))[:size] + "\x00" for seed in seeds]
+
+
+def _time_search(pattern: str, text: str, flags: int) -> float:
+    t0 = time.perf_counter()
+    bounded_search(pattern, text, flags, _PROBE_BUDGET)
+    return time.perf_counter() - t0
+
+
+def _probe(pattern: str, flags: int, parsed) -> List[Tuple[str, str, str]]:
+    """Time searches on growing worst-case inputs and flag super-linear growth.
+
+    Sizes start tiny and the probe stops at the first bad step, so an
+    exponential pattern is caught before an input large enough to hang on.
+    Wall-clock timings can be thrown off by a busy machine, so a suspect step
+    is timed again (best of _RETIMES) before it counts, and the probe only
+    ever reports warnings: errors come from the static checks alone.
+    """
+    seeds = len(_probe_inputs(parsed, 1))
+    worst = 0.0
+    for k in range(seeds):
+        prev = None
+        for n in _PROBE_SIZES:
+            text = _probe_inputs(parsed, n)[k]
+            try:
+                elapsed = _time_search(pattern, text, flags)
+                if prev is not None and prev[1] >= _MIN_TIMED and elapsed / prev[1] > (n / prev[0]) ** _SUPER_LINEAR_EXPONENT:
+                    elapsed = min([elapsed] + [_time_search(pattern, text, flags) for _ in range(_RETIMES - 1)])
+            except RegexTimeout:
+                return [("probe_timeout", "warning",
+                         f"search on a {n}-char synthetic input exceeded {_PROBE_BUDGET.timeout}s")]
+            if prev is not None and prev[1] >= _MIN_TIMED:
+                exponent = math.log(max(elapsed, 1e-9) / prev[1]) / math.log(n / prev[0])
+                if exponent > _EXPONENTIAL:
+                    return [("exponential", "warning",
+                             f"search time grows ~n^{exponent:.0f} between {prev[0]} and {n} chars")]
+                worst = max(worst, exponent)
+                if exponent > _SUPER_LINEAR_EXPONENT:
+                    break
+            if elapsed > _PROBE_BUDGET.timeout:
+                break
+            prev = (n, elapsed)
+    if worst > _SUPER_LINEAR_EXPONENT:
+        return [("super_linear", "warning",
+                 f"search time grows ~n^{worst:.1f} on synthetic worst-case input")]
+    return []
+
+
+@lru_cache(maxsize=512)
+def lint_pattern(pattern: str, flags: int = 0) -> Tuple[Tuple[str, str, str], ...]:
+    """Return (code, severity, message) tuples for one pattern. Cached per pattern."""
+    try:
+        parsed = _sre_parse.parse(pattern, flags)
+    except re.error as e:
+        return (("invalid", "error", f"does not compile: {e}"),)
+    flags = flags | parsed.state.flags
+    issues = _static_issues(parsed, flags)
+    # Patterns already known to backtrack badly are not executed: stdlib re cannot be interrupted
+    if not any(sev == "error" for _, sev, _ in issues):
+        issues += _probe(pattern, flags, parsed)
+    return tuple(issues)
+
+
+def lint_schema(schema: Dict[str, Any]) -> List[RegexLintIssue]:
+    """Lint every extract.regex and validate pattern declared by a schema."""
+    issues: List[RegexLintIssue] = []
+    for key, fdef in (schema.get("fields") or {}).items():
+        targets: List[Tuple[str, str, int]] = []
+        ex = fdef.get("extract", {})
+        if isinstance(ex, dict) and isinstance(ex.get("regex"), str) and ex.get("regex"):
+            # extract_with_regex searches with IGNORECASE | MULTILINE
+            targets.append(("extract.regex", ex["regex"], re.IGNORECASE | re.MULTILINE))
+        for rule in fdef.get("validate") or []:
+            if isinstance(rule, dict) and rule.get("type") == "regex" and rule.get("pattern"):
+                targets.append(("validate", rule["pattern"], 0))
+        for where, pattern, flags in targets:
+            for code, severity, message in lint_pattern(pattern, flags):
+                issues.append(RegexLintIssue(key, where, pattern, code, severity, message))
+    return issues
+
+
+def check_schema_regexes(schema: Dict[str, Any], mode: str = "error", source: str = "schema") -> List[RegexLintIssue]:
+    """Lint a schema and act on the result.
+
+    mode "warn" logs every issue; "error" also raises ValueError when any issue
+    has error severity; "off" skips the lint.
+    """
+    if mode == "off":
+        return []
+    issues = lint_schema(schema)
+    for issue in issues:
+        logger.warning("%s: field %r %s %s (%s): %s", source, issue.field, issue.where,
+                       issue.code, issue.severity, issue.pattern)
+    errors = [i for i in issues if i.severity == "error"]
+    if mode == "error" and errors:
+        detail = "; ".join(f"{i.field} {i.where}: {i.message}" for i in errors)
+        raise ValueError(f"Slow or invalid regex in {source}: {detail}")
+    return issues
@@ -1,15 +1,19 @@
 from __future__ import annotations
-from typing import Dict, Any
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
 import fitz
 
+from schema_loader import schema_hash
+from text_layout import font_resource, layout_text
 
-def _schema_box_to_rect(page: fitz.Page, box: Dict[str, float], transform: Dict[str, float]) -> fitz.Rect:
+
+def schema_box_to_rect(page_height: float, box: Dict[str, float], transform: Dict[str, float]) -> fitz.Rect:
     """Convert a schema box (x,y from top-left) to a fitz.Rect with transform applied."""
     x = (box["x"] + transform.get("dx", 0.0)) * transform.get("scale", 1.0)
     y_top = (box["y"] + transform.get("dy", 0.0)) * transform.get("scale", 1.0)
     # Convert top-origin y to bottom-origin y for fitz
-    page_h = page.rect.height
-    y = page_h - y_top
+    y = page_height - y_top
     w = box["w"] * transform.get("scale", 1.0)
     h = box.get("h", 14) * transform.get("scale", 1.0)
     # fitz.Rect expects bottom-left origin with y increasing upwards
@@ -17,6 +21,134 @@ def _schema_box_to_rect(page: fitz.Page, box: Dict[str, float], transform: Dict[
     return fitz.Rect(x, y - h, x + w, y)
 
 
+@dataclass(frozen=True)
+class FieldRender:
+    """Everything needed to draw one field: its final rect, font and overflow policy."""
+    key: str
+    rect: fitz.Rect  # page coordinates, transform applied
+    fontname: str
+    font: fitz.Font
+    size: float  # the font size, and the largest autoshrink tries
+    leading: float
+    mode: str  # "wrap" or "autoshrink_min"
+    min_size: float
+    max_lines: int = 0  # 0: as many as the box holds
+    ellipsis: bool = False
+
+
+def field_render(key: str, render_def: Dict[str, Any], transform: Dict[str, float], page_height: float) -> FieldRender:
+    """Resolve a field's `render` block (box, font, overflow) against a transform and page."""
+    font = render_def.get("font") or {}
+    overflow = render_def.get("overflow") or {}
+    fontname = font.get("name", "helv")
+    size = float(font.get("size", 11))
+    return FieldRender(
+        key=key,
+        rect=schema_box_to_rect(page_height, render_def.get("box", {}), transform),
+        fontname=fontname,
+        font=font_resource(fontname),
+        size=size,
+        leading=float(font.get("leading", size + 1)),
+        mode=overflow.get("mode", "autoshrink_min"),
+        min_size=float(overflow.get("min_size", size)),
+        max_lines=int(overflow.get("max_lines", 0) or 0),
+        ellipsis=bool(overflow.get("ellipsis", False)),
+    )
+
+
+@dataclass(frozen=True)
+class RenderPlan:
+    """A schema's fields resolved for one template page and calibration transform.
+
+    Built once per (schema fields, transform, page height) by `render_plan`;
+    the cover generator and the preview both draw from it.
+    """
+    transform: Dict[str, float]
+    page_height: float
+    fields: Dict[str, FieldRender]  # fields with a render block, in schema order
+
+    def draw(self, page: fitz.Page, key: str, text: str) -> None:
+        """Draw `text` into field `key`'s box; fields without a render block are skipped."""
+        field = self.fields.get(key)
+        if field is not None:
+            draw_field(page, field, text)
+
+    def draw_all(
+        self,
+        page: fitz.Page,
+        values: Dict[str, str],
+        outlines: Optional[Dict[str, Tuple[float, float, float]]] = None,
+    ) -> None:
+        """Draw every field's value in one batch.
+
+        The boxes in `outlines` ({field: stroke color}) go into one shape and
+        all the text into one TextWriter, so the page gets two content-stream
+        fragments however many fields there are. Outlines are drawn under the text.
+        """
+        if outlines:
+            shape = page.new_shape()
+            for key, color in outlines.items():
+                field = self.fields.get(key)
+                if field is not None:
+                    shape.draw_rect(field.rect)
+                    shape.finish(color=color, width=0.8)
+            shape.commit()
+        writer = fitz.TextWriter(page.rect)
+        for key, text in values.items():
+            field = self.fields.get(key)
+            if field is not None:
+                write_field(writer, field, text)
+        writer.write_text(page, color=(0, 0, 0))
+
+
+_PLANS: Dict[Tuple[Any, ...], RenderPlan] = {}
+_plans_lock = threading.Lock()
+
+
+def render_plan(schema: Dict[str, Any], transform: Dict[str, float], page_height: float) -> RenderPlan:
+    """The RenderPlan for a schema on a page of `page_height` points, cached."""
+    fields = schema.get("fields", {}) or {}
+    placement = tuple(float(transform.get(k, d)) for k, d in (("dx", 0.0), ("dy", 0.0), ("scale", 1.0)))
+    key = (schema_hash({k: (f or {}).get("render") for k, f in fields.items()}), placement, round(float(page_height), 3))
+    with _plans_lock:
+        plan = _PLANS.get(key)
+        if plan is None:
+            plan = RenderPlan(
+                transform=dict(transform),
+                page_height=float(page_height),
+                fields={
+                    k: field_render(k, (f or {})["render"], transform, page_height)
+                    for k, f in fields.items() if (f or {}).get("render")
+                },
+            )
+            _PLANS[key] = plan
+    return plan
+
+
+def write_field(writer: fitz.TextWriter, field: FieldRender, text: str) -> None:
+    """Append text laid out in a field's box (see text_layout.layout_text) to `writer`.
+
+    'wrap' fields wrap to the box (honouring max_lines and ellipsis); others
+    are one line shrunk to fit the width, on the box's bottom edge.
+    """
+    rect = field.rect
+    layout = layout_text(
+        str(text or ""), field.fontname, field.size, field.leading, rect.width, rect.height,
+        field.mode, field.min_size, field.max_lines, field.ellipsis,
+    )
+    for i, line in enumerate(layout.lines):
+        if line:
+            pos = fitz.Point(rect.x0, rect.y0 + layout.first_baseline + i * layout.leading)
+            writer.append(pos, line, font=field.font, fontsize=layout.size)
+
+
+def draw_field(page: fitz.Page, field: FieldRender, text: str) -> None:
+    """Draw one field's text; RenderPlan.draw_all batches many."""
+    writer = fitz.TextWriter(page.rect)
+    write_field(writer, field, text)
+    writer.write_text(page, color=(0, 0, 0))
+
+
 def draw_text_in_box(
     page: fitz.Page,
     text: str,
@@ -28,44 +160,8 @@ def draw_text_in_box(
     """Render text inside a box with autoshrink and optional wrap.
 
     - Schema coords are x,y from top-left.
-    - overflow.mode: 'wrap' or 'autoshrink_min'
-    - For 'wrap', use insert_textbox. For single-line, try shrinking to fit width.
+    - overflow.mode: 'wrap' or 'autoshrink_min'; also min_size, max_lines, ellipsis
+    Drawing many fields is cheaper through a RenderPlan, which resolves boxes and fonts once.
     """
-    rect = _schema_box_to_rect(page, box, transform)
-    fontname = font.get("name", "helv")
-    leading = font.get("leading", font.get("size", 11) + 1)
-    max_size = float(font.get("size", 11))
-    mode = (overflow or {}).get("mode", "autoshrink_min")
-    min_size = float((overflow or {}).get("min_size", max_size))
-
-    text = str(text or "").replace("\r", " ").replace("\t", " ").strip()
-
-    if mode == "wrap":
-        # render wrapped into the rectangle; fitz will clip extra lines
-        page.insert_textbox(
-            rect,
-            text,
-            fontname=fontname,
-            fontsize=max_size,
-            align=0,
-            lineheight=leading / max_size if max_size else 1.2,
-        )
-        return
-
-    # single-line autoshrink to fit width
-    size = max_size
-    while size >= min_size:
-        # Use module-level get_text_length (Page method not available in this PyMuPDF)
-        tw = fitz.get_text_length(text, fontname=fontname, fontsize=size)
-        if tw <= rect.width - 0.5:  # small tolerance
-            break
-        size -= 0.5
-    # Align to baseline at rect top (since rect defined from top-left schema)
-    # We'll place text at left, vertically within rect from its top
-    page.insert_text(
-        fitz.Point(rect.x0, rect.y1),
-        text,
-        fontname=fontname,
-        fontsize=size,
-        color=(0, 0, 0),
-    )
+    render_def = {"box": box, "font": font, "overflow": overflow}
+    draw_field(page, field_render("", render_def, transform, page.rect.height), text)
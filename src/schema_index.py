@@ -0,0 +1,160 @@
+from __future__ import annotations
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import fitz
+
+from anchor_index import AnchorIndex, normalize_phrase
+from layout import analyze_layout
+from schema_loader import list_schemas, load_schema, schema_hash, template_path
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_GRID = 16  # the page is cut into GRID x GRID cells for positions
+MIN_ANCHOR_LETTERS = 4  # shorter printed lines (page numbers, "FOR:") are too common to count
+MIN_MATCH_SHARE = 0.6  # share of a template's lines a page must show in place to match
+
+Cell = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class SchemaFingerprint:
+    """What a schema's template page looks like before it is filled in.
+
+    `anchors` maps each printed line of the template page (normalized) to the
+    grid cell it starts in; `layout` is a hash of that map. `required` is the
+    calibration anchor text, which a matching page must contain.
+    """
+    name: str  # schema file name under mappings/
+    anchors: Dict[str, Cell]
+    layout: str
+    required: str
+
+
+def _cell(w: Dict[str, Any], bbox: Tuple[float, float, float, float]) -> Cell:
+    width, height = w.get("page_size") or (1.0, 1.0)
+    x0, y0, _, y1 = bbox
+    top = height - y1 if w.get("origin") == "bottom" else y0
+    clamp = lambda v: min(FINGERPRINT_GRID - 1, max(0, int(v * FINGERPRINT_GRID)))
+    return clamp(x0 / (width or 1.0)), clamp(top / (height or 1.0))
+
+
+def _page_words(pdf_path: Union[str, Path], page: int = 0) -> List[Dict[str, Any]]:
+    """Text-layer words of one page, shaped like word_index's."""
+    doc = fitz.open(str(pdf_path))
+    try:
+        if page >= len(doc):
+            return []
+        p = doc[page]
+        size = (p.rect.width, p.rect.height)
+        return [
+            {"text": t, "bbox": (x0, y0, x1, y1), "conf": 0.9, "page": page, "page_size": size, "doc": str(pdf_path)}
+            for x0, y0, x1, y1, t, *_ in p.get_text("words")
+        ]
+    finally:
+        doc.close()
+
+
+def page_fingerprint(name: str, words: List[Dict[str, Any]], required: str = "") -> SchemaFingerprint:
+    """Fingerprint of a blank template page's words (one page)."""
+    anchors: Dict[str, Cell] = {}
+    for layout in analyze_layout(words):
+        for line in layout.lines:
+            text = normalize_phrase(line.text)
+            if sum(c.isalpha() for c in text) >= MIN_ANCHOR_LETTERS and text not in anchors:
+                anchors[text] = _cell(words[line.words[0]], line.bbox)
+    layout_hash = hashlib.sha1(repr(sorted(anchors.items())).encode("utf-8")).hexdigest()
+    return SchemaFingerprint(name, anchors, layout_hash, normalize_phrase(required))
+
+
+_FINGERPRINTS: Dict[Tuple[str, str], SchemaFingerprint] = {}
+
+
+def schema_fingerprint(name: str, schema: Dict[str, Any]) -> Optional[SchemaFingerprint]:
+    """Fingerprint of a schema's template page, or None when it names no template file.
+
+    Cached by the schema's content and the template file's bytes.
+    """
+    path = template_path(schema)
+    if path is None:
+        return None
+    key = (schema_hash(schema), hashlib.sha1(path.read_bytes()).hexdigest())
+    found = _FINGERPRINTS.get(key)
+    if found is None:
+        page = int((schema.get("template") or {}).get("page", 1)) - 1
+        required = (schema.get("calibration") or {}).get("anchor_text", "")
+        found = page_fingerprint(name, _page_words(path, page), required)
+        _FINGERPRINTS[key] = found
+    return found
+
+
+class SchemaIndex:
+    """Matches a page to the schema whose template it follows, in one pass.
+
+    The printed lines of every template go into one AnchorIndex, so a page is
+    scanned once whatever the number of schemas. A schema matches when the
+    page contains its calibration anchor text and most of its template lines
+    sit in (or next to) the cell they occupy on the template; the best share
+    wins.
+    """
+
+    def __init__(self, fingerprints: List[SchemaFingerprint]):
+        self.fingerprints = fingerprints
+        phrases = [p for fp in fingerprints for p in fp.anchors]
+        phrases += [fp.required for fp in fingerprints if fp.required]
+        self._anchors = AnchorIndex(phrases)
+
+    def scores(self, words: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Share of each schema's template lines found in place on the page of `words`."""
+        hits = self._anchors.scan(words)
+        cells = {
+            phrase: [_cell(words[h.first_word], h.bbox) for h in found]
+            for phrase, found in hits.items()
+        }
+        out: Dict[str, float] = {}
+        for fp in self.fingerprints:
+            if not fp.anchors or (fp.required and fp.required not in hits):
+                out[fp.name] = 0.0
+                continue
+            placed = sum(
+                1 for phrase, (cx, cy) in fp.anchors.items()
+                if any(abs(x - cx) <= 1 and abs(y - cy) <= 1 for x, y in cells.get(phrase, ()))
+            )
+            out[fp.name] = placed / len(fp.anchors)
+        return out
+
+    def identify(self, words: List[Dict[str, Any]]) -> Optional[str]:
+        """Name of the schema the page of `words` follows, or None."""
+        scores = self.scores(words)
+        best = max(scores, key=scores.get, default=None)
+        if best is None or scores[best] < MIN_MATCH_SHARE:
+            return None
+        return best
+
+
+def build_schema_index(names: Optional[List[str]] = None) -> SchemaIndex:
+    """SchemaIndex over the named schemas (default: every schema in mappings/).
+
+    Schemas without a template file are left out.
+    """
+    fingerprints: List[SchemaFingerprint] = []
+    for name in names if names is not None else list_schemas():
+        fp = schema_fingerprint(name, load_schema(name))
+        if fp is None:
+            logger.info("Schema %s names no template file; it can't be identified", name)
+            continue
+        fingerprints.append(fp)
+    return SchemaIndex(fingerprints)
+
+
+def identify_schema(pdf_paths: List[Union[str, Path]], index: Optional[SchemaIndex] = None) -> Optional[str]:
+    """Schema name matched by the first page of the first of `pdf_paths` that matches one."""
+    index = index or build_schema_index()
+    for path in pdf_paths:
+        name = index.identify(_page_words(path, 0))
+        if name:
+            return name
+    return None
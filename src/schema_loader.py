@@ -1,20 +1,46 @@
 from __future__ import annotations
+import hashlib
+import json
 import os
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 import yaml
 
+from anchor_index import AnchorIndex, schema_anchor_phrases
+from label_match import best_label_matches
+from page_index import FieldScope
+from regex_lint import check_schema_regexes
+
 _DEFAULT_SCHEMA_NAME = "bradley_cover_v1.yml"
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def list_schemas() -> List[str]:
+    """File names of the schemas in mappings/, sorted."""
+    return sorted(p.name for p in (_REPO_ROOT / "mappings").glob("*.yml"))
+
+
+def template_path(schema: Dict[str, Any]) -> Path | None:
+    """The PDF a schema's `template.file` names under templates/, if it exists."""
+    name = (schema.get("template") or {}).get("file")
+    path = _REPO_ROOT / "templates" / name if name else None
+    return path if path is not None and path.exists() else None
 
 
-def load_schema(name: str | None = None) -> Dict[str, Any]:
+def load_schema(name: str | None = None, lint: str = "error") -> Dict[str, Any]:
     """Load a YAML schema from mappings/ directory.
 
     If name is None, loads the default bradley cover schema.
     Returns a dict with keys: template, calibration, fields.
+    Regexes are linted for catastrophic backtracking (see regex_lint). With
+    lint="error" a pattern the static checks show to backtrack badly raises
+    ValueError; the timing probes, which catch what those checks can't (e.g.
+    a large bounded repeat), only warn. "warn" only logs and "off" skips the
+    check. A malformed search scope (pages, region; see page_index.FieldScope)
+    raises ValueError.
     """
-    repo_root = Path(__file__).resolve().parent.parent
-    mappings_dir = repo_root / "mappings"
+    mappings_dir = _REPO_ROOT / "mappings"
     if name is None:
         name = _DEFAULT_SCHEMA_NAME
     schema_path = mappings_dir / name if not name.endswith(".yml") else mappings_dir / name
@@ -24,6 +50,12 @@ def load_schema(name: str | None = None) -> Dict[str, Any]:
         data = yaml.safe_load(f)
     if not isinstance(data, dict) or "fields" not in data:
         raise ValueError(f"Invalid schema format in {schema_path}")
+    check_schema_regexes(data, lint, source=str(schema_path.name))
+    for key, fdef in data["fields"].items():
+        try:
+            FieldScope.from_extract((fdef or {}).get("extract", {}))
+        except ValueError as e:
+            raise ValueError(f"{schema_path.name}: field {key}: {e}") from None
     return data
 
 
@@ -31,6 +63,59 @@ def get_field_defs(schema: Dict[str, Any]) -> Dict[str, Any]:
     return schema.get("fields", {})
 
 
+def schema_hash(schema: Dict[str, Any]) -> str:
+    """Stable content hash of a schema (or any part of one)."""
+    blob = json.dumps(schema, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()
+
+
+@dataclass
+class CompiledSchema:
+    """Per-schema state derived once and shared by every extraction run."""
+    schema: Dict[str, Any]
+    hash: str
+    anchors: AnchorIndex
+    labels: Dict[str, Tuple[str, float]]  # field -> (closest label synonym, score)
+
+
+_COMPILED: Dict[str, CompiledSchema] = {}
+
+
+def compile_schema(schema: Dict[str, Any]) -> CompiledSchema:
+    """Compile a loaded schema, reusing the previous result for identical content."""
+    h = schema_hash(schema)
+    compiled = _COMPILED.get(h)
+    if compiled is None:
+        fields = schema.get("fields") or {}
+        labels = best_label_matches({k: list((fdef or {}).get("label_synonyms") or []) for k, fdef in fields.items()})
+        compiled = CompiledSchema(schema, h, AnchorIndex(schema_anchor_phrases(schema)), labels)
+        _COMPILED[h] = compiled
+    return compiled
+
+
+@dataclass
+class CompiledSchemaSet:
+    """Several compiled schemas plus one anchor automaton over all their phrases."""
+    schemas: List[CompiledSchema]
+    hash: str
+    anchors: AnchorIndex
+
+
+_COMPILED_SETS: Dict[str, CompiledSchemaSet] = {}
+
+
+def compile_schemas(schemas: List[Dict[str, Any]]) -> CompiledSchemaSet:
+    """Compile schemas to be extracted together, reusing the result for identical content."""
+    compiled = [compile_schema(s) for s in schemas]
+    h = hashlib.sha1("|".join(c.hash for c in compiled).encode("utf-8")).hexdigest()
+    found = _COMPILED_SETS.get(h)
+    if found is None:
+        phrases = [p for s in schemas for p in schema_anchor_phrases(s)]
+        found = CompiledSchemaSet(compiled, h, AnchorIndex(phrases))
+        _COMPILED_SETS[h] = found
+    return found
+
+
 def apply_postprocess(value: str, steps: list[str] | None) -> str:
     if value is None:
         return ""
@@ -0,0 +1,174 @@
+from __future__ import annotations
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from layout import PageLayout
+from pattern_scan import RegexBudget, bounded_search
+
+Box = Tuple[float, float, float, float]
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(ch: str) -> str:
+    # casefold, unless that would change the length ("ß" -> "ss")
+    for folded in (ch.casefold(), ch.lower()):
+        if len(folded) == 1:
+            return folded
+    return ch
+
+
+def fold(text: str) -> str:
+    """Case-folded copy of `text` with the same length, so offsets carry over."""
+    if text.isascii():
+        return text.lower()
+    return "".join(map(_fold_char, text))
+
+
+def _same_line(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    ax0, ay0, ax1, ay1 = a.get("bbox", (0, 0, 0, 0))
+    bx0, by0, bx1, by1 = b.get("bbox", (0, 0, 0, 0))
+    # Compared relative to each other, so it holds for top- and bottom-origin boxes alike
+    return abs((ay0 + ay1) - (by0 + by1)) / 2 <= max(ay1 - ay0, by1 - by0) / 2
+
+
+def _list_sequence(words: List[Dict[str, Any]]) -> Iterator[Tuple[int, str]]:
+    """(word index, separator before it) for words taken in list order."""
+    prev: Optional[Dict[str, Any]] = None
+    for i, w in enumerate(words):
+        if prev is None:
+            sep = ""
+        elif (w.get("doc"), w.get("page", 0)) != (prev.get("doc"), prev.get("page", 0)):
+            sep = "\n\n"
+        else:
+            sep = " " if _same_line(prev, w) else "\n"
+        yield i, sep
+        prev = w
+
+
+def _layout_sequence(layouts: List[PageLayout]) -> Iterator[Tuple[int, str]]:
+    """(word index, separator before it) following analyzed lines and blocks."""
+    sep = ""
+    for page in layouts:
+        for block in page.blocks:
+            for line in block.lines:
+                for i in line.words:
+                    yield i, sep
+                    sep = " "
+                sep = "\n"
+            sep = "\n\n"
+
+
+class TextMatch:
+    """A regex match over a DocumentText, with its spans mapped back to the words."""
+
+    __slots__ = ("doc", "match")
+
+    def __init__(self, doc: "DocumentText", match: "re.Match[str]"):
+        self.doc = doc
+        self.match = match
+
+    def group(self, group=0) -> Optional[str]:
+        return self.match.group(group)
+
+    def groups(self) -> Tuple[Optional[str], ...]:
+        return self.match.groups()
+
+    def groupdict(self) -> Dict[str, Optional[str]]:
+        return self.match.groupdict()
+
+    def span(self, group=0) -> Tuple[int, int]:
+        return self.match.span(group)
+
+    def words(self, group=0) -> List[int]:
+        """Indexes of the words under the group's span, in text order."""
+        start, end = self.match.span(group)
+        return self.doc.word_range(start, end) if start >= 0 else []
+
+    def locate(self, group=0) -> Optional[Tuple[int, Box]]:
+        """(page, union bbox) of the group's words; see DocumentText.locate."""
+        start, end = self.match.span(group)
+        return self.doc.locate(start, end) if start >= 0 else None
+
+
+class DocumentText:
+    """A document's words as one normalized text, with offsets mapping back to the words.
+
+    Words are NFKC-normalized and joined with spaces within a line, newlines
+    between lines and blank lines between blocks and pages; a word hyphenated
+    across a line break is joined back together. Lines and blocks come from
+    `layouts` (see layout.analyze_layout) when given, otherwise words are
+    taken in list order and a new line starts wherever the next word isn't
+    level with the last. `folded` is a case-folded copy of the same length,
+    for case-insensitive matching without IGNORECASE. Any offset resolves to
+    its word, page and box by binary search.
+    """
+
+    def __init__(self, words: List[Dict[str, Any]], layouts: Optional[List[PageLayout]] = None):
+        self.words = words
+        parts: List[str] = []
+        self._ids: List[int] = []  # word index of each piece, in text order
+        self._starts: List[int] = []  # text offset where each piece starts
+        self._ends: List[int] = []
+        pos = 0
+        sequence = _layout_sequence(layouts) if layouts is not None else _list_sequence(words)
+        for i, sep in sequence:
+            t = unicodedata.normalize("NFKC", str(words[i].get("text", "")))
+            t = " ".join(t.split())
+            if parts:
+                if sep == "\n" and parts[-1][-2:-1].isalpha() and parts[-1].endswith("-") and t[:1].islower():
+                    # "descrip-" / "tion": drop the hyphen and the break
+                    parts[-1] = parts[-1][:-1]
+                    pos -= 1
+                    self._ends[-1] = pos
+                    sep = ""
+                parts.append(sep)
+                pos += len(sep)
+            self._ids.append(i)
+            self._starts.append(pos)
+            parts.append(t)
+            pos += len(t)
+            self._ends.append(pos)
+        self.text = "".join(parts)
+        self.folded = fold(self.text)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    def word_at(self, offset: int) -> Optional[int]:
+        """Index of the word covering `offset`, or None for a separator."""
+        k = bisect_right(self._starts, offset) - 1
+        if k >= 0 and offset < self._ends[k]:
+            return self._ids[k]
+        return None
+
+    def word_range(self, start: int, end: int) -> List[int]:
+        """Indexes of the words overlapping text[start:end], in text order."""
+        first = bisect_right(self._ends, start)
+        last = bisect_left(self._starts, end)
+        return self._ids[first:max(first, last)]
+
+    def locate(self, start: int, end: int) -> Optional[Tuple[int, Box]]:
+        """(page, union bbox) of the words under text[start:end] on the first word's page."""
+        span = self.word_range(start, end)
+        if not span:
+            return None
+        page = self.words[span[0]].get("page", 0)
+        boxes = [self.words[i].get("bbox", (0, 0, 0, 0)) for i in span if self.words[i].get("page", 0) == page]
+        return page, (
+            min(b[0] for b in boxes), min(b[1] for b in boxes),
+            max(b[2] for b in boxes), max(b[3] for b in boxes),
+        )
+
+    def search(self, pattern: str, flags: int = 0, budget: Optional[RegexBudget] = None,
+               pos: int = 0) -> Optional[TextMatch]:
+        """bounded_search over the normalized text from `pos`, its spans mapped back to the words."""
+        m = bounded_search(pattern, self.text, flags, budget, pos)
+        return TextMatch(self, m) if m else None
+
+    def find(self, phrase: str, start: int = 0) -> int:
+        """Case-insensitive offset of `phrase` (normalized like the text), or -1."""
+        needle = fold(" ".join(unicodedata.normalize("NFKC", phrase).split()))
+        return self.folded.find(needle, start) if needle else -1
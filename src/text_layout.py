@@ -0,0 +1,165 @@
+from __future__ import annotations
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, List, Tuple
+import fitz
+
+ELLIPSIS = "..."  # three periods: every base-14 font encodes them
+WIDTH_TOLERANCE = 0.5  # points a line must stay clear of the box's right edge
+SIZE_STEP = 0.5  # wrapped text shrinks in steps of this many points
+
+
+@lru_cache(maxsize=32)
+def font_resource(fontname: str) -> fitz.Font:
+    """The fitz.Font for a base-14 font name (e.g. "helv"), loaded once."""
+    return fitz.Font(fontname)
+
+
+class FontMetrics:
+    """Advance widths of one font at size 1, per character, looked up once each."""
+
+    def __init__(self, font: fitz.Font):
+        self.font = font
+        self.ascender = font.ascender
+        self.descender = font.descender
+        self._advances: Dict[str, float] = {}
+
+    def advance(self, ch: str) -> float:
+        adv = self._advances.get(ch)
+        if adv is None:
+            adv = self.font.glyph_advance(ord(ch))
+            self._advances[ch] = adv
+        return adv
+
+    def width(self, text: str, size: float = 1.0) -> float:
+        """Width of `text` at `size` points (base-14 fonts have no kerning)."""
+        return size * sum(self.advance(ch) for ch in text)
+
+    def fit_prefix(self, text: str, size: float, width: float) -> int:
+        """Length of the longest prefix of `text` no wider than `width`."""
+        edges = list(accumulate(size * self.advance(ch) for ch in text))
+        return bisect_right(edges, width)
+
+
+@lru_cache(maxsize=32)
+def font_metrics(fontname: str) -> FontMetrics:
+    return FontMetrics(font_resource(fontname))
+
+
+@dataclass(frozen=True)
+class TextLayout:
+    """Lines of text placed in a box: draw line i at baseline first_baseline + i * leading."""
+    lines: Tuple[str, ...]
+    size: float
+    leading: float
+    first_baseline: float  # offset from the box's top edge
+    truncated: bool  # lines were dropped or cut to fit
+
+
+def _ellipsize(line: str, metrics: FontMetrics, size: float, width: float) -> str:
+    """`line` cut so that it plus ELLIPSIS fits in `width`."""
+    room = width - metrics.width(ELLIPSIS, size)
+    if room <= 0:
+        return ""
+    return line[:metrics.fit_prefix(line, size, room)].rstrip() + ELLIPSIS
+
+
+def wrap_lines(text: str, metrics: FontMetrics, size: float, width: float) -> List[str]:
+    """Greedy word wrap of `text` at `size`; explicit newlines are kept.
+
+    A word wider than the whole line is split where it overflows.
+    """
+    space = metrics.width(" ", size)
+    lines: List[str] = []
+    for paragraph in text.split("\n"):
+        line, line_w = "", 0.0
+        for word in paragraph.split():
+            w = metrics.width(word, size)
+            if line and line_w + space + w <= width:
+                line, line_w = f"{line} {word}", line_w + space + w
+                continue
+            if line:
+                lines.append(line)
+            while w > width and len(word) > 1:
+                cut = max(1, metrics.fit_prefix(word, size, width))
+                lines.append(word[:cut])
+                word = word[cut:]
+                w = metrics.width(word, size)
+            line, line_w = word, w
+        lines.append(line)
+    return lines
+
+
+def _lines_that_fit(metrics: FontMetrics, size: float, leading: float, height: float) -> int:
+    """How many lines of `size` text, `leading` apart, fit in `height` (at least one)."""
+    text_height = (metrics.ascender - metrics.descender) * size
+    return max(1, int(math.floor((height - text_height) / leading)) + 1) if leading > 0 else 1
+
+
+@lru_cache(maxsize=4096)
+def layout_text(
+    text: str,
+    fontname: str,
+    size: float,
+    leading: float,
+    width: float,
+    height: float,
+    mode: str = "autoshrink_min",
+    min_size: float = 0.0,
+    max_lines: int = 0,
+    ellipsis: bool = False,
+) -> TextLayout:
+    """Fit `text` into a width x height box; memoized on all arguments.
+
+    - "wrap": word-wrapped, at most `max_lines` lines (0: as many as the box
+      holds). When `min_size` is below `size` the largest size in SIZE_STEP
+      steps whose wrapping fits is found by binary search. Lines that still
+      don't fit are dropped; with `ellipsis` the last kept line ends in "...".
+    - anything else: a single line, shrunk (down to `min_size`) to the size at
+      which it just fits the width. If it is still too wide at `min_size` it
+      is cut with "..." when `ellipsis` is set, else left to overflow.
+    """
+    metrics = font_metrics(fontname)
+    avail = width - WIDTH_TOLERANCE
+    min_size = min(min_size or size, size)
+    text = str(text or "").replace("\r", " ").replace("\t", " ").strip()
+
+    if mode != "wrap":
+        line = " ".join(text.split())
+        natural = metrics.width(line)
+        fit = size if natural <= 0 else min(size, avail / natural)
+        fit = max(min_size, fit)
+        truncated = ellipsis and natural * fit > avail
+        if truncated:
+            line = _ellipsize(line, metrics, fit, avail)
+        # Baseline on the box's bottom edge
+        return TextLayout((line,), fit, leading, height, truncated)
+
+    def allowed(s: float) -> int:
+        lead = leading * s / size  # leading scales with the font
+        n = _lines_that_fit(metrics, s, lead, height)
+        return min(n, max_lines) if max_lines else n
+
+    fit = size
+    if min_size < size and len(wrap_lines(text, metrics, size, avail)) > allowed(size):
+        # Binary search over sizes min_size + k * SIZE_STEP for the largest that fits
+        lo, hi = 0, int((size - min_size) / SIZE_STEP)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            s = min_size + mid * SIZE_STEP
+            if len(wrap_lines(text, metrics, s, avail)) <= allowed(s):
+                lo = mid
+            else:
+                hi = mid - 1
+        fit = min_size + lo * SIZE_STEP
+    lines = wrap_lines(text, metrics, fit, avail)
+    n = allowed(fit)
+    truncated = len(lines) > n
+    if truncated:
+        lines = lines[:n]
+        if ellipsis:
+            lines[-1] = _ellipsize(lines[-1], metrics, fit, avail)
+    return TextLayout(tuple(lines), fit, leading * fit / size, metrics.ascender * fit, truncated)
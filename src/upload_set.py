@@ -0,0 +1,125 @@
+from __future__ import annotations
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from extract import FieldCandidate, FieldValue
+from extract_cache import DocumentInput, ExtractionMemo, InputLoader, document_hash, extract_documents
+from instrument_scan import RecordedInstrument, merge_instruments
+from progress import ProgressEvent, ProgressHook, iter_progress
+
+
+@dataclass
+class UploadedDocument:
+    doc_id: str  # unique within the set; the file name unless that is taken
+    name: str
+    doc_hash: str
+    data: bytes
+    temp_path: str
+
+
+def _parse_document(pdf_path: str, use_ocr: bool, progress: Optional[ProgressHook] = None) -> InputLoader:
+    def _load() -> Tuple[List[Dict[str, Any]], str]:
+        from parser import PDFParser
+        from word_index import collect_words_from_sources
+        text = PDFParser(pdf_path, use_ocr=use_ocr, progress=progress).extract_text()
+        words = collect_words_from_sources([pdf_path], prefer_ocr=use_ocr, progress=progress)
+        return words, text
+    return _load
+
+
+class UploadSet:
+    """A client's uploaded documents, with extraction state kept per document.
+
+    `sync` saves only files it has not seen (by content hash) and forgets files
+    no longer present. `extract` parses and scans only documents without cached
+    candidates, then re-merges from every document's candidates.
+    """
+
+    def __init__(self, temp_dir: Optional[str] = None):
+        self.temp_dir = temp_dir
+        self.memo = ExtractionMemo(instruments=True)  # `instruments` reuses what `extract` parsed
+        self._docs: Dict[str, UploadedDocument] = {}  # by content hash, in upload order
+
+    @property
+    def documents(self) -> List[UploadedDocument]:
+        return list(self._docs.values())
+
+    def add(self, name: str, data: bytes) -> UploadedDocument:
+        h = document_hash(data)
+        if h in self._docs:
+            return self._docs[h]
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf", dir=self.temp_dir) as tmp:
+            tmp.write(data)
+        taken = {d.doc_id for d in self._docs.values()}
+        doc_id, n = name, 2
+        while doc_id in taken:
+            doc_id, n = f"{name} ({n})", n + 1
+        doc = UploadedDocument(doc_id, name, h, data, tmp.name)
+        self._docs[h] = doc
+        return doc
+
+    def remove(self, doc_hash: str) -> None:
+        doc = self._docs.pop(doc_hash, None)
+        if doc is None:
+            return
+        self.memo.forget(doc_hash)
+        try:
+            os.unlink(doc.temp_path)
+        except OSError:
+            pass
+
+    def sync(self, files: Iterable[Tuple[str, bytes]]) -> Tuple[List[str], List[str]]:
+        """Make the set match `files` (name, bytes). Returns (added ids, removed ids)."""
+        seen: List[str] = []
+        added: List[str] = []
+        for name, data in files:
+            before = len(self._docs)
+            doc = self.add(name, data)
+            seen.append(doc.doc_hash)
+            if len(self._docs) != before:
+                added.append(doc.doc_id)
+        removed = [d.doc_id for h, d in self._docs.items() if h not in seen]
+        for h in [h for h in self._docs if h not in seen]:
+            self.remove(h)
+        # Keep upload order matching the caller's list
+        self._docs = {h: self._docs[h] for h in dict.fromkeys(seen)}
+        return added, removed
+
+    def extract(
+        self,
+        schema: Dict[str, Any],
+        use_ocr: bool = False,
+        progress: Optional[ProgressHook] = None,
+    ) -> Tuple[Dict[str, FieldValue], Dict[str, Dict[str, List[FieldCandidate]]]]:
+        """Merged fields plus per-document candidates; see extract_cache.extract_documents.
+
+        With OCR on, low-confidence zones are also re-read from high-DPI crops.
+        """
+        docs = [DocumentInput(d.doc_id, d.doc_hash, _parse_document(d.temp_path, use_ocr, progress)) for d in self.documents]
+        zone_ocr = None
+        if use_ocr:
+            from word_index import words_from_zone_ocr
+            zone_ocr = words_from_zone_ocr
+        return extract_documents(
+            docs, schema, ocr_settings={"use_ocr": use_ocr}, memo=self.memo, zone_ocr=zone_ocr, progress=progress,
+        )
+
+    def instruments(self, use_ocr: bool = False) -> List[RecordedInstrument]:
+        """Every recorded instrument the documents reference, deduplicated and sorted.
+
+        Documents already parsed by `extract` with the same `use_ocr` are not parsed again.
+        """
+        return merge_instruments(
+            self.memo.document_instruments(DocumentInput(d.doc_id, d.doc_hash, _parse_document(d.temp_path, use_ocr)), {"use_ocr": use_ocr})
+            for d in self.documents
+        )
+
+    def iter_extract(self, schema: Dict[str, Any], use_ocr: bool = False) -> Iterator[ProgressEvent]:
+        """`extract` as progress events; the final "done" event carries its result.
+
+        Page events come from parsing each new document; field events carry a
+        document's value for a field as soon as it is known.
+        """
+        return iter_progress(lambda hook: self.extract(schema, use_ocr, hook))
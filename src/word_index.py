@@ -1,34 +1,45 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Union
+from typing import List, Dict, Any, Optional, Tuple, Union
 from pathlib import Path
 import shutil
+import time
 import fitz
 
+from page_classifier import tag_page_types
+from progress import ProgressHook, emit
+
 try:
     from pdf2image.pdf2image import convert_from_path  # explicit module path
-    import pytesseract
 except Exception:
     convert_from_path = None
+try:
+    import pytesseract
+except Exception:
     pytesseract = None
 
+ZONE_OCR_DPI = 400
 
-def words_from_pdf_text_layer(pdf_path: Union[str, Path]) -> List[Dict[str, Any]]:
+
+def words_from_pdf_text_layer(pdf_path: Union[str, Path], progress: Optional[ProgressHook] = None) -> List[Dict[str, Any]]:
     """Extract word boxes using PyMuPDF's text layer (no confidence available)."""
     path = str(pdf_path)
     doc = fitz.open(path)
     words: List[Dict[str, Any]] = []
     for pno in range(len(doc)):
+        started = time.perf_counter()
         page = doc[pno]
+        size = (page.rect.width, page.rect.height)
         for w in page.get_text("words"):
             x0, y0, x1, y1, text, *_ = w
-            words.append({"text": text, "bbox": (x0, y0, x1, y1), "conf": 0.9, "page": pno})
+            words.append({"text": text, "bbox": (x0, y0, x1, y1), "conf": 0.9, "page": pno, "page_size": size})
+        emit(progress, "page", doc=path, page=pno, total=len(doc), source="words", seconds=time.perf_counter() - started)
     doc.close()
     return words
 
 
 essential_ocr_note = "ocr_unavailable"
 
-def words_from_pdf_ocr(pdf_path: Union[str, Path]) -> List[Dict[str, Any]]:
+def words_from_pdf_ocr(pdf_path: Union[str, Path], progress: Optional[ProgressHook] = None) -> List[Dict[str, Any]]:
     """Fallback OCR: rasterize pages and use Tesseract to get word boxes with confidences.
     Coordinates are converted from pixels to PDF points assuming 72 dpi baseline.
     """
@@ -41,10 +52,12 @@ def words_from_pdf_ocr(pdf_path: Union[str, Path]) -> List[Dict[str, Any]]:
         return []
     results: List[Dict[str, Any]] = []
     for idx, img in enumerate(images):
+        started = time.perf_counter()
         data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
         w_img, h_img = img.size
         # scale factor from pixels to points: at 200 dpi, 1 inch = 200 px = 72 pt => 72/200 per px
         s = 72.0 / 200.0
+        size = (w_img * s, h_img * s)
         n = len(data.get("text", []))
         for i in range(n):
             txt = data["text"][i]
@@ -61,32 +74,80 @@ def words_from_pdf_ocr(pdf_path: Union[str, Path]) -> List[Dict[str, Any]]:
                 "bbox": (x, y - h, x + w, y),
                 "conf": conf,
                 "page": idx,
+                "origin": "bottom",
+                "page_size": size,
+                "source": "ocr",
             })
+        emit(progress, "page", doc=str(pdf_path), page=idx, total=len(images), source="ocr", seconds=time.perf_counter() - started)
     return results
 
 
-def collect_words_from_sources(pdf_paths: List[Union[str, Path]], prefer_ocr: bool = False) -> List[Dict[str, Any]]:
+def words_from_zone_ocr(pdf_path: Union[str, Path], page: int, rect: Tuple[float, float, float, float], dpi: int = ZONE_OCR_DPI) -> List[Dict[str, Any]]:
+    """OCR one rectangle of a page from a high-DPI crop rendered by PyMuPDF.
+
+    `rect` is in PDF points with a top-left origin; the words come back in the
+    same page coordinates. Only the crop is rasterized, so re-reading a field's
+    zone costs a fraction of re-OCRing the document. Returns [] when OCR is
+    unavailable or fails.
+    """
+    if pytesseract is None:
+        return []
+    try:
+        from PIL import Image
+        doc = fitz.open(str(pdf_path))
+        try:
+            pg = doc[page]
+            size = (pg.rect.width, pg.rect.height)
+            clip = fitz.Rect(*rect) & pg.rect
+            if clip.is_empty:
+                return []
+            pix = pg.get_pixmap(dpi=dpi, clip=clip, alpha=False)
+            img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        finally:
+            doc.close()
+        data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+    except Exception:
+        return []
+    s = 72.0 / dpi
+    results: List[Dict[str, Any]] = []
+    for i, txt in enumerate(data.get("text", [])):
+        if not txt or not txt.strip():
+            continue
+        x = clip.x0 + data["left"][i] * s
+        y = clip.y0 + data["top"][i] * s
+        conf = float(data.get("conf", [0])[i])
+        results.append({
+            "text": txt,
+            "bbox": (x, y, x + data["width"][i] * s, y + data["height"][i] * s),
+            "conf": 0.0 if conf == -1 else conf / 100.0,
+            "page": page,
+            "doc": str(pdf_path),
+            "page_size": size,
+            "source": "ocr",
+        })
+    return results
+
+
+def collect_words_from_sources(pdf_paths: List[Union[str, Path]], prefer_ocr: bool = False, progress: Optional[ProgressHook] = None) -> List[Dict[str, Any]]:
     """Aggregate words from each PDF.
 
     - If prefer_ocr=True, try OCR first then fall back to text layer.
     - If prefer_ocr=False, try text layer first then fall back to OCR.
+    - Words carry their PDF path as "doc" and their page's "page_types".
+    - `progress` gets a "page" event per page read (source "words" or "ocr").
     """
     all_words: List[Dict[str, Any]] = []
     for p in pdf_paths:
         if prefer_ocr:
-            ocr_words = words_from_pdf_ocr(p)
-            if ocr_words:
-                all_words.extend(ocr_words)
-                continue
-            txt_words = words_from_pdf_text_layer(p)
-            all_words.extend(txt_words)
+            words = words_from_pdf_ocr(p, progress) or words_from_pdf_text_layer(p, progress)
         else:
-            txt_words = words_from_pdf_text_layer(p)
-            if txt_words:
-                all_words.extend(txt_words)
-                continue
-            ocr_words = words_from_pdf_ocr(p)
-            all_words.extend(ocr_words)
+            words = words_from_pdf_text_layer(p, progress) or words_from_pdf_ocr(p, progress)
+        # Page numbers restart in every PDF: tag each word with its source so
+        # pages of different PDFs aren't merged, and classify each PDF on its own
+        for w in words:
+            w["doc"] = str(p)
+        tag_page_types(words)
+        all_words.extend(words)
     return all_words
 
 
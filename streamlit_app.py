@@ -1,5 +1,6 @@
 import streamlit as st
 from pathlib import Path
+import os
 import sys
 import tempfile
 import io
@@ -9,11 +10,10 @@ import PyPDF2
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from cover_page_generator import BradleyAbstractCoverPage
-from parser import PDFParser
 # from field_extractor import FieldExtractor  # legacy regex extractor (unused)
 from pdf_assembler import PDFAssembler
 from schema_loader import load_schema
-from preview import render_cover_preview_png
+from preview import render_cover_preview_png, render_source_highlight_png
 
 st.set_page_config(page_title="Abstractor - Property Abstract Generator", layout="wide", page_icon="🏛️")
 
@@ -84,65 +84,78 @@ with st.sidebar:
     
     if uploaded_files and len(uploaded_files) > 0:
         if st.button("🔍 Extract Data from PDFs", type="primary", use_container_width=True):
-            with st.spinner("Extracting data from all PDFs..."):
-                try:
-                    # Save uploaded files
-                    st.session_state.uploaded_pdfs = []
-                    all_text = ""
-                    tmp_paths = []
-                    
-                    for uploaded_file in uploaded_files:
-                        # Save temporarily
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                            file_bytes = uploaded_file.read()
-                            tmp_file.write(file_bytes)
-                            tmp_path = tmp_file.name
-                        
-                        # Store file info
-                        st.session_state.uploaded_pdfs.append({
-                            'name': uploaded_file.name,
-                            'bytes': file_bytes,
-                            'temp_path': tmp_path
-                        })
-                        tmp_paths.append(tmp_path)
-                        
-                        # Parse PDF
-                        parser = PDFParser(tmp_path, use_ocr=use_ocr)
-                        text = parser.extract_text()
-                        all_text += f"\n\n=== {uploaded_file.name} ===\n{text}"
-                    # Schema-based extraction (zone + regex) with confidences
-                    from schema_loader import load_schema
-                    from word_index import collect_words_from_sources
-                    from extract import extract_fields_from_schema
+            try:
+                # Only files not already in this client's upload set are saved and parsed;
+                # files no longer uploaded drop out of the merge
+                from schema_loader import load_schema
+                from upload_set import UploadSet
+
+                if 'upload_set' not in st.session_state:
+                    st.session_state.upload_set = UploadSet()
+                upload_set = st.session_state.upload_set
+                upload_set.sync([(f.name, f.getvalue()) for f in uploaded_files])
+                st.session_state.uploaded_pdfs = [
+                    {'name': d.name, 'bytes': d.data, 'temp_path': d.temp_path}
+                    for d in upload_set.documents
+                ]
 
-                    schema = load_schema('bradley_cover_v1.yml')
-                    words = collect_words_from_sources(tmp_paths, prefer_ocr=use_ocr)
-                    fv_map = extract_fields_from_schema(words, all_text, schema)
-                    
-                    # Store in session state
-                    def _v(m, k):
-                        fv = m.get(k)
-                        return fv.value if fv else ''
-                    st.session_state.extracted_data = {
-                        'client_name': _v(fv_map, 'for_field'),
-                        'file_number': _v(fv_map, 'file_number'),
-                        'property_description': _v(fv_map, 'property_description'),
-                        'period_of_search': _v(fv_map, 'period_of_search'),
-                        'present_owners': _v(fv_map, 'present_owners'),
-                        'names_searched': 'All names searched 20 years for Federal judgments & liens',
-                        'conveyance_documents': '',
-                        'encumbrances': '',
-                        'assessment_number': '0610429400',
-                        'tax_status': 'Taxes Paid Annually'
-                    }
-                    st.session_state.field_confidences = {k: v.confidence for k, v in fv_map.items()}
-                    st.session_state.pdf_processed = True
-                    st.success("✅ Data extracted successfully! Review and edit below.")
-                    st.rerun()
-                    
-                except Exception as e:
-                    st.error(f"❌ Error extracting data: {str(e)}")
-                    st.exception(e)
+                # A document that follows a known template picks its schema; otherwise the cover schema
+                from schema_index import identify_schema
+                schema_name = identify_schema([d.temp_path for d in upload_set.documents]) or 'bradley_cover_v1.yml'
+                st.session_state.schema_name = schema_name
+                schema = load_schema(schema_name)
+                # Fields show up as each document yields them instead of after the whole batch
+                names = {d.temp_path: d.name for d in upload_set.documents}
+                total_fields = max(1, len(upload_set.documents) * len(schema.get('fields', {})))
+                bar = st.progress(0.0, text="Extracting data from all PDFs...")
+                found_box = st.empty()
+                found, resolved = {}, 0
+                fv_map, candidates = {}, {}
+                for event in upload_set.iter_extract(schema, use_ocr=use_ocr):
+                    if event.kind == "page":
+                        bar.progress(resolved / total_fields, text=f"Reading {names.get(event.doc, event.doc)}: page {event.page + 1}/{event.total}")
+                    elif event.kind in ("ocr", "warning") and event.message:
+                        bar.progress(resolved / total_fields, text=event.message)
+                    elif event.kind == "field":
+                        resolved += 1
+                        bar.progress(min(1.0, resolved / total_fields), text=f"{event.doc}: {event.field} ({event.seconds * 1000:.0f} ms)")
+                        if event.value.value and event.field not in found:
+                            found[event.field] = event.value.value
+                            found_box.markdown("\n".join(f"- **{k}**: {v}" for k, v in found.items()))
+                    elif event.kind == "done":
+                        fv_map, candidates = event.value
+                bar.progress(1.0, text="Extraction complete")
+                st.session_state.field_candidates = candidates
+                
+                # Store in session state
+                def _v(m, k):
+                    fv = m.get(k)
+                    return fv.value if fv else ''
+                # Every recorded instrument in the package, from the text parsed above
+                from instrument_scan import instrument_fields
+                instruments = instrument_fields(upload_set.instruments(use_ocr=use_ocr))
+                st.session_state.extracted_data = {
+                    'client_name': _v(fv_map, 'for_field'),
+                    'file_number': _v(fv_map, 'file_number'),
+                    'property_description': _v(fv_map, 'property_description'),
+                    'period_of_search': _v(fv_map, 'period_of_search'),
+                    'present_owners': _v(fv_map, 'present_owners'),
+                    'names_searched': 'All names searched 20 years for Federal judgments & liens',
+                    'conveyance_documents': _v(fv_map, 'conveyance_documents') or instruments['conveyance_documents'],
+                    'encumbrances': _v(fv_map, 'encumbrances') or instruments['encumbrances'],
+                    'assessment_number': '0610429400',
+                    'tax_status': 'Taxes Paid Annually'
+                }
+                st.session_state.field_confidences = {k: v.confidence for k, v in fv_map.items()}
+                st.session_state.field_values = fv_map
+                st.session_state.doc_paths = {d.doc_id: d.temp_path for d in upload_set.documents}
+                st.session_state.pdf_processed = True
+                st.success("✅ Data extracted successfully! Review and edit below.")
+                st.rerun()
+                
+            except Exception as e:
+                st.error(f"❌ Error extracting data: {str(e)}")
+                st.exception(e)
     st.markdown("---")
     st.markdown("### 💡 How it works")
     st.markdown("""
@@ -280,6 +293,11 @@ if st.session_state.pdf_processed or st.session_state.extracted_data:
                 st.write(f"{color} {k.replace('_',' ').title()} — {s['confidence']:.2f} {errs}")
                 if s['color'] == 'red':
                     bad.append(k)
+                fv = st.session_state.get('field_values', {}).get(k)
+                src_path = st.session_state.get('doc_paths', {}).get(fv.doc_id) if fv else None
+                if fv and fv.bbox and src_path and os.path.exists(src_path):
+                    with st.expander(f"📍 Where this came from: {fv.doc_id}, page {fv.page + 1}"):
+                        st.image(render_source_highlight_png(src_path, fv.page, fv.bbox))
     except Exception as e:
         st.warning(f"Preview unavailable: {e}")
         bad = []
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# src/ modules import each other by bare name (as streamlit_app.py arranges); mirror that here
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
@@ -0,0 +1,41 @@
+from anchor_index import AhoCorasick, AnchorIndex
+
+
+def test_automaton_reports_overlapping_phrases():
+    ac = AhoCorasick(["he", "she", "hers", "his"])
+    found = {(s, e, ac.phrases[p]) for s, e, p in ac.iter_matches("ushers")}
+    assert found == {(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")}
+
+
+def test_anchor_index_spans_words_and_pages():
+    words = [
+        {"text": "Borrower:", "bbox": (10, 10, 60, 20), "page": 0},
+        {"text": "FILE", "bbox": (100, 10, 120, 20), "page": 0},
+        {"text": "#", "bbox": (122, 10, 130, 20), "page": 0},
+        {"text": "FILE", "bbox": (10, 10, 30, 20), "page": 1},
+        {"text": "#", "bbox": (10, 30, 20, 40), "page": 2},
+    ]
+    hits = AnchorIndex(["Borrower", "FILE  #"]).scan(words)
+    assert [h.bbox for h in hits["borrower"]] == [(10, 10, 60, 20)]
+    # "FILE #" only counts when both words sit on the same page
+    assert [(h.page, h.bbox) for h in hits["file #"]] == [(0, (100, 10, 130, 20))]
+
+
+def test_zone_follows_best_ranked_anchor_not_first():
+    from extract import extract_zone_text
+
+    size = (600.0, 800.0)
+    words = [
+        # Boilerplate footer listed first by the text layer
+        {"text": "Co-Borrowers", "bbox": (10, 760, 80, 770), "page": 0, "page_size": size},
+        {"text": "initials", "bbox": (90, 760, 130, 770), "page": 0, "page_size": size},
+        {"text": "Borrower:", "bbox": (10, 100, 60, 110), "page": 0, "page_size": size},
+        {"text": "Jane", "bbox": (70, 100, 100, 110), "page": 0, "page_size": size},
+        # Same spot on another page must not leak into the zone
+        {"text": "Stray", "bbox": (70, 760, 100, 770), "page": 1, "page_size": size},
+    ]
+    hits = AnchorIndex(["Borrower"]).scan(words)["borrower"]
+    offset = {"x": 5, "y": -2, "w": 60, "h": 14}
+    assert extract_zone_text(words, "Borrower", offset, hits) == ("Jane", 0.9, [])
+    # With k=1 only the top-ranked hit is tried
+    assert extract_zone_text(words, "Borrower", offset, hits, k=1)[0] == "Jane"
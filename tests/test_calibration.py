@@ -0,0 +1,33 @@
+import json
+import shutil
+from pathlib import Path
+
+import calibration
+from schema_loader import load_schema
+
+TEMPLATE = Path(__file__).resolve().parents[1] / "templates" / "bradley_abstract_cover.pdf"
+
+
+def test_transform_is_computed_once_per_template_and_calibration(tmp_path, monkeypatch):
+    tpl = tmp_path / "cover.pdf"
+    shutil.copy(TEMPLATE, tpl)
+    calls = []
+    compute = calibration.compute_page_transform
+    monkeypatch.setattr(calibration, "compute_page_transform", lambda doc, schema: calls.append(1) or compute(doc, schema))
+    monkeypatch.setattr(calibration, "_TRANSFORMS", {})
+    monkeypatch.setattr(calibration, "_SIDECARS", {})
+    schema = load_schema("bradley_cover_v1.yml")
+
+    first = calibration.page_transform(tpl, schema)
+    assert first["status"] == "ok"
+    assert calibration.page_transform(tpl, schema) == first and len(calls) == 1
+    # A new process reads the sidecar instead of searching the template again
+    monkeypatch.setattr(calibration, "_TRANSFORMS", {})
+    monkeypatch.setattr(calibration, "_SIDECARS", {})
+    assert calibration.page_transform(tpl, schema) == first and len(calls) == 1
+    assert list(json.loads((tmp_path / "cover.pdf.calibration.json").read_text()).values()) == [first]
+
+    # Changing the calibration block is a different key
+    moved = dict(schema, calibration=dict(schema["calibration"], anchor_box_expected={"x": 70, "y": 55, "w": 180, "h": 24}))
+    assert calibration.page_transform(tpl, moved)["dx"] == first["dx"] + 2
+    assert len(calls) == 2
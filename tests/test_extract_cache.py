@@ -0,0 +1,108 @@
+import copy
+
+from extract_cache import ExtractionMemo
+from schema_loader import load_schema
+
+TEXT = "Borrower: Jane Doe\nFILE # 2025-0001\nProperty Address: 1 Main St\n"
+
+
+def test_memo_reuses_results_and_recomputes_only_changed_fields():
+    from extract_cache import DocumentInput
+
+    schema = load_schema("bradley_cover_v1.yml")
+    calls = []
+
+    def load():
+        calls.append(1)
+        return [], TEXT
+
+    memo = ExtractionMemo()
+    doc = DocumentInput("a.pdf", "hash-a", load)
+    first = memo.document_candidates(doc, schema)
+    assert first["file_number"][0].field.value == "2025-0001"
+    # The same bytes under another name are answered from the memo
+    again = memo.document_candidates(DocumentInput("b.pdf", "hash-a", load), schema)
+    assert [c.field.value for c in again["file_number"]] == ["2025-0001"]
+    assert again["file_number"][0].doc_id == "b.pdf"
+    assert len(calls) == 1
+
+    edited = copy.deepcopy(schema)
+    edited["fields"]["file_number"]["postprocess"] = ["trim", "lowercase"]
+    out = memo.document_candidates(doc, edited)
+    assert len(calls) == 2
+    assert out["file_number"][0].field.value == "2025-0001".lower()
+    assert out["for_field"] == first["for_field"]
+    # Different OCR settings are a different cache entry
+    memo.document_candidates(doc, schema, ocr_settings={"use_ocr": True})
+    assert len(calls) == 3
+
+
+def test_per_document_extraction_merges_ranked_candidates():
+    from extract_cache import DocumentInput, extract_documents
+
+    schema = load_schema("bradley_cover_v1.yml")
+    texts = {
+        "deed.pdf": "Borrower: Jane Doe\n",
+        "title.pdf": "FILE # 2025-0001\nBorrower: Jane Doe\n",
+        "other.pdf": "Borrower: John Roe\n",
+    }
+    loads = []
+
+    def loader(name):
+        return lambda: loads.append(name) or ([], texts[name])
+
+    docs = [DocumentInput(n, "hash-" + n, loader(n)) for n in texts]
+    memo = ExtractionMemo()
+    merged, per_doc = extract_documents(docs, schema, memo=memo)
+    # Two documents agree on Jane Doe, so it outranks John Roe
+    assert merged["for_field"].value == "Jane Doe"
+    assert merged["file_number"].value == "2025-0001"
+    assert [c.doc_id for c in per_doc["title.pdf"]["file_number"]] == ["title.pdf"]
+    assert per_doc["deed.pdf"]["file_number"] == []
+
+    # Adding one document only parses that document
+    docs.append(DocumentInput("new.pdf", "hash-new", lambda: loads.append("new.pdf") or ([], "")))
+    extract_documents(docs, schema, memo=memo)
+    assert sorted(loads) == sorted(list(texts) + ["new.pdf"])
+
+
+def test_multi_schema_pass_scans_anchors_once(monkeypatch):
+    from anchor_index import AnchorIndex
+    from extract import extract_fields_from_schema, extract_fields_multi
+
+    words = [
+        {"text": "Borrower", "bbox": (10, 10, 60, 20), "page": 0},
+        {"text": "Jane", "bbox": (70, 10, 100, 20), "page": 0},
+        {"text": "Lender", "bbox": (10, 40, 60, 50), "page": 0},
+        {"text": "Acme", "bbox": (70, 40, 100, 50), "page": 0},
+    ]
+    zone = {"x": 5, "y": -2, "w": 45, "h": 14}
+    schemas = {
+        "cover": {"fields": {"for_field": {"extract": {"zone": {"anchor": "Borrower", "offset": zone}}}}},
+        "loan": {"fields": {"lender": {"extract": {"zone": {"anchor": "Lender", "offset": zone}}}}},
+    }
+    scans = []
+    original = AnchorIndex.scan
+    monkeypatch.setattr(AnchorIndex, "scan", lambda self, w: scans.append(1) or original(self, w))
+
+    out = extract_fields_multi(words, "Borrower Jane\nLender Acme", schemas)
+    assert len(scans) == 1
+    assert out["cover"]["for_field"].value == "Jane"
+    assert out["loan"]["lender"].value == "Acme"
+    for name, schema in schemas.items():
+        assert extract_fields_from_schema(words, "Borrower Jane\nLender Acme", schema) == out[name]
+
+
+def test_instruments_are_scanned_on_load_only_when_asked_for():
+    from extract_cache import DocumentInput
+
+    schema = load_schema("bradley_cover_v1.yml")
+    loads = []
+    doc = DocumentInput("a.pdf", "hash-a", lambda: loads.append(1) or ([], "COB: 1224481; Page: 1; Filed: 12/23/2021\n"))
+    plain = ExtractionMemo()
+    plain.document_candidates(doc, schema)
+    assert not any(k[-1] == "instruments" for k in plain._entries)
+    scanning = ExtractionMemo(instruments=True)
+    scanning.document_candidates(doc, schema)
+    assert [i.instrument for i in scanning.document_instruments(doc)] == ["1224481"]
+    assert len(loads) == 2  # once per memo; the instruments came with the second load
@@ -0,0 +1,90 @@
+import re
+from field_extractor import FieldExtractor
+from pattern_scan import PatternSet
+
+
+SAMPLE = """WARRANTY DEED
+Grantor: Allen Dorsey
+Grantee: Charles Alleman
+Property Address: 712 Oak Street, Hammond, LA 70403
+Parcel ID: 06-104-294-00
+Legal Description: Lot 12, Block 4 of Oak Ridge Subdivision,
+as per plat recorded in Book 33, Page 12.
+
+Recorded: 03/14/2019 in Deed Book 1234 Page 567, Instrument 998877
+Tax Year: 2023
+Total Tax: $1,204.55
+Tangipahoa County, State of Louisiana
+Closing Agent: Bradley Abstract
+"""
+
+
+def _unscanned(text):
+    # Same extractor, but every search goes through plain re.search
+    fx = FieldExtractor(text)
+    fx._scan = lambda: None
+    return fx.extract_all_fields()
+
+
+def test_single_pass_matches_per_pattern_search(monkeypatch):
+    monkeypatch.setattr(FieldExtractor, "LABEL_LOOKUPS", {})
+    for text in (SAMPLE, SAMPLE.lower(), "Lot 7\nNo other data", ""):
+        assert FieldExtractor(text).extract_all_fields() == _unscanned(text)
+
+
+def test_later_labeled_line_does_not_override_earlier_match():
+    text = "Sold as recorded in Deed Book 123, Page 45 of the records.\n\nPage: 2 of 3\nOwner: mary jones"
+    fx = FieldExtractor(text)
+    fields = fx.extract_all_fields()
+    assert fields["deed_info"]["page"] == "45"
+    fx._scan = lambda: None
+    assert fx.extract_all_fields() == fields
+    pages = text.split("\n\n")
+    assert FieldExtractor.from_pages(iter(pages), overlap=200, window=0).fields["deed_info"]["page"] == "45"
+
+
+def test_pattern_set_keeps_leftmost_and_group_priority():
+    ps = PatternSet()
+    a = ps.add(r"(\d+)b")
+    b = ps.add(r"1(\d)", group="g")
+    c = ps.add(r"(\d)b", group="g")
+    d = ps.add(r"zzz")
+    text = "x12b 31"
+    found = ps.first_matches(text)
+    assert found[a].group(1) == re.search(r"(\d+)b", text).group(1)
+    assert found[b].group(1) == "2"
+    assert c not in found  # lower-priority alternative dropped once "g" matched
+    assert found[d] is None
+
+
+def test_streamed_pages_match_whole_text():
+    lines = SAMPLE.split("\n")
+    for cut in range(1, len(lines)):
+        pages = ["\n".join(lines[:cut]), "\n".join(lines[cut:])]
+        whole = FieldExtractor("\n\n".join(pages)).extract_all_fields()
+        streamed = FieldExtractor.from_pages(iter(pages), overlap=200, window=0).fields
+        # additional_fields are read page by page, so a label can't span the break
+        whole.pop("additional_fields")
+        streamed.pop("additional_fields")
+        assert streamed == whole
+
+
+def test_scan_stream_finds_matches_across_chunk_boundaries():
+    ps = PatternSet()
+    for p in (r"Book\s+(\d+)", r"^Grantor:\s*(\w+)", r"(\d{4})$", r"Oak\s+Ridge"):
+        ps.add(p, re.M)
+    whole = {i: m and m.span(1 if m.groups() else 0) for i, m in ps.first_matches(SAMPLE).items()}
+    for size in (7, 50, 300):
+        chunks = [SAMPLE[i:i + size] for i in range(0, len(SAMPLE), size)]
+        found, timed_out = ps.scan_stream(chunks, overlap=40, window=0)
+        assert not timed_out
+        assert {i: m and m.span(1 if m.groups() else 0) for i, m in found.items()} == whole
+
+
+def test_scan_stream_defers_matches_in_the_overlap_tail():
+    # "b" matches at 1 in the first chunk, but with the second chunk "abbbbc" matches at 0
+    ps = PatternSet()
+    idx = ps.add(r"ab+c|b")
+    assert ps.first_matches("abbbbc")[idx].span() == (0, 6)
+    found, _ = ps.scan_stream(["abbb", "bc"], overlap=40, window=0)
+    assert found[idx].span() == (0, 6)
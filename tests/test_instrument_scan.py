@@ -0,0 +1,69 @@
+from field_extractor import FieldExtractor
+from instrument_scan import CONVEYANCE, ENCUMBRANCE, instrument_fields, scan_instruments
+from pattern_scan import PatternSet
+
+PACKAGE = """Deeds
+Deed#
+Type
+Date
+1224481
+CASH SALE
+12/20/2021
+Sales
+Cash Sale
+893879
+3/19/2018
+N70/835
+$ 40,000.00
+ACQ: STEVEN TAYLOR 98 #647061 T55-450; CORR 98 #647060 T55-448
+Act of sale recorded in Mortgage Book 88, Page 12, Filed 1/5/2015
+
+COB: 1224481; Page: 1; Filed: 12/23/2021 12:33:34PM  [stlandry: LV]
+
+COB: 1224481; Page: 2; Filed: 12/23/2021 12:33:34PM  [stlandry: LV]
+
+MOB: 1224482; Page: 1; Filed: 12/23/2021 12:35:30PM  [stlandry: LV]
+
+NON-CERTIFIED COPY
+Page 2 of 2
+647061
+"""
+
+
+def test_scan_finds_every_instrument_once_in_recording_order():
+    found = scan_instruments(PACKAGE)
+    assert [(i.kind, i.instrument or i.book) for i in found] == [
+        (ENCUMBRANCE, "88"),
+        (CONVEYANCE, "893879"),
+        (CONVEYANCE, "1224481"),
+        (ENCUMBRANCE, "1224482"),
+        ("", "647060"),
+        ("", "647061"),
+    ]
+    sale = found[2]
+    # The assessor row gives the type; the clerk stamp the filing date and page count
+    assert (sale.doc_type, sale.recorded, sale.pages) == ("CASH SALE", "12/23/2021", 2)
+    assert (found[1].book, found[1].page) == ("N70", "835")
+    assert (found[-1].book, found[-1].page, found[-1].pages) == ("T55", "450", 2)
+
+    fields = instrument_fields(found)
+    assert fields["encumbrances"].splitlines() == [
+        "Book 88 Page 12, recorded 1/5/2015",
+        "Instr. #1224482, recorded 12/23/2021",
+    ]
+    assert "CASH SALE, Instr. #1224481, recorded 12/23/2021" in fields["conveyance_documents"].splitlines()
+    assert FieldExtractor(PACKAGE).extract_recorded_instruments()[2]["instrument"] == "1224481"
+
+
+def test_pattern_set_finditer_yields_every_non_overlapping_match():
+    ps = PatternSet()
+    a = ps.add(r"ab(\d)")
+    b = ps.add(r"b\d+")
+    hits = [(idx, m.group(0), m.span()) for idx, m in ps.finditer("ab1 b22 ab3b4")]
+    assert hits == [(a, "ab1", (0, 3)), (b, "b22", (4, 7)), (a, "ab3", (8, 11)), (b, "b4", (11, 13))]
+    assert list(PatternSet().finditer("text")) == []
+
+
+def test_entry_without_a_number_marker_is_not_an_instrument():
+    assert scan_instruments("Entry 2020 of the minutes; see Entry 2021 notes") == []
+    assert [i.instrument for i in scan_instruments("Entry No. 12345, Filed 1/2/2020")] == ["12345"]
@@ -0,0 +1,42 @@
+from extract import extract_fields_from_schema
+from field_extractor import FieldExtractor
+from kv_index import KeyValueIndex
+
+PAGES = [
+    "WARRANTY DEED\nParcel ID: 06-104-294-00\nRecorded at 10:30 am",
+    "  File #:  B-2291 \nPresent Owner(s):\nCharles Alleman",
+]
+
+
+def test_index_keys_offsets_and_pages():
+    kv = KeyValueIndex(PAGES)
+    text = "\n\n".join(PAGES)
+    assert [line.key for line in kv] == ["parcel id", "file #", "present owner(s)"]
+    parcel, file_no, owners = kv.entries
+    assert text[parcel.value_start:parcel.end] == "06-104-294-00"
+    assert text[file_no.start:file_no.end] == file_no.text == "File #:  B-2291"
+    assert (parcel.page, file_no.page) == (0, 1)
+    assert owners.value == ""
+    assert kv.get("FILE  #") == [file_no]
+    m = kv.lookup(["parcel id", "apn"], r"([\d-]+)")
+    assert m.group(1) == "06-104-294-00" and text[m.start(1):m.end(1)] == m.group(1)
+    # One page indexed on its own, placed where it sits in the document
+    second = KeyValueIndex(PAGES[1:], start=len(PAGES[0]) + 2)
+    assert [(line.start, line.end) for line in second] == [(file_no.start, file_no.end), (owners.start, owners.end)]
+
+
+def test_labeled_line_answers_field_extractor():
+    text = "Parcel ID: 06-104-294-00\nTangipahoa County"
+    fields = FieldExtractor(text).extract_all_fields()
+    # The "Parcel[\s:#]+" scan alone would capture "ID"
+    assert fields["parcel_number"] == "06-104-294-00"
+    assert fields["county"] == "Tangipahoa"
+
+
+def test_schema_regex_prefers_labeled_line():
+    schema = {"fields": {"file_number": {
+        "label_synonyms": ["FILE #"],
+        "extract": {"regex": r"(?i)file\s*#\s*[:\-]?\s*(?P<value>[A-Z0-9\-]+)"},
+    }}}
+    text = "see file # 17 for history\n\n" + "\n\n".join(PAGES)
+    assert extract_fields_from_schema([], text, schema)["file_number"].value == "B-2291"
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+import label_match
+from anchor_index import fuzzy_anchor_hits
+from label_match import best_label_matches, similarity_matrix
+
+
+@pytest.fixture(params=["rapidfuzz", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        monkeypatch.setattr(label_match, "process", None)
+    return request.param
+
+
+def test_matrix_ranks_closest_choice_first(backend):
+    m = similarity_matrix(["borrower", "file number"], ["b0rrower", "lender", "file no", "borrower"])
+    assert m.shape == (2, 4)
+    assert np.argmax(m[0]) == 3 and m[0, 3] == pytest.approx(1.0)
+    assert m[0, 1] < m[0, 0] < m[0, 3]
+    assert np.argmax(m[1]) == 2
+
+
+@pytest.mark.parametrize("scorer", label_match.SCORERS)
+def test_numpy_scores_match_rapidfuzz(monkeypatch, scorer):
+    pytest.importorskip("rapidfuzz")
+    texts = ["", " ", "a", "file #", "file no", "no file", "borrower", "b0rrower name"]
+    expected = similarity_matrix(texts, texts, scorer)
+    monkeypatch.setattr(label_match, "process", None)
+    np.testing.assert_allclose(similarity_matrix(texts, texts, scorer), expected, atol=1e-4)
+
+
+def test_best_label_per_key_reads_its_own_synonyms(backend):
+    out = best_label_matches({"property address": ["Address", "property address"], "owner": [], "file": ["file #"]})
+    assert out["property address"] == ("property address", pytest.approx(1.0))
+    assert out["owner"] == ("owner", 0.0)
+    assert out["file"][0] == "file #"
+
+
+def test_misspelled_ocr_anchor_is_recovered(backend):
+    words = [
+        {"text": "B0rrower:", "bbox": (10, 10, 60, 20), "page": 0, "source": "ocr"},
+        {"text": "Jane", "bbox": (70, 10, 100, 20), "page": 0, "source": "ocr"},
+        # The text layer spells what is printed; a near miss there is another word
+        {"text": "Borrowed", "bbox": (10, 40, 60, 50), "page": 0},
+    ]
+    hits = fuzzy_anchor_hits(["Borrower", "Lender"], words)
+    assert list(hits) == ["borrower"] and [(h.first_word, h.last_word) for h in hits["borrower"]] == [(0, 0)]
@@ -0,0 +1,46 @@
+from layout import analyze_layout, reading_order
+from text_buffer import DocumentText
+
+
+def _line(words, text, x, y, page=0, h=10.0, origin=None):
+    for t in text.split():
+        w = {"text": t, "bbox": (x, y, x + 6 * len(t), y + h), "page": page}
+        if origin:
+            w["origin"] = origin
+        words.append(w)
+        x += 6 * len(t) + 4
+
+
+def test_two_columns_are_read_one_after_the_other():
+    words = []
+    _line(words, "WARRANTY DEED", 200, 20)
+    # The text layer lists the columns interleaved line by line
+    for n in range(3):
+        _line(words, f"left column line {n} of the deed", 40, 60 + 14 * n)
+        _line(words, f"right column line {n} of the deed", 320, 60 + 14 * n)
+    _line(words, "Recorded Book 12", 40, 140)
+    (page,) = analyze_layout(words)
+    assert [b.text for b in page.blocks] == [
+        "WARRANTY DEED",
+        "\n".join(f"left column line {n} of the deed" for n in range(3)),
+        "\n".join(f"right column line {n} of the deed" for n in range(3)),
+        "Recorded Book 12",
+    ]
+    assert DocumentText(words, [page]).text == "\n\n".join(b.text for b in page.blocks)
+
+
+def test_label_value_gap_is_not_a_column():
+    words = []
+    for n, (label, value) in enumerate([("Grantor:", "Allen Dorsey"), ("Grantee:", "Charles Alleman Estate Trust")]):
+        _line(words, label, 40, 20 + 14 * n)
+        _line(words, value, 120, 20 + 14 * n)
+    (page,) = analyze_layout(words)
+    assert page.text == "Grantor: Allen Dorsey\nGrantee: Charles Alleman Estate Trust"
+
+
+def test_bottom_origin_words_read_top_down():
+    words = []
+    _line(words, "second", 40, 100, origin="bottom")
+    _line(words, "first", 40, 700, origin="bottom")
+    _line(words, "other page", 40, 700, page=1, origin="bottom")
+    assert [words[i]["text"] for i in reading_order(words)] == ["first", "second", "other", "page"]
@@ -0,0 +1,28 @@
+from extract import extract_fields_from_schema
+from page_classifier import PageClassifier, tag_page_types
+
+
+def _page(text, page):
+    return [{"text": t, "bbox": (10 + 40 * i, 10, 40 + 40 * i, 20), "page": page} for i, t in enumerate(text.split())]
+
+
+def test_classify_by_title_or_two_terms():
+    c = PageClassifier()
+    assert c.classify("CASH SALE between vendor and vendee") == ("deed",)
+    assert c.classify("The Mortgagor owes the Lender principal") == ("mortgage",)
+    assert c.classify("Tax Year 2023 assessed value") == ("tax",)
+    # Whole words only: "client" is not "lien", a single term is not enough
+    assert c.classify("client grantor") == ()
+
+
+def test_field_page_types_skip_other_pages():
+    words = _page("MORTGAGE Borrower: Wrong Person", 0) + _page("WARRANTY DEED Borrower: Allen Dorsey", 1)
+    types = tag_page_types(words)
+    assert types == {(None, 0): ("mortgage",), (None, 1): ("deed",)}
+    schema = {"fields": {"for_field": {"extract": {
+        "page_types": ["deed"],
+        "regex": r"borrower\s*:\s*(?P<value>[A-Z]\w+ [A-Z]\w+)",
+    }}}}
+    assert extract_fields_from_schema(words, "", schema)["for_field"].value == "Allen Dorsey"
+    del schema["fields"]["for_field"]["extract"]["page_types"]
+    assert extract_fields_from_schema(words, "", schema)["for_field"].value == "Wrong Person"
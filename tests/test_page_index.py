@@ -0,0 +1,52 @@
+import pytest
+
+from extract import extract_fields_from_schema
+from page_index import FieldScope, PageIndex
+
+
+def _word(text, x, y, page, doc="a.pdf", **extra):
+    return {"text": text, "bbox": (x, y, x + 30, y + 10), "page": page, "doc": doc,
+            "page_size": (600.0, 800.0), **extra}
+
+
+WORDS = [
+    _word("top", 50, 40, 0, page_types=("tax",)),
+    _word("bottom", 50, 700, 0, page_types=("tax",)),
+    _word("second", 50, 40, 1),
+    _word("last", 50, 40, 2),
+    _word("other", 50, 40, 0, doc="b.pdf", page_types=("deed",)),
+    # OCR words are bottom-origin: y=700 is near the top of the page
+    _word("ocr-top", 50, 700, 1, doc="b.pdf", origin="bottom"),
+]
+
+
+def _texts(scope):
+    return [WORDS[i]["text"] for i in PageIndex(WORDS).select(scope)]
+
+
+def test_scopes_pick_pages_regions_and_kinds():
+    assert _texts(FieldScope(pages=(1,))) == ["top", "bottom", "other"]
+    assert _texts(FieldScope(pages=("2-",))) == ["second", "last", "ocr-top"]
+    assert _texts(FieldScope(pages=(-1,))) == ["last", "ocr-top"]
+    assert _texts(FieldScope(region=(0, 0, 1, 0.25))) == ["top", "second", "last", "other", "ocr-top"]
+    assert _texts(FieldScope(doc_kinds=("deed",))) == ["other", "ocr-top"]
+    # Unclassified pages stay in scope for any page type
+    assert _texts(FieldScope(page_types=("deed",))) == ["second", "last", "other", "ocr-top"]
+
+
+def test_bad_scope_is_rejected():
+    with pytest.raises(ValueError):
+        FieldScope.from_extract({"pages": "one-two"})
+    with pytest.raises(ValueError):
+        FieldScope.from_extract({"region": {"x0": 0}})
+
+
+def test_extraction_ignores_words_out_of_scope():
+    words = [_word("File", 50, 40, 0), _word("#", 85, 40, 0), _word("A-1", 120, 40, 0),
+             _word("File", 50, 700, 0), _word("#", 85, 700, 0), _word("Z-9", 120, 700, 0)]
+    words = words[3:] + words[:3]  # the text layer lists the footer first
+    schema = {"fields": {"file_number": {"extract": {
+        "regex": r"file\s*#\s*(?P<value>[A-Z0-9\-]+)",
+        "region": {"x0": 0, "y0": 0, "x1": 1, "y1": 0.5},
+    }}}}
+    assert extract_fields_from_schema(words, "File # Z-9\nFile # A-1", schema)["file_number"].value == "A-1"
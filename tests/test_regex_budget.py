@@ -0,0 +1,39 @@
+import pytest
+
+import pattern_scan
+from extract import extract_fields_from_schema
+from field_extractor import FieldExtractor
+from pattern_scan import RegexBudget, RegexTimeout, bounded_search
+
+CATASTROPHIC = r"(a|aa)+b"
+
+
+def test_windowed_fallback_finds_matches_across_windows(monkeypatch):
+    monkeypatch.setattr(pattern_scan, "_regex", None)
+    budget = RegexBudget(timeout=5, max_chars=100, overlap=20)
+    text = "x" * 95 + "Lot 12 Block 4" + "y" * 300 + "Lot 99"
+    m = bounded_search(r"Lot\s+(\d+)\s+Block", text, 0, budget)
+    assert m is not None and m.group(1) == "12" and m.start() == 95
+    assert bounded_search(r"Lot (99)$", text, 0, budget).group(1) == "99"
+
+
+def test_timeout_raises_and_becomes_field_note():
+    pytest.importorskip("regex")
+    budget = RegexBudget(timeout=0.05)
+    text = "a" * 60
+    with pytest.raises(RegexTimeout) as exc:
+        bounded_search(CATASTROPHIC, text, 0, budget)
+    assert exc.value.input_size == len(text)
+
+    schema = {"fields": {"slow": {"extract": {"regex": CATASTROPHIC}}}}
+    fv = extract_fields_from_schema([], text, schema, budget=budget)["slow"]
+    assert fv.value == "" and fv.notes == ["regex_timeout"]
+
+
+def test_field_extractor_isolates_slow_pattern(monkeypatch):
+    pytest.importorskip("regex")
+    monkeypatch.setattr(FieldExtractor, "SCAN_TABLE", FieldExtractor.SCAN_TABLE + [("slow", [CATASTROPHIC], 0)])
+    monkeypatch.setattr(FieldExtractor, "_pattern_set", None)
+    fx = FieldExtractor("Tax Year: 2023\n" + "a" * 60, budget=RegexBudget(timeout=0.05))
+    assert fx.extract_all_fields()["tax_info"]["tax_year"] == "2023"
+    assert fx.timed_out_patterns == [CATASTROPHIC]
@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+import regex_lint
+from regex_lint import check_schema_regexes, lint_pattern
+from schema_loader import load_schema
+
+
+def _codes(pattern, flags=0):
+    return {code for code, _, _ in lint_pattern(pattern, flags)}
+
+
+def test_static_checks():
+    assert "nested_quantifier" in _codes(r"(\w+\s?)+$")
+    assert "nested_quantifier" in _codes(r"(a{1,2})+b")
+    assert "unanchored_wildcard" in _codes(r".*Block")
+    # The parser factors "a|aa" into "a(?:|a)"; the optional "a" can start the next iteration
+    assert "ambiguous_alternation" in _codes(r"(a|aa)+b")
+    # Repeated words separated by a required space are not ambiguous, nor is "ab|a"
+    assert _codes(r"([A-Z][a-z]+(?:\s[A-Z][a-z]+)+)") == set()
+    assert "ambiguous_alternation" not in _codes(r"(ab|a)+c")
+
+
+def test_probe_warns_on_what_static_checks_miss():
+    # A bounded repeat of wildcards is polynomial, so only the timing probe sees it
+    issues = lint_pattern(r"(.*a){12}b")
+    assert issues and all(sev == "warning" for _, sev, _ in issues)
+    # Timing findings never fail a schema load; only the static checks do
+    schema = {"fields": {"x": {"extract": {"regex": r"(.*a){12}b"}}}}
+    assert check_schema_regexes(schema, "error")
+
+
+def test_probe_retimes_a_stalled_step(monkeypatch):
+    calls = []
+
+    def fake_time(pattern, text, flags):
+        calls.append(len(text))
+        return 0.05 if len(calls) == 3 else 0.001 * len(text) / 16  # one scheduler stall
+
+    monkeypatch.setattr(regex_lint, "_time_search", fake_time)
+    parsed = regex_lint._sre_parse.parse(r"owner:\s*(\w+)", re.IGNORECASE)
+    assert regex_lint._probe(r"owner:\s*(\w+)", re.IGNORECASE, parsed) == []
+
+
+def test_bundled_schema_is_clean_and_bad_schema_rejected():
+    load_schema("bradley_cover_v1.yml")
+    bad = {"fields": {"owner": {"extract": {"regex": r"owner:\s*(?P<value>(\w+\s?)+)$"}}}}
+    with pytest.raises(ValueError, match="owner extract.regex"):
+        check_schema_regexes(bad, "error")
+    assert [i.code for i in check_schema_regexes(bad, "warn")] == ["nested_quantifier"]
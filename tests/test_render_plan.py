@@ -0,0 +1,33 @@
+import fitz
+
+from render import render_plan, schema_box_to_rect
+from schema_loader import load_schema
+
+
+def test_render_plan_is_built_once_per_schema_and_transform():
+    schema = load_schema("bradley_cover_v1.yml")
+    transform = {"dx": 2.0, "dy": -1.0, "scale": 1.01, "status": "ok"}
+    plan = render_plan(schema, transform, 792.0)
+    assert render_plan(load_schema("bradley_cover_v1.yml"), dict(transform), 792) is plan
+    assert render_plan(schema, dict(transform, dx=3.0), 792.0) is not plan
+
+    field = plan.fields["names_searched"]
+    assert field.rect == schema_box_to_rect(792.0, schema["fields"]["names_searched"]["render"]["box"], transform)
+    assert (field.mode, field.max_lines, field.ellipsis, field.leading) == ("wrap", 4, True, 13.0)
+    assert isinstance(field.font, fitz.Font) and field.font is plan.fields["for_field"].font
+
+
+def test_draw_all_writes_every_field_in_one_fragment():
+    schema = load_schema("bradley_cover_v1.yml")
+    doc = fitz.open()
+    page = doc.new_page()
+    plan = render_plan(schema, {"dx": 0.0, "dy": 0.0, "scale": 1.0}, page.rect.height)
+    values = {k: f"value of {k}" for k in plan.fields}
+    plan.draw_all(page, values, {k: (0, 0.6, 0) for k in plan.fields})
+    assert len(page.get_contents()) == 2  # one shape for the outlines, one text object
+    text = page.get_text()
+    assert all(v in text for v in values.values())
+    # The writer embeds the full font; subsetting (as fill_cover_page does) drops the unused glyphs
+    full = len(doc.tobytes())
+    doc.subset_fonts()
+    assert len(doc.tobytes()) < min(full // 2, 30_000)
@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from schema_index import SchemaIndex, build_schema_index, identify_schema, page_fingerprint
+from schema_loader import list_schemas
+
+
+def _line(text, y, x=50, page_size=(600.0, 800.0)):
+    words, pos = [], x
+    for t in text.split():
+        words.append({"text": t, "bbox": (pos, y, pos + 8 * len(t), y + 10), "page": 0, "page_size": page_size})
+        pos += 8 * len(t) + 6
+    return words
+
+
+LOAN = _line("ACME LENDING", 40) + _line("Loan Summary", 80) + _line("Borrower Name:", 120) + _line("Closing Date:", 160)
+DEED = _line("WARRANTY DEED", 40) + _line("Grantor:", 120) + _line("Grantee:", 160)
+
+
+def test_page_matches_its_template_when_filled_in():
+    index = SchemaIndex([page_fingerprint("loan.yml", LOAN, "Acme Lending"), page_fingerprint("deed.yml", DEED)])
+    filled = LOAN + _line("Jane Doe", 120, x=300) + _line("01/02/2025", 160, x=300)
+    assert index.identify(filled) == "loan.yml"
+    assert index.identify(DEED + _line("John Roe", 120, x=300)) == "deed.yml"
+    # Same lines in the wrong places, or no calibration anchor, is no match
+    assert index.identify(_line("ACME LENDING Loan Summary Borrower Name: Closing Date:", 700)) is None
+    assert index.identify(LOAN[2:]) is None
+
+
+def test_repo_template_identifies_its_schema():
+    assert "bradley_cover_v1.yml" in list_schemas()
+    index = build_schema_index()
+    assert identify_schema([Path(__file__).parent.parent / "templates" / "bradley_abstract_cover.pdf"], index) == "bradley_cover_v1.yml"
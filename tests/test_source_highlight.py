@@ -0,0 +1,46 @@
+import fitz
+
+from extract import extract_document_candidates, extract_fields_from_schema, merge_candidates
+from preview import _source_highlight_png, render_source_highlight_png
+from schema_loader import load_schema
+from word_index import collect_words_from_sources
+
+
+def test_values_carry_their_source_box_and_render_highlighted(tmp_path):
+    path = str(tmp_path / "deed.pdf")
+    doc = fitz.open()
+    doc.new_page()
+    page = doc.new_page()
+    page.insert_text((72, 140), "FILE # 2025-0001")
+    doc.save(path)
+    doc.close()
+
+    schema = load_schema("bradley_cover_v1.yml")
+    words = collect_words_from_sources([path])
+    per_doc = {"deed.pdf": extract_document_candidates(words, "", schema, "deed.pdf")}
+    fv = merge_candidates(per_doc, schema)["file_number"]
+    assert (fv.value, fv.doc_id, fv.page) == ("2025-0001", "deed.pdf", 1)
+    x0, y0, x1, y1 = fv.bbox
+    # The box covers the value's words (top-left origin, around the baseline at y=140)
+    assert 72 < x0 < x1 and y0 < 140 < y1
+
+    _source_highlight_png.cache_clear()
+    png = render_source_highlight_png(path, fv.page, fv.bbox)
+    assert png.startswith(b"\x89PNG")
+    assert render_source_highlight_png(path, fv.page, fv.bbox) == png
+    assert _source_highlight_png.cache_info().hits == 1
+
+
+def test_regex_value_is_located_where_the_regex_matched():
+    words = [
+        {"text": "Lot", "bbox": (10, 10, 30, 20), "page": 0},
+        {"text": "12", "bbox": (35, 10, 45, 20), "page": 0},
+        {"text": "FILE", "bbox": (10, 50, 40, 60), "page": 1},
+        {"text": "#", "bbox": (45, 50, 50, 60), "page": 1},
+        {"text": "12", "bbox": (55, 50, 65, 60), "page": 1},
+    ]
+    schema = {"fields": {"file_number": {"extract": {"regex": r"file\s*#\s*(?P<value>\d+)"}}}}
+    # From the words' own text, and from a text layer with no offsets into the words
+    for full_text in ("", "Lot 12\n\nFILE # 12"):
+        fv = extract_fields_from_schema(words, full_text, schema)["file_number"]
+        assert (fv.value, fv.page, fv.bbox) == ("12", 1, (55, 50, 65, 60))
@@ -0,0 +1,42 @@
+import re
+
+from extract import extract_fields_from_schema
+from text_buffer import DocumentText, fold
+
+WORDS = [
+    {"text": "Legal", "bbox": (10, 10, 40, 20), "page": 0},
+    {"text": "descrip-", "bbox": (45, 10, 90, 20), "page": 0},
+    {"text": "tion:", "bbox": (10, 25, 40, 35), "page": 0},
+    {"text": "Lot", "bbox": (45, 25, 60, 35), "page": 0},
+    {"text": "12", "bbox": (62, 25, 70, 35), "page": 0},
+    {"text": "ＦＩＬＥ", "bbox": (10, 10, 40, 20), "page": 1},  # fullwidth
+    {"text": "#", "bbox": (45, 10, 50, 20), "page": 1},
+    {"text": "B-22", "bbox": (55, 10, 80, 20), "page": 1},
+]
+
+
+def test_normalized_text_and_folded_shadow():
+    doc = DocumentText(WORDS)
+    assert doc.text == "Legal description: Lot 12\n\nFILE # B-22"
+    assert len(doc.folded) == len(doc.text) and doc.folded.startswith("legal description")
+    assert fold("STRAßE") == "straße"
+
+
+def test_offsets_resolve_to_words_pages_and_boxes():
+    doc = DocumentText(WORDS)
+    m = re.search(r"description:\s*(Lot \d+)", doc.text)
+    assert doc.word_at(m.start()) == 1 and doc.word_at(m.end() - 1) == 4
+    assert doc.word_at(doc.text.index("\n")) is None
+    assert doc.locate(*m.span()) == (0, (10, 10, 90, 35))
+    start = doc.find("file #")
+    assert doc.locate(start, start + 6) == (1, (10, 10, 50, 20))
+    m = doc.search(r"(\d+)")
+    assert m.group(1) == "12" and m.words(1) == [4] and m.locate(1) == (0, (62, 25, 70, 35))
+    m = doc.search(r"#\s*(?P<value>\S+)", pos=m.span()[1])
+    assert m.group("value") == "B-22" and m.words("value") == [7] and m.locate("value")[0] == 1
+    assert doc.search(r"zzz") is None
+
+
+def test_schema_regex_falls_back_to_words_without_text_layer():
+    schema = {"fields": {"file_number": {"extract": {"regex": r"file\s*#\s*(?P<value>[A-Z0-9\-]+)"}}}}
+    assert extract_fields_from_schema(WORDS, "", schema)["file_number"].value == "B-22"
@@ -0,0 +1,24 @@
+from text_layout import ELLIPSIS, font_metrics, layout_text, wrap_lines
+
+
+def test_autoshrink_finds_the_size_that_just_fits():
+    m = font_metrics("helv")
+    text = "123 Main Street, Springfield, LA 70403"
+    layout = layout_text(text, "helv", 11.0, 12.0, 150.0, 14.0, "autoshrink_min", 6.0)
+    assert layout.lines == (text,) and 6.0 < layout.size < 11.0
+    assert abs(m.width(text, layout.size) - 149.5) < 1e-6
+    # Bounded by min_size: cut with an ellipsis instead
+    cut = layout_text(text, "helv", 11.0, 12.0, 60.0, 14.0, "autoshrink_min", 9.0, 0, True)
+    assert cut.size == 9.0 and cut.truncated and cut.lines[0].endswith(ELLIPSIS)
+    assert m.width(cut.lines[0], 9.0) <= 59.5
+
+
+def test_wrap_honours_max_lines_and_ellipsis():
+    text = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu"
+    layout = layout_text(text, "helv", 11.0, 13.0, 80.0, 200.0, "wrap", 11.0, 2, True)
+    assert len(layout.lines) == 2 and layout.truncated and layout.lines[-1].endswith(ELLIPSIS)
+    assert layout_text(text, "helv", 11.0, 13.0, 80.0, 200.0, "wrap", 11.0, 2, True) is layout  # memoized
+    # With room to shrink, the largest size whose wrapping fits is used instead
+    shrunk = layout_text(text, "helv", 11.0, 13.0, 150.0, 200.0, "wrap", 5.0, 2, True)
+    assert not shrunk.truncated and len(shrunk.lines) <= 2 and 5.0 <= shrunk.size < 11.0
+    assert len(wrap_lines(text, font_metrics("helv"), shrunk.size + 0.5, 149.5)) > 2
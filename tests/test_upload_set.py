@@ -0,0 +1,83 @@
+import os
+
+import upload_set
+from schema_loader import load_schema
+from upload_set import UploadSet
+
+
+def test_sync_saves_and_extracts_only_changed_documents(tmp_path, monkeypatch):
+    parsed = []
+
+    def fake_parse(path, use_ocr, progress=None):
+        def load():
+            parsed.append(path)
+            with open(path, "rb") as f:
+                return [], f.read().decode()
+        return load
+
+    monkeypatch.setattr(upload_set, "_parse_document", fake_parse)
+    schema = load_schema("bradley_cover_v1.yml")
+    uploads = UploadSet(temp_dir=str(tmp_path))
+
+    a = ("a.pdf", b"Borrower: Jane Doe\n")
+    b = ("b.pdf", b"FILE # 2025-0001\n")
+    assert uploads.sync([a]) == (["a.pdf"], [])
+    uploads.extract(schema)
+    assert uploads.sync([a, b]) == (["b.pdf"], [])
+    merged, per_doc = uploads.extract(schema)
+    assert len(parsed) == 2  # a.pdf was not parsed again
+    assert merged["for_field"].value == "Jane Doe" and merged["file_number"].value == "2025-0001"
+
+    removed_path = uploads.documents[0].temp_path
+    assert uploads.sync([b]) == ([], ["a.pdf"])
+    assert not os.path.exists(removed_path)
+    merged, per_doc = uploads.extract(schema)
+    assert len(parsed) == 2 and list(per_doc) == ["b.pdf"]
+    assert merged["for_field"].value == ""
+
+
+def test_iter_extract_streams_field_events_then_result(tmp_path, monkeypatch):
+    def fake_parse(path, use_ocr, progress=None):
+        def load():
+            progress(upload_set.ProgressEvent("page", doc=path, page=0, total=1))
+            with open(path, "rb") as f:
+                return [], f.read().decode()
+        return load
+
+    monkeypatch.setattr(upload_set, "_parse_document", fake_parse)
+    schema = load_schema("bradley_cover_v1.yml")
+    uploads = UploadSet(temp_dir=str(tmp_path))
+    uploads.sync([("a.pdf", b"Borrower: Jane Doe\n")])
+
+    events = list(uploads.iter_extract(schema))
+    kinds = [e.kind for e in events]
+    assert kinds[0] == "page" and kinds[1] == "document" and kinds[-1] == "done"
+    fields = {e.field: e.value.value for e in events if e.kind == "field"}
+    assert fields["for_field"] == "Jane Doe" and set(fields) == set(schema["fields"])
+    merged, per_doc = events[-1].value
+    assert merged["for_field"].value == "Jane Doe"
+    # A second run answers from the memo without parsing
+    again = list(uploads.iter_extract(schema))
+    assert "page" not in [e.kind for e in again] and again[-1].value[0]["for_field"].value == "Jane Doe"
+
+
+def test_instruments_reuse_the_text_parsed_for_extraction(tmp_path, monkeypatch):
+    parsed = []
+
+    def fake_parse(path, use_ocr, progress=None):
+        def load():
+            parsed.append(path)
+            with open(path, "rb") as f:
+                return [], f.read().decode()
+        return load
+
+    monkeypatch.setattr(upload_set, "_parse_document", fake_parse)
+    uploads = UploadSet(temp_dir=str(tmp_path))
+    uploads.sync([
+        ("a.pdf", b"COB: 1224481; Page: 1; Filed: 12/23/2021 12:33:34PM\n"),
+        ("b.pdf", b"MOB: 1224482; Page: 1; Filed: 12/23/2021 12:35:30PM\nCOB: 1224481; Page: 2; Filed: 12/23/2021\n"),
+    ])
+    uploads.extract(load_schema("bradley_cover_v1.yml"))
+    found = uploads.instruments()
+    assert len(parsed) == 2
+    assert [(i.instrument, i.pages) for i in found] == [("1224481", 2), ("1224482", 1)]
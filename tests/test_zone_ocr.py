@@ -0,0 +1,30 @@
+from extract import extract_fields_from_schema
+
+SCHEMA = {"fields": {"file_number": {"extract": {"zone": {"anchor": "FILE #", "offset": {"x": 5, "y": -2, "w": 100, "h": 14}}}}}}
+
+
+def _words(conf):
+    # OCR words: bottom-origin boxes on a 792pt-high page
+    common = {"page": 0, "doc": "scan.pdf", "origin": "bottom", "page_size": (612.0, 792.0)}
+    return [
+        {"text": "FILE", "bbox": (50, 700, 80, 710), "conf": 0.9, **common},
+        {"text": "#", "bbox": (82, 700, 88, 710), "conf": 0.9, **common},
+        {"text": "B-229l", "bbox": (95, 700, 140, 710), "conf": conf, **common},
+    ]
+
+
+def test_low_confidence_zone_is_reread_from_crop():
+    calls = []
+
+    def zone_ocr(path, page, rect):
+        calls.append((path, page, rect))
+        return [{"text": "B-2291", "bbox": (95, 82, 140, 92), "conf": 0.95}]
+
+    fv = extract_fields_from_schema(_words(0.3), "", SCHEMA, zone_ocr=zone_ocr)["file_number"]
+    assert (fv.value, fv.source) == ("B-2291", "ocr_zone")
+    # The zone right of the anchor, flipped to a top-left origin for rendering
+    assert calls == [("scan.pdf", 0, (93.0, 80.0, 193.0, 94.0))]
+
+    calls.clear()
+    fv = extract_fields_from_schema(_words(0.9), "", SCHEMA, zone_ocr=zone_ocr)["file_number"]
+    assert (fv.value, fv.source, calls) == ("B-229l", "zone_text", [])